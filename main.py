@@ -16,7 +16,9 @@ from src.engine.sync_engine import SyncEngine
 from src.sync_queue_module.sync_queue import SyncQueue
 from src.monitoring.health import HealthChecker
 from src.monitoring.metrics import MetricsCollector
-from src.api.schema_api import router as schema_router
+from src.api.schema_api import router as schema_router, schema_discovery
+from src.utils.supabase_client import close_postgrest
+from src.utils.webhook_deduplicator import shared_webhook_deduplicator
 
 # Setup logging
 setup_logging(settings.log_level)
@@ -48,6 +50,12 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down Frappe-Supabase Sync Service")
+    for engine in (sync_engine, frappe_handler.sync_engine, supabase_handler.sync_engine):
+        await engine.aclose()
+    await schema_discovery.aclose()
+    await close_postgrest()
+    if shared_webhook_deduplicator is not None:
+        await shared_webhook_deduplicator.aclose()
 
 
 # Create FastAPI app
@@ -99,7 +107,7 @@ async def get_metrics():
         raise HTTPException(status_code=404, detail="Metrics not enabled")
     
     try:
-        metrics = await metrics_collector.get_metrics()
+        metrics = metrics_collector.get_metrics()
         return metrics
     except Exception as e:
         logger.error("Failed to get metrics", error=str(e))
@@ -118,7 +126,7 @@ async def frappe_webhook(request: Request, background_tasks: BackgroundTasks):
         
         # Update metrics
         if settings.enable_metrics:
-            await metrics_collector.increment_webhook_count("frappe")
+            metrics_collector.increment_webhook_count("frappe")
         
         return result
         
@@ -139,7 +147,7 @@ async def supabase_webhook(request: Request, background_tasks: BackgroundTasks):
         
         # Update metrics
         if settings.enable_metrics:
-            await metrics_collector.increment_webhook_count("supabase")
+            metrics_collector.increment_webhook_count("supabase")
         
         return result
         
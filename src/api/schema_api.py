@@ -2,8 +2,11 @@
 API endpoints for schema discovery and management
 """
 
+import hashlib
 from typing import Dict, Any, List, Optional
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Request, Response
+from fastapi.encoders import jsonable_encoder
+import orjson
 import structlog
 
 from ..discovery.schema_discovery import SchemaDiscovery
@@ -16,6 +19,31 @@ router = APIRouter(prefix="/api/schema", tags=["schema"])
 schema_discovery = SchemaDiscovery()
 
 
+def _opaque_tag(tag: str) -> str:
+    """Strip whitespace and any weak-validator prefix from an entity tag"""
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def _conditional_json(request: Request, payload: Dict[str, Any]) -> Response:
+    """
+    Serialize a schema response with an ETag
+
+    Schemas rarely change between calls, so a client sending back the ETag
+    it already holds in If-None-Match gets an empty 304 instead of the body.
+    If-None-Match uses weak comparison, so a W/ prefix still matches.
+    """
+    body = orjson.dumps(jsonable_encoder(payload))
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (
+        if_none_match.strip() == "*"
+        or etag in (_opaque_tag(tag) for tag in if_none_match.split(","))
+    ):
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+
 @router.post("/discover")
 async def discover_schemas(background_tasks: BackgroundTasks):
     """Discover schemas from both Frappe and Supabase"""
@@ -39,16 +67,19 @@ async def discover_schemas(background_tasks: BackgroundTasks):
 
 
 @router.get("/frappe")
-async def get_frappe_schemas():
+async def get_frappe_schemas(request: Request):
     """Get discovered Frappe schemas"""
     try:
         frappe_schemas = await schema_discovery.discover_frappe_schemas()
 
-        return {
-            "status": "success",
-            "schemas": frappe_schemas,
-            "count": len(frappe_schemas),
-        }
+        return _conditional_json(
+            request,
+            {
+                "status": "success",
+                "schemas": frappe_schemas,
+                "count": len(frappe_schemas),
+            },
+        )
 
     except Exception as e:
         logger.error("Failed to get Frappe schemas", error=str(e))
@@ -58,16 +89,19 @@ async def get_frappe_schemas():
 
 
 @router.get("/supabase")
-async def get_supabase_schemas():
+async def get_supabase_schemas(request: Request):
     """Get discovered Supabase schemas"""
     try:
         supabase_schemas = await schema_discovery.discover_supabase_schemas()
 
-        return {
-            "status": "success",
-            "schemas": supabase_schemas,
-            "count": len(supabase_schemas),
-        }
+        return _conditional_json(
+            request,
+            {
+                "status": "success",
+                "schemas": supabase_schemas,
+                "count": len(supabase_schemas),
+            },
+        )
 
     except Exception as e:
         logger.error("Failed to get Supabase schemas", error=str(e))
@@ -77,7 +111,7 @@ async def get_supabase_schemas():
 
 
 @router.get("/mappings")
-async def get_intelligent_mappings():
+async def get_intelligent_mappings(request: Request):
     """Get intelligent field mappings"""
     try:
         frappe_schemas = await schema_discovery.discover_frappe_schemas()
@@ -86,7 +120,9 @@ async def get_intelligent_mappings():
             frappe_schemas, supabase_schemas
         )
 
-        return {"status": "success", "mappings": mappings, "count": len(mappings)}
+        return _conditional_json(
+            request, {"status": "success", "mappings": mappings, "count": len(mappings)}
+        )
 
     except Exception as e:
         logger.error("Failed to get intelligent mappings", error=str(e))
@@ -96,12 +132,12 @@ async def get_intelligent_mappings():
 
 
 @router.get("/summary")
-async def get_schema_summary():
+async def get_schema_summary(request: Request):
     """Get schema discovery summary"""
     try:
         summary = await schema_discovery.get_schema_summary()
 
-        return {"status": "success", "summary": summary}
+        return _conditional_json(request, {"status": "success", "summary": summary})
 
     except Exception as e:
         logger.error("Failed to get schema summary", error=str(e))
@@ -111,7 +147,7 @@ async def get_schema_summary():
 
 
 @router.get("/frappe/{doctype}")
-async def get_frappe_doctype_schema(doctype: str):
+async def get_frappe_doctype_schema(doctype: str, request: Request):
     """Get detailed schema for a specific Frappe doctype"""
     try:
         schema = await schema_discovery._get_frappe_doctype_schema(doctype, [])
@@ -119,7 +155,7 @@ async def get_frappe_doctype_schema(doctype: str):
         if not schema:
             raise HTTPException(status_code=404, detail=f"Doctype {doctype} not found")
 
-        return {"status": "success", "schema": schema}
+        return _conditional_json(request, {"status": "success", "schema": schema})
 
     except HTTPException:
         raise
@@ -131,7 +167,7 @@ async def get_frappe_doctype_schema(doctype: str):
 
 
 @router.get("/supabase/{table}")
-async def get_supabase_table_schema(table: str):
+async def get_supabase_table_schema(table: str, request: Request):
     """Get detailed schema for a specific Supabase table"""
     try:
         schema = await schema_discovery._get_supabase_table_schema(table, [])
@@ -139,7 +175,7 @@ async def get_supabase_table_schema(table: str):
         if not schema:
             raise HTTPException(status_code=404, detail=f"Table {table} not found")
 
-        return {"status": "success", "schema": schema}
+        return _conditional_json(request, {"status": "success", "schema": schema})
 
     except HTTPException:
         raise
@@ -228,7 +264,7 @@ async def apply_mappings(mappings: Dict[str, Any]):
 
 
 @router.get("/compare/{doctype}/{table}")
-async def compare_schemas(doctype: str, table: str):
+async def compare_schemas(doctype: str, table: str, request: Request):
     """Compare Frappe doctype and Supabase table schemas"""
     try:
         # Get both schemas
@@ -288,7 +324,9 @@ async def compare_schemas(doctype: str, table: str):
             if field_name not in mapped_supabase_fields
         ]
 
-        return {"status": "success", "comparison": comparison}
+        return _conditional_json(
+            request, {"status": "success", "comparison": comparison}
+        )
 
     except HTTPException:
         raise
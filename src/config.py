@@ -2,11 +2,54 @@
 Configuration management for Frappe-Supabase Sync Service
 """
 
+import json
 import os
-from typing import Any, Dict, List, Optional
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 from pydantic import Field
 from pydantic_settings import BaseSettings
 
+CUSTOM_MAPPINGS_FILE = Path("custom_mappings.json")
+
+
+class MappingConfig(dict):
+    """
+    A sync mapping loaded from custom_mappings.json
+
+    Behaves as the plain dict it was parsed from. Loaded mappings are shared
+    and treated as read-only, so data derived from them (FieldMapper's field
+    plans) is cached on the mapping in field_plans.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.field_plans: Dict[Tuple[str, str], Any] = {}
+
+
+# (modification time, parsed mappings) of the last custom_mappings.json read
+_custom_mappings_cache: Tuple[Optional[int], Dict[str, MappingConfig]] = (None, {})
+
+
+def load_custom_mappings() -> Dict[str, MappingConfig]:
+    """
+    Load custom_mappings.json, parsing it again only after it changes
+
+    Raises:
+        OSError: If the file can't be read
+        ValueError: If it isn't valid JSON
+    """
+    global _custom_mappings_cache
+    mtime = CUSTOM_MAPPINGS_FILE.stat().st_mtime_ns
+    cached_mtime, mappings = _custom_mappings_cache
+    if mtime != cached_mtime:
+        with open(CUSTOM_MAPPINGS_FILE, "r") as f:
+            mappings = {
+                mapping_key: MappingConfig(mapping_config)
+                for mapping_key, mapping_config in json.load(f).items()
+            }
+        _custom_mappings_cache = (mtime, mappings)
+    return mappings
+
 
 class Settings(BaseSettings):
     """Application settings with environment variable support"""
@@ -20,6 +63,16 @@ class Settings(BaseSettings):
     supabase_url: str = Field(..., env="SUPABASE_URL")
     supabase_anon_key: str = Field(..., env="SUPABASE_ANON_KEY")
     supabase_service_role_key: str = Field(..., env="SUPABASE_SERVICE_ROLE_KEY")
+    # Connection pool limits apply process-wide: every SupabaseClient shares
+    # one PostgREST transport
+    supabase_max_connections: int = Field(default=60, env="SUPABASE_MAX_CONNECTIONS")
+    supabase_max_keepalive_connections: int = Field(
+        default=40, env="SUPABASE_MAX_KEEPALIVE_CONNECTIONS"
+    )
+    supabase_keepalive_expiry: float = Field(
+        default=60.0, env="SUPABASE_KEEPALIVE_EXPIRY"
+    )
+    supabase_transport_retries: int = Field(default=3, env="SUPABASE_TRANSPORT_RETRIES")
 
     # Redis Configuration
     redis_url: str = Field(default="redis://localhost:6379/0", env="REDIS_URL")
@@ -173,18 +226,18 @@ class Settings(BaseSettings):
     enable_webhook_deduplication: bool = Field(
         default=True, env="ENABLE_WEBHOOK_DEDUPLICATION"
     )
+    webhook_dedup_max_entries: int = Field(
+        default=50_000, env="WEBHOOK_DEDUP_MAX_ENTRIES"
+    )
+    # Share dedup state between service instances through Redis
+    webhook_dedup_use_redis: bool = Field(default=False, env="WEBHOOK_DEDUP_USE_REDIS")
 
     def get_sync_mapping(self, doctype: str) -> Optional[Dict[str, Any]]:
         """Get sync mapping configuration for a doctype"""
         # First try to load from custom_mappings.json
         try:
-            import json
-            from pathlib import Path
-
-            custom_mappings_file = Path("custom_mappings.json")
-            if custom_mappings_file.exists():
-                with open(custom_mappings_file, "r") as f:
-                    custom_mappings = json.load(f)
+            if CUSTOM_MAPPINGS_FILE.exists():
+                custom_mappings = load_custom_mappings()
 
                 # Look for mapping with this doctype
                 for mapping_key, mapping_config in custom_mappings.items():
@@ -26,6 +26,10 @@ class SchemaDiscovery:
         self.schema_cache = {}
         self.cache_ttl = settings.schema_cache_ttl
 
+    async def aclose(self) -> None:
+        """Close the Frappe connection pool"""
+        await self.frappe_client.aclose()
+
     async def discover_frappe_doctypes(self) -> Dict[str, Any]:
         """Discover Frappe doctypes and their fields"""
         try:
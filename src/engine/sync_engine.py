@@ -15,13 +15,17 @@ from ..models import (
     ConflictResolutionStrategy,
     SyncConflict,
 )
-from ..config import settings
+from ..config import CUSTOM_MAPPINGS_FILE, load_custom_mappings, settings
 from ..utils.logger import SyncLogger
 from ..utils.frappe_client import FrappeClient
 from ..utils.supabase_client import SupabaseClient
 from ..mapping.field_mapper import FieldMapper
 from ..sync_queue_module.sync_queue import SyncQueue
-from ..utils.webhook_deduplicator import webhook_deduplicator
+from ..utils.webhook_deduplicator import (
+    DedupResult,
+    shared_webhook_deduplicator,
+    webhook_deduplicator,
+)
 
 logger = SyncLogger()
 
@@ -36,6 +40,11 @@ class SyncEngine:
         self.field_mapper = FieldMapper()
         self.sync_queue = SyncQueue()
 
+    async def aclose(self) -> None:
+        """Close the Frappe connection pools, the mapper's included"""
+        await self.frappe_client.aclose()
+        await self.field_mapper.aclose()
+
     def get_sync_mapping(self, doctype: str) -> Optional[Dict[str, Any]]:
         """Get sync mapping configuration for a doctype"""
         return self.settings.get_sync_mapping(doctype)
@@ -43,10 +52,28 @@ class SyncEngine:
     async def process_sync_event(self, event: SyncEvent) -> Dict[str, Any]:
         """Process a sync event and create sync operations"""
         try:
-            # Check for webhook deduplication first
-            if webhook_deduplicator.is_duplicate(
-                event.source, event.doctype, event.data
-            ):
+            # Identify the record once for all deduplication checks
+            dedup_record_id = (
+                webhook_deduplicator.get_record_identifier(
+                    event.source, event.doctype, event.data
+                )
+                if webhook_deduplicator.enabled
+                else None
+            )
+
+            # Check for duplicate and opposite service webhooks in one pass
+            if not dedup_record_id:
+                dedup_result = DedupResult.PROCESS
+            elif shared_webhook_deduplicator is not None:
+                dedup_result = await shared_webhook_deduplicator.classify(
+                    event.source, event.doctype, event.data, record_id=dedup_record_id
+                )
+            else:
+                dedup_result = webhook_deduplicator.classify(
+                    event.source, event.doctype, event.data, record_id=dedup_record_id
+                )
+
+            if dedup_result is DedupResult.DUPLICATE:
                 logger.logger.info(
                     "Webhook deduplicated, skipping",
                     event_id=event.id,
@@ -55,10 +82,8 @@ class SyncEngine:
                 )
                 return {"status": "skipped", "reason": "duplicate_webhook"}
 
-            # Check for opposite service webhook after recent successful sync
-            if webhook_deduplicator.is_opposite_service_webhook(
-                event.source, event.doctype, event.data
-            ):
+            # Skip opposite service webhook after recent successful sync
+            if dedup_result is DedupResult.OPPOSITE_ECHO:
                 logger.logger.info(
                     "Skipping opposite service webhook after recent successful sync",
                     event_id=event.id,
@@ -115,9 +140,20 @@ class SyncEngine:
                     operation.id, 0.0
                 )  # Duration would be calculated
                 # Record successful sync to prevent opposite service webhooks
-                webhook_deduplicator.record_successful_sync(
-                    event.source, event.doctype, event.data
-                )
+                if dedup_record_id and shared_webhook_deduplicator is not None:
+                    await shared_webhook_deduplicator.record_successful_sync(
+                        event.source,
+                        event.doctype,
+                        event.data,
+                        record_id=dedup_record_id,
+                    )
+                elif dedup_record_id:
+                    webhook_deduplicator.record_successful_sync(
+                        event.source,
+                        event.doctype,
+                        event.data,
+                        record_id=dedup_record_id,
+                    )
                 return {"status": "success", "operation_id": operation.id}
             else:
                 logger.log_sync_error(operation.id, "Operation failed after retries")
@@ -343,13 +379,17 @@ class SyncEngine:
                                     mapping["supabase_table"],
                                     "phone_number",
                                     original_phone,
+                                    columns=["id"],
                                 )
                             )
                         elif identifier_type == "email":
                             # Look up by email
                             existing_record = (
                                 await self.supabase_client.find_record_by_field(
-                                    mapping["supabase_table"], "email", identifier_value
+                                    mapping["supabase_table"],
+                                    "email",
+                                    identifier_value,
+                                    columns=["id"],
                                 )
                             )
                         elif identifier_type == "task_subject":
@@ -363,7 +403,10 @@ class SyncEngine:
                             # First try to find by task_name (Supabase field)
                             existing_record = (
                                 await self.supabase_client.find_record_by_field(
-                                    mapping["supabase_table"], "task_name", subject
+                                    mapping["supabase_table"],
+                                    "task_name",
+                                    subject,
+                                    columns=["id", "page_content"],
                                 )
                             )
 
@@ -424,7 +467,10 @@ class SyncEngine:
                         if email:
                             existing_record = (
                                 await self.supabase_client.find_record_by_field(
-                                    mapping["supabase_table"], "email", email
+                                    mapping["supabase_table"],
+                                    "email",
+                                    email,
+                                    columns=["id"],
                                 )
                             )
                         else:
@@ -441,7 +487,10 @@ class SyncEngine:
                         if task_name:
                             existing_record = (
                                 await self.supabase_client.find_record_by_field(
-                                    mapping["supabase_table"], "task_name", task_name
+                                    mapping["supabase_table"],
+                                    "task_name",
+                                    task_name,
+                                    columns=["id"],
                                 )
                             )
                         else:
@@ -963,14 +1012,8 @@ class SyncEngine:
     def load_sync_mappings(self) -> Dict[str, Any]:
         """Load sync mappings from configuration"""
         try:
-            import json
-            from pathlib import Path
-
-            custom_mappings_file = Path("custom_mappings.json")
-            if custom_mappings_file.exists():
-                with open(custom_mappings_file, "r") as f:
-                    custom_mappings = json.load(f)
-                return custom_mappings
+            if CUSTOM_MAPPINGS_FILE.exists():
+                return load_custom_mappings()
         except Exception as e:
             logger.warning(f"Could not load custom mappings: {e}")
 
@@ -2,16 +2,65 @@
 Complex mapping engine for handling lookup relationships and ID transformations
 """
 
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Union
 from datetime import datetime
+from functools import lru_cache
 import structlog
 
 from ..utils.frappe_client import FrappeClient
 from ..utils.supabase_client import SupabaseClient
 from ..utils.logger import get_logger
+from .mapping_utils import BOOL_STRINGS
 
 logger = get_logger(__name__)
 
+# Default email fields for email_priority mappings, highest priority first
+_EMAIL_PRIORITY = ("personal_email", "company_email", "preferred_contact_email")
+_REVERSE_EMAIL_PRIORITY = ("personal_email",)
+
+# Task and project ids recur across syncs, so the pure parsing and
+# formatting behind map_task_id / map_task_project is cached. None means
+# the value has no numeric form.
+
+
+@lru_cache(maxsize=4096)
+def _task_number(task_id: str) -> Optional[int]:
+    """Numeric part of a TASK-YYYY-NNNN id"""
+    parts = task_id.split("-")
+    if len(parts) >= 3:
+        try:
+            return int(parts[2])
+        except ValueError:
+            pass
+    return None
+
+
+@lru_cache(maxsize=4096)
+def _frappe_task_id(task_value: Union[int, str], year: int) -> Optional[str]:
+    """TASK-YYYY-NNNN id for a numeric task id"""
+    try:
+        return f"TASK-{year}-{int(task_value):04d}"
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=4096)
+def _project_number(project_id: str) -> Optional[int]:
+    """Numeric part of a PROJ-NNN id"""
+    try:
+        return int(project_id.replace("PROJ-", ""))
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=4096)
+def _frappe_project_id(project_value: Union[int, str]) -> Optional[str]:
+    """PROJ-NNN id for a numeric project id"""
+    try:
+        return f"PROJ-{int(project_value):03d}"
+    except ValueError:
+        return None
+
 
 class ComplexMapper:
     """Handles complex field mappings with lookups and transformations"""
@@ -21,6 +70,10 @@ class ComplexMapper:
         self.supabase_client = SupabaseClient()
         self.lookup_cache = {}
 
+    async def aclose(self) -> None:
+        """Close the Frappe connection pool"""
+        await self.frappe_client.aclose()
+
     async def handle_complex_mapping(
         self,
         value: Any,
@@ -34,43 +87,37 @@ class ComplexMapper:
             mapping_type = config.get("type")
 
             if mapping_type == "array_to_uuid_array":
-                return await self._handle_array_mapping(value, config, direction)
+                return self._handle_array_mapping(value, config, direction)
             elif mapping_type == "is_milestone_to_needs_submission":
-                return await self._handle_boolean_mapping(value, config, direction)
+                return self._handle_boolean_mapping(value, config, direction)
             elif mapping_type == "needs_submission_to_is_milestone":
-                return await self._handle_boolean_mapping(value, config, direction)
+                return self._handle_boolean_mapping(value, config, direction)
             elif mapping_type == "email_priority":
-                return await self._handle_email_priority(value, config, direction)
+                return self._handle_email_priority(value, config, direction)
             elif mapping_type == "status_mapping":
-                return await self._handle_boolean_mapping(value, config, direction)
+                return self._handle_boolean_mapping(value, config, direction)
             elif mapping_type == "name_combination":
-                return await self._handle_name_combination(value, config, direction)
+                return self._handle_name_combination(value, config, direction)
             elif mapping_type == "lookup":
                 return await self._handle_lookup_mapping(value, config, direction)
             elif mapping_type == "company_to_org_mapping":
-                return await self._handle_company_to_org_mapping(
-                    value, config, direction
-                )
+                return self._handle_company_to_org_mapping(value, config, direction)
             elif mapping_type == "string_to_int":
-                return await self._handle_string_to_int_mapping(
-                    value, config, direction
-                )
+                return self._handle_string_to_int_mapping(value, config, direction)
             elif mapping_type == "reverse_name_combination":
-                return await self._handle_reverse_name_combination(
-                    value, config, direction
-                )
+                return self._handle_reverse_name_combination(value, config, direction)
             elif mapping_type == "project_lookup":
                 return await self._handle_project_lookup(value, config, direction)
             elif mapping_type == "date_fallback":
-                return await self._handle_date_fallback_mapping(
+                return self._handle_date_fallback_mapping(
                     value, config, source_system, target_system
                 )
             elif mapping_type == "default_value":
-                return await self._handle_default_value_mapping(
+                return self._handle_default_value_mapping(
                     value, config, source_system, target_system
                 )
             elif mapping_type == "date_format_conversion":
-                return await self._handle_date_format_conversion(
+                return self._handle_date_format_conversion(
                     value, config, source_system, target_system
                 )
             else:
@@ -100,13 +147,9 @@ class ComplexMapper:
                     value, complex_config, direction
                 )
             elif mapping_type == "prefix_transform":
-                return await self._handle_prefix_transform(
-                    value, complex_config, direction
-                )
+                return self._handle_prefix_transform(value, complex_config, direction)
             elif mapping_type == "email_priority":
-                return await self._handle_email_priority(
-                    value, complex_config, direction
-                )
+                return self._handle_email_priority(value, complex_config, direction)
             else:
                 logger.warning(f"Unknown complex mapping type: {mapping_type}")
                 return value
@@ -182,7 +225,7 @@ class ComplexMapper:
             logger.error(f"Lookup mapping failed", error=str(e))
             return value
 
-    async def _handle_prefix_transform(
+    def _handle_prefix_transform(
         self, value: Any, config: Dict[str, Any], direction: str
     ) -> Any:
         """Handle prefix transformation (e.g., TASK-2025-0XXX)"""
@@ -220,44 +263,38 @@ class ComplexMapper:
             logger.error(f"Prefix transform failed", error=str(e))
             return value
 
-    async def _handle_email_priority(
+    def _handle_email_priority(
         self, value: Any, config: Dict[str, Any], direction: str
     ) -> Any:
         """Handle email field priority mapping"""
         try:
             if direction == "frappe_to_supabase":
                 # Use the first available email from priority list
-                email_fields = config.get(
-                    "email_priority",
-                    ["personal_email", "company_email", "preferred_contact_email"],
-                )
+                email_fields = config.get("email_priority", _EMAIL_PRIORITY)
 
                 if isinstance(value, dict):
-                    for field in email_fields:
-                        if field in value and value[field]:
-                            return value[field]
+                    # If no email found in priority fields, return None
+                    return next(
+                        (
+                            email
+                            for field in email_fields
+                            if (email := value.get(field))
+                        ),
+                        None,
+                    )
 
-                # If no email found in priority fields, return None
                 return None
 
             else:  # supabase_to_frappe
-                # Map single email to multiple email fields
-                email_fields = config.get("email_priority", ["personal_email"])
-
-                if len(email_fields) == 1:
-                    return {email_fields[0]: value}
-                else:
-                    # Distribute to multiple fields
-                    result = {}
-                    for field in email_fields:
-                        result[field] = value
-                    return result
+                # Map single email to every email field in the priority list
+                email_fields = config.get("email_priority", _REVERSE_EMAIL_PRIORITY)
+                return dict.fromkeys(email_fields, value)
 
         except Exception as e:
             logger.error(f"Email priority mapping failed", error=str(e))
             return value
 
-    async def _handle_company_to_org_mapping(
+    def _handle_company_to_org_mapping(
         self, value: Any, config: Dict[str, Any], direction: str
     ) -> Any:
         """Handle company name to organization ID mapping"""
@@ -282,27 +319,21 @@ class ComplexMapper:
                 # Convert PROJ-0XX to numeric ID
                 if isinstance(project_value, str) and project_value.startswith("PROJ-"):
                     # Extract numeric part
-                    numeric_part = project_value.replace("PROJ-", "")
-                    try:
-                        return int(numeric_part)
-                    except ValueError:
-                        # Fallback: lookup by name
-                        return await self._lookup_project_by_name(
-                            project_value, "supabase"
-                        )
+                    numeric_value = _project_number(project_value)
+                    if numeric_value is not None:
+                        return numeric_value
+                    # Fallback: lookup by name
+                    return await self._lookup_project_by_name(project_value, "supabase")
                 return project_value
 
             else:  # supabase_to_frappe
                 # Convert numeric ID to PROJ-0XX
                 if isinstance(project_value, (int, str)):
-                    try:
-                        numeric_value = int(project_value)
-                        return f"PROJ-{numeric_value:03d}"
-                    except ValueError:
-                        # Fallback: lookup by name
-                        return await self._lookup_project_by_name(
-                            project_value, "frappe"
-                        )
+                    project_id = _frappe_project_id(project_value)
+                    if project_id is not None:
+                        return project_id
+                    # Fallback: lookup by name
+                    return await self._lookup_project_by_name(project_value, "frappe")
                 return project_value
 
         except Exception as e:
@@ -316,23 +347,18 @@ class ComplexMapper:
                 # Convert TASK-2025-0XXX to numeric ID
                 if isinstance(task_value, str) and task_value.startswith("TASK-"):
                     # Extract numeric part
-                    parts = task_value.split("-")
-                    if len(parts) >= 3:
-                        try:
-                            return int(parts[2])
-                        except ValueError:
-                            pass
+                    numeric_value = _task_number(task_value)
+                    if numeric_value is not None:
+                        return numeric_value
                 return task_value
 
             else:  # supabase_to_frappe
                 # Convert numeric ID to TASK-2025-0XXX
                 if isinstance(task_value, (int, str)):
-                    try:
-                        numeric_value = int(task_value)
-                        year = datetime.now().year
-                        return f"TASK-{year}-{numeric_value:04d}"
-                    except ValueError:
-                        pass
+                    # The year is part of the key, so cached ids roll over
+                    task_id = _frappe_task_id(task_value, datetime.now().year)
+                    if task_id is not None:
+                        return task_id
                 return task_value
 
         except Exception as e:
@@ -342,18 +368,27 @@ class ComplexMapper:
     async def _lookup_project_by_name(self, name: str, target_system: str) -> Any:
         """Lookup project by name in target system"""
         try:
+            # Check cache first
+            cache_key = f"project_{name}_{target_system}"
+            if cache_key in self.lookup_cache:
+                return self.lookup_cache[cache_key]
+
             if target_system == "supabase":
                 records = await self.supabase_client.get_records(
                     "projects", {"name": name}, limit=1
                 )
                 if records:
-                    return records[0].get("id")
+                    result = records[0].get("id")
+                    self.lookup_cache[cache_key] = result
+                    return result
             else:  # frappe
                 records = await self.frappe_client.get_documents(
                     "Project", {"name": name}, limit=1
                 )
                 if records:
-                    return records[0].get("name")
+                    result = records[0].get("name")
+                    self.lookup_cache[cache_key] = result
+                    return result
 
             return name
 
@@ -373,7 +408,7 @@ class ComplexMapper:
             "cache_keys": list(self.lookup_cache.keys()),
         }
 
-    async def _handle_array_mapping(
+    def _handle_array_mapping(
         self, value: Any, config: Dict[str, Any], direction: str
     ) -> Any:
         """Handle array field mapping"""
@@ -408,16 +443,17 @@ class ComplexMapper:
             logger.error(f"Array mapping failed", error=str(e))
             return value
 
-    async def _handle_boolean_mapping(
+    def _handle_boolean_mapping(
         self, value: Any, config: Dict[str, Any], direction: str
     ) -> Any:
         """Handle boolean field mapping"""
         try:
+            mapping_type = config.get("type")
             if direction == "frappe_to_supabase":
                 # Convert Frappe boolean to Supabase boolean
-                if config.get("type") == "is_milestone_to_needs_submission":
+                if mapping_type == "is_milestone_to_needs_submission":
                     return bool(value) if value is not None else False
-                elif config.get("type") == "status_mapping":
+                elif mapping_type == "status_mapping":
                     # Convert status string to boolean
                     active_status = config.get("active_status", "Active")
                     inactive_status = config.get("inactive_status", "Inactive")
@@ -425,17 +461,16 @@ class ComplexMapper:
 
                 # Handle string values
                 if isinstance(value, str):
-                    if value.lower() in ["true", "1", "yes", "on", "active"]:
-                        return True
-                    elif value.lower() in ["false", "0", "no", "off", "inactive"]:
-                        return False
+                    mapped = BOOL_STRINGS.get(value.lower())
+                    if mapped is not None:
+                        return mapped
 
                 return bool(value) if value is not None else False
             else:  # supabase_to_frappe
                 # Convert Supabase boolean to Frappe boolean
-                if config.get("type") == "needs_submission_to_is_milestone":
+                if mapping_type == "needs_submission_to_is_milestone":
                     return 1 if value else 0
-                elif config.get("type") == "status_mapping":
+                elif mapping_type == "status_mapping":
                     # Convert boolean to status string
                     active_status = config.get("active_status", "Active")
                     inactive_status = config.get("inactive_status", "Inactive")
@@ -446,7 +481,7 @@ class ComplexMapper:
             logger.error(f"Boolean mapping failed", error=str(e))
             return value
 
-    async def _handle_datetime_mapping(
+    def _handle_datetime_mapping(
         self, value: Any, config: Dict[str, Any], direction: str
     ) -> Any:
         """Handle datetime field mapping"""
@@ -511,7 +546,7 @@ class ComplexMapper:
             logger.error(f"Apply complex mappings failed", error=str(e))
             return data
 
-    async def _handle_name_combination(
+    def _handle_name_combination(
         self, value: Any, config: Dict[str, Any], direction: str
     ) -> Any:
         """Handle name combination mapping (first_name + last_name)"""
@@ -541,7 +576,7 @@ class ComplexMapper:
             logger.error(f"Name combination mapping failed", error=str(e))
             return value
 
-    async def _handle_string_to_int_mapping(
+    def _handle_string_to_int_mapping(
         self, value: Any, config: Dict[str, Any], direction: str
     ) -> Any:
         """Handle string to integer mapping (e.g., PROJ-0001 -> 1)"""
@@ -571,7 +606,7 @@ class ComplexMapper:
             logger.error(f"String to int mapping failed", error=str(e))
             return value
 
-    async def _handle_reverse_name_combination(
+    def _handle_reverse_name_combination(
         self, value: Any, config: Dict[str, Any], direction: str
     ) -> Any:
         """Handle reverse name combination (e.g., "John Doe" -> {"first_name": "John", "last_name": "Doe"})"""
@@ -667,7 +702,7 @@ class ComplexMapper:
             logger.error(f"Project lookup mapping failed", error=str(e))
             return value
 
-    async def _handle_date_fallback_mapping(
+    def _handle_date_fallback_mapping(
         self,
         data: Dict[str, Any],
         mapping: Dict[str, Any],
@@ -706,7 +741,7 @@ class ComplexMapper:
             logger.error(f"Date fallback mapping failed", error=str(e))
             return None
 
-    async def _handle_default_value_mapping(
+    def _handle_default_value_mapping(
         self,
         data: Dict[str, Any],
         mapping: Dict[str, Any],
@@ -727,7 +762,7 @@ class ComplexMapper:
             logger.error(f"Default value mapping failed", error=str(e))
             return None
 
-    async def _handle_date_format_conversion(
+    def _handle_date_format_conversion(
         self, value: Any, config: Dict[str, Any], source_system: str, target_system: str
     ) -> Any:
         """Handle date format conversion - convert ISO datetime to date string"""
@@ -2,12 +2,15 @@
 Field mapping and transformation system for Frappe-Supabase sync
 """
 
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Iterable, Optional, List, Tuple
 from datetime import datetime
+import re
+import uuid
 import structlog
 
 from ..utils.logger import get_logger
 from .complex_mapper import ComplexMapper
+from .mapping_utils import BOOL_STRINGS
 from ..utils.phone_normalizer import (
     extract_phone_from_data,
     get_phone_lookup_fields,
@@ -17,6 +20,67 @@ from ..utils.phone_normalizer import (
 logger = get_logger(__name__)
 
 
+_VALID_SYSTEMS = frozenset(("frappe", "supabase"))
+
+_TIMESTAMP_FIELDS = ("created_at", "updated_at", "creation", "modified")
+
+# Timestamps already in Frappe's "YYYY-MM-DD HH:MM:SS" format
+_FRAPPE_DATETIME_RE = re.compile(
+    r"[0-9]{4}-[0-9]{2}-[0-9]{2} [0-9]{2}:[0-9]{2}:[0-9]{2}"
+)
+
+# Frappe-specific fields that shouldn't be synced
+_FRAPPE_SPECIFIC_FIELDS = frozenset(
+    (
+        "_assign",
+        "__islocal",
+        "__unsaved",
+        "__user_tags",
+        "__comments",
+        "_user_tags",
+        "_comments",
+    )
+)
+
+# How map_fields fills a target field whose source field is present
+_DEFAULT = "default"  # complex mapped target value (skipped if None), else source
+_PREFER_TARGET = "prefer_target"  # complex mapped target value, else source
+_FROM_SOURCE = "from_source"  # always the (possibly transformed) source value
+_NEW_UUID = "new_uuid"  # a freshly generated UUID
+
+FieldPlan = Tuple[Tuple[str, str, str, bool], ...]
+
+
+def _field_mapping_plan(
+    pairs: Iterable[Tuple[str, str]], source_system: str, target_system: str
+) -> FieldPlan:
+    """
+    Resolve the per-field special cases of map_fields
+
+    Returns (source_field, target_field, kind, keep_created) for each pair.
+    keep_created says whether a target value created by complex mappings is
+    kept when the source field is missing.
+    """
+    plan = []
+    for source_field, target_field in pairs:
+        if target_field in ("organization_id", "company"):
+            kind = _PREFER_TARGET
+        elif source_field == "status" and target_field == "_legacy_is_active":
+            kind = _FROM_SOURCE
+        elif (
+            target_field == "id"
+            and source_system == "frappe"
+            and target_system == "supabase"
+        ):
+            kind = _NEW_UUID
+        else:
+            kind = _DEFAULT
+        # Don't include 'name' when syncing to Frappe as it should be auto-generated
+        keep_created = not (target_field == "name" and target_system == "frappe")
+        plan.append((source_field, target_field, kind, keep_created))
+    return tuple(plan)
+
+
 class FieldMapper:
     """Handles field mapping and data transformation between Frappe and Supabase"""
 
@@ -25,6 +89,10 @@ class FieldMapper:
         # No hardcoded default mappings - all mappings should come from configuration
         self.default_mappings = {}
 
+    async def aclose(self) -> None:
+        """Close the complex mapper's connection pool"""
+        await self.complex_mapper.aclose()
+
     async def map_fields(
         self,
         data: Dict[str, Any],
@@ -35,10 +103,9 @@ class FieldMapper:
         """Map fields from source system to target system"""
         try:
             # Validate direction
-            valid_directions = ["frappe", "supabase"]
             if (
-                source_system not in valid_directions
-                or target_system not in valid_directions
+                source_system not in _VALID_SYSTEMS
+                or target_system not in _VALID_SYSTEMS
             ):
                 raise ValueError(
                     f"Invalid direction: {source_system} to {target_system}"
@@ -66,79 +133,50 @@ class FieldMapper:
 
             # Filter out Frappe-specific fields that shouldn't be synced
             if source_system == "frappe":
-                frappe_specific_fields = [
-                    "_assign",
-                    "__islocal",
-                    "__unsaved",
-                    "__user_tags",
-                    "__comments",
-                    "_user_tags",
-                    "_comments",
-                ]
-                original_keys = list(data.keys())
-                data = {
-                    k: v for k, v in data.items() if k not in frappe_specific_fields
-                }
-                filtered_keys = list(data.keys())
-                logger.info(
-                    f"Filtered Frappe fields: {original_keys} -> {filtered_keys}"
-                )
+                # data is our own copy, so drop the few present ones in place
+                # rather than probing and rebuilding every key
+                removed_fields = _FRAPPE_SPECIFIC_FIELDS & data.keys()
+                for field in removed_fields:
+                    del data[field]
+                if removed_fields:
+                    logger.info(
+                        "Filtered Frappe fields", removed=sorted(removed_fields)
+                    )
 
-            # Apply complex mappings first (including email priority) to original data
-            data = await self._apply_complex_mappings(
-                data, complex_mappings, source_system, target_system
-            )
+            # Apply complex mappings first (including email priority) to original data.
+            # Most mappings have none, so skip the coroutine entirely in that case.
+            if complex_mappings:
+                data = await self._apply_complex_mappings(
+                    data, complex_mappings, source_system, target_system
+                )
 
-            # Apply field mappings - only process explicitly mapped fields
-            for source_field, target_field in field_mappings.items():
+            # Apply field mappings - only process explicitly mapped fields.
+            # Mappings loaded from configuration cache their plan per direction.
+            plans = getattr(mapping, "field_plans", None)
+            direction = (source_system, target_system)
+            plan = plans.get(direction) if plans is not None else None
+            if plan is None:
+                plan = _field_mapping_plan(
+                    field_mappings.items(), source_system, target_system
+                )
+                if plans is not None:
+                    plans[direction] = plan
+            for source_field, target_field, kind, keep_created in plan:
                 if source_field in data:
-                    # For organization_id, use the complex mapped value if available
-                    if target_field == "organization_id" and "organization_id" in data:
-                        mapped_data[target_field] = data["organization_id"]
-                    # For company field, use the complex mapped value if available
-                    elif target_field == "company" and "company" in data:
-                        mapped_data[target_field] = data["company"]
-                    # For status field that was processed by complex mapping, use the transformed value
-                    elif (
-                        source_field == "status"
-                        and target_field == "_legacy_is_active"
-                        and source_field in data
-                    ):
-                        # The complex mapping should have transformed status to a boolean
-                        # Check if the complex mapping was applied
-                        if source_field in data and isinstance(
-                            data[source_field], bool
-                        ):
-                            mapped_data[target_field] = data[source_field]
-                        else:
-                            # Fallback to original value if complex mapping wasn't applied
-                            mapped_data[target_field] = data[source_field]
-                    # For company field that was processed by complex mapping, use the transformed value
-                    elif (
-                        source_field == "company"
-                        and target_field == "organization_id"
-                        and source_field in data
-                    ):
-                        # The complex mapping should have transformed company to organization_id
-                        # Check if the complex mapping was applied
-                        if (
-                            source_field in data
-                            and isinstance(data[source_field], str)
-                            and len(data[source_field]) == 36
-                        ):
-                            # This looks like a UUID
-                            mapped_data[target_field] = data[source_field]
+                    if kind is _PREFER_TARGET:
+                        # Use the complex mapped value (organization_id /
+                        # company) if available, otherwise the source field
+                        if target_field in data:
+                            mapped_data[target_field] = data[target_field]
                         else:
-                            # Fallback to original value if complex mapping wasn't applied
                             mapped_data[target_field] = data[source_field]
-                    elif (
-                        target_field == "id"
-                        and source_system == "frappe"
-                        and target_system == "supabase"
-                    ):
+                    elif kind is _FROM_SOURCE:
+                        # status -> _legacy_is_active: the complex mapping
+                        # transforms status in place, so the source field holds
+                        # the transformed value when it was applied
+                        mapped_data[target_field] = data[source_field]
+                    elif kind is _NEW_UUID:
                         # Generate a UUID for Supabase id field
-                        import uuid
-
                         mapped_data[target_field] = str(uuid.uuid4())
                     else:
                         # Skip fields that have complex mappings but failed (like project lookup)
@@ -152,17 +190,15 @@ class FieldMapper:
                             mapped_data[target_field] = data[target_field]
                         else:
                             mapped_data[target_field] = data[source_field]
-                elif target_field in data:
+                elif keep_created and target_field in data:
                     # Handle fields created by complex mappings (like 'name' from name_combination)
-                    # But don't include 'name' field when syncing to Frappe as it should be auto-generated
-                    if not (target_field == "name" and target_system == "frappe"):
-                        # Skip fields that have complex mappings but failed
-                        if data[target_field] is None:
-                            logger.warning(
-                                f"Skipping field {target_field} due to failed complex mapping"
-                            )
-                            continue
-                        mapped_data[target_field] = data[target_field]
+                    # Skip fields that have complex mappings but failed
+                    if data[target_field] is None:
+                        logger.warning(
+                            f"Skipping field {target_field} due to failed complex mapping"
+                        )
+                        continue
+                    mapped_data[target_field] = data[target_field]
 
             # Only include fields that are explicitly mapped or created by complex mappings
             # This prevents unmapped fields from being included in the final data
@@ -178,7 +214,7 @@ class FieldMapper:
             # Don't include all original fields to avoid schema mismatches
 
             # Apply email priority mapping
-            mapped_data = await self._apply_email_priority_mapping(
+            mapped_data = self._apply_email_priority_mapping(
                 mapped_data, mapping, source_system, target_system
             )
 
@@ -243,17 +279,22 @@ class FieldMapper:
         self, data: Dict[str, Any], source_system: str, target_system: str
     ) -> Dict[str, Any]:
         """Transform timestamp fields between systems"""
-        timestamp_fields = ["created_at", "updated_at", "creation", "modified"]
+        to_frappe = target_system == "frappe"
 
-        for field in timestamp_fields:
-            if field in data and data[field]:
+        for field in _TIMESTAMP_FIELDS:
+            value = data.get(field)
+            if value:
                 try:
                     # Parse and reformat timestamp
-                    if isinstance(data[field], str):
+                    if isinstance(value, str):
+                        if to_frappe and _FRAPPE_DATETIME_RE.fullmatch(value):
+                            # Already in the target format; reformatting
+                            # would give back the same string
+                            continue
                         # Parse ISO format timestamp
-                        dt = datetime.fromisoformat(data[field].replace("Z", "+00:00"))
+                        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
                     else:
-                        dt = data[field]
+                        dt = value
 
                     # Format for target system
                     if target_system == "supabase":
@@ -275,14 +316,14 @@ class FieldMapper:
         for field in boolean_fields:
             if field in data:
                 value = data[field]
+                value_type = type(value)
 
                 # Convert to boolean if needed
-                if isinstance(value, str):
-                    if value.lower() in ["true", "1", "yes", "on", "active"]:
-                        data[field] = True
-                    elif value.lower() in ["false", "0", "no", "off", "inactive"]:
-                        data[field] = False
-                elif isinstance(value, int):
+                if value_type is str:
+                    mapped = BOOL_STRINGS.get(value.lower())
+                    if mapped is not None:
+                        data[field] = mapped
+                elif value_type is int:
                     data[field] = bool(value)
 
         return data
@@ -349,7 +390,7 @@ class FieldMapper:
 
         return data
 
-    async def _apply_email_priority_mapping(
+    def _apply_email_priority_mapping(
         self,
         data: Dict[str, Any],
         mapping: Dict[str, str],
@@ -516,10 +557,8 @@ class FieldMapper:
                     and complex_config.get("type") == "date_fallback"
                 ):
                     # Handle date fallback for act_start_date
-                    mapped_value = (
-                        await self.complex_mapper._handle_date_fallback_mapping(
-                            data, complex_config, source_system, target_system
-                        )
+                    mapped_value = self.complex_mapper._handle_date_fallback_mapping(
+                        data, complex_config, source_system, target_system
                     )
                     if mapped_value is not None:
                         data[field_name] = mapped_value
@@ -528,10 +567,8 @@ class FieldMapper:
                     and complex_config.get("type") == "date_fallback"
                 ):
                     # Handle date fallback for act_end_date
-                    mapped_value = (
-                        await self.complex_mapper._handle_date_fallback_mapping(
-                            data, complex_config, source_system, target_system
-                        )
+                    mapped_value = self.complex_mapper._handle_date_fallback_mapping(
+                        data, complex_config, source_system, target_system
                     )
                     if mapped_value is not None:
                         data[field_name] = mapped_value
@@ -540,10 +577,8 @@ class FieldMapper:
                     and complex_config.get("type") == "default_value"
                 ):
                     # Handle default value for organization_id
-                    mapped_value = (
-                        await self.complex_mapper._handle_default_value_mapping(
-                            data, complex_config, source_system, target_system
-                        )
+                    mapped_value = self.complex_mapper._handle_default_value_mapping(
+                        data, complex_config, source_system, target_system
                     )
                     if mapped_value is not None:
                         data[field_name] = mapped_value
@@ -552,10 +587,8 @@ class FieldMapper:
                     and complex_config.get("type") == "default_value"
                 ):
                     # Handle default value for gender
-                    mapped_value = (
-                        await self.complex_mapper._handle_default_value_mapping(
-                            data, complex_config, source_system, target_system
-                        )
+                    mapped_value = self.complex_mapper._handle_default_value_mapping(
+                        data, complex_config, source_system, target_system
                     )
                     if mapped_value is not None:
                         data[field_name] = mapped_value
@@ -564,10 +597,8 @@ class FieldMapper:
                     and complex_config.get("type") == "default_value"
                 ):
                     # Handle default value for date_of_birth
-                    mapped_value = (
-                        await self.complex_mapper._handle_default_value_mapping(
-                            data, complex_config, source_system, target_system
-                        )
+                    mapped_value = self.complex_mapper._handle_default_value_mapping(
+                        data, complex_config, source_system, target_system
                     )
                     if mapped_value is not None:
                         data[field_name] = mapped_value
@@ -576,10 +607,8 @@ class FieldMapper:
                     and complex_config.get("type") == "default_value"
                 ):
                     # Handle default value for date_of_joining
-                    mapped_value = (
-                        await self.complex_mapper._handle_default_value_mapping(
-                            data, complex_config, source_system, target_system
-                        )
+                    mapped_value = self.complex_mapper._handle_default_value_mapping(
+                        data, complex_config, source_system, target_system
                     )
                     if mapped_value is not None:
                         data[field_name] = mapped_value
@@ -588,13 +617,11 @@ class FieldMapper:
                     and complex_config.get("type") == "date_format_conversion"
                 ):
                     # Handle date format conversion for start_date (Supabase -> Frappe)
-                    mapped_value = (
-                        await self.complex_mapper._handle_date_format_conversion(
-                            data.get(field_name),
-                            complex_config,
-                            source_system,
-                            target_system,
-                        )
+                    mapped_value = self.complex_mapper._handle_date_format_conversion(
+                        data.get(field_name),
+                        complex_config,
+                        source_system,
+                        target_system,
                     )
                     if mapped_value is not None:
                         data[field_name] = mapped_value
@@ -603,13 +630,11 @@ class FieldMapper:
                     and complex_config.get("type") == "date_format_conversion"
                 ):
                     # Handle date format conversion for end_date (Supabase -> Frappe)
-                    mapped_value = (
-                        await self.complex_mapper._handle_date_format_conversion(
-                            data.get(field_name),
-                            complex_config,
-                            source_system,
-                            target_system,
-                        )
+                    mapped_value = self.complex_mapper._handle_date_format_conversion(
+                        data.get(field_name),
+                        complex_config,
+                        source_system,
+                        target_system,
                     )
                     if mapped_value is not None:
                         data[field_name] = mapped_value
@@ -0,0 +1,18 @@
+"""
+Constants shared by the field and complex mappers
+"""
+
+# String representations of boolean values accepted from either system,
+# looked up by their lowercased form
+BOOL_STRINGS = {
+    "true": True,
+    "1": True,
+    "yes": True,
+    "on": True,
+    "active": True,
+    "false": False,
+    "0": False,
+    "no": False,
+    "off": False,
+    "inactive": False,
+}
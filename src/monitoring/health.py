@@ -31,9 +31,11 @@ class HealthChecker:
 
     async def check_health(self) -> Dict[str, Any]:
         """Perform comprehensive health check"""
+        # One timestamp for the whole pass, shared by every sub-check
+        timestamp = datetime.utcnow().isoformat()
         health_status = {
             "status": "healthy",
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": timestamp,
             "checks": {},
             "overall_status": "healthy",
         }
@@ -41,7 +43,7 @@ class HealthChecker:
         # Run all health checks
         for check_name, check_func in self.checks.items():
             try:
-                check_result = await check_func()
+                check_result = await check_func(timestamp)
                 health_status["checks"][check_name] = check_result
 
                 if not check_result["healthy"]:
@@ -53,14 +55,14 @@ class HealthChecker:
                 health_status["checks"][check_name] = {
                     "healthy": False,
                     "error": str(e),
-                    "timestamp": datetime.utcnow().isoformat(),
+                    "timestamp": timestamp,
                 }
                 health_status["overall_status"] = "unhealthy"
                 health_status["status"] = "unhealthy"
 
         return health_status
 
-    async def _check_frappe_health(self) -> Dict[str, Any]:
+    async def _check_frappe_health(self, timestamp: str) -> Dict[str, Any]:
         """Check Frappe API health"""
         try:
             async with httpx.AsyncClient() as client:
@@ -76,23 +78,23 @@ class HealthChecker:
                     return {
                         "healthy": True,
                         "response_time": response.elapsed.total_seconds(),
-                        "timestamp": datetime.utcnow().isoformat(),
+                        "timestamp": timestamp,
                     }
                 else:
                     return {
                         "healthy": False,
                         "status_code": response.status_code,
-                        "timestamp": datetime.utcnow().isoformat(),
+                        "timestamp": timestamp,
                     }
 
         except Exception as e:
             return {
                 "healthy": False,
                 "error": str(e),
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": timestamp,
             }
 
-    async def _check_supabase_health(self) -> Dict[str, Any]:
+    async def _check_supabase_health(self, timestamp: str) -> Dict[str, Any]:
         """Check Supabase API health"""
         try:
             from ..utils.supabase_client import SupabaseClient
@@ -102,16 +104,16 @@ class HealthChecker:
             # Try to execute a simple query
             response = await supabase_client.get_records("_health_check", limit=1)
 
-            return {"healthy": True, "timestamp": datetime.utcnow().isoformat()}
+            return {"healthy": True, "timestamp": timestamp}
 
         except Exception as e:
             return {
                 "healthy": False,
                 "error": str(e),
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": timestamp,
             }
 
-    async def _check_redis_health(self) -> Dict[str, Any]:
+    async def _check_redis_health(self, timestamp: str) -> Dict[str, Any]:
         """Check Redis health"""
         try:
             redis_client = redis.from_url(settings.redis_url)
@@ -119,24 +121,25 @@ class HealthChecker:
             # Test Redis connection
             redis_client.ping()
 
-            # Get Redis info
-            info = redis_client.info()
+            # Get Redis info - only request the sections we actually read
+            server_info = redis_client.info("server")
+            memory_info = redis_client.info("memory")
 
             return {
                 "healthy": True,
-                "redis_version": info.get("redis_version"),
-                "used_memory": info.get("used_memory_human"),
-                "timestamp": datetime.utcnow().isoformat(),
+                "redis_version": server_info.get("redis_version"),
+                "used_memory": memory_info.get("used_memory_human"),
+                "timestamp": timestamp,
             }
 
         except Exception as e:
             return {
                 "healthy": False,
                 "error": str(e),
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": timestamp,
             }
 
-    async def _check_database_health(self) -> Dict[str, Any]:
+    async def _check_database_health(self, timestamp: str) -> Dict[str, Any]:
         """Check database health"""
         try:
             # This would check the sync state database
@@ -144,13 +147,13 @@ class HealthChecker:
             redis_client = redis.from_url(settings.redis_url)
             redis_client.ping()
 
-            return {"healthy": True, "timestamp": datetime.utcnow().isoformat()}
+            return {"healthy": True, "timestamp": timestamp}
 
         except Exception as e:
             return {
                 "healthy": False,
                 "error": str(e),
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": timestamp,
             }
 
     async def get_detailed_health(self) -> Dict[str, Any]:
@@ -3,8 +3,11 @@ Metrics collection system for Frappe-Supabase Sync Service
 """
 
 from typing import Dict, Any, List
-from datetime import datetime, timedelta
-from collections import defaultdict
+import copy
+from datetime import datetime
+from collections import defaultdict, deque
+from itertools import islice
+import time
 import structlog
 
 from ..config import settings
@@ -12,6 +15,12 @@ from ..utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Number of most recent sync durations kept in memory
+MAX_SYNC_DURATIONS = 1000
+
+# How long (seconds) an unchanged get_metrics payload is reused
+METRICS_CACHE_TTL = 1.0
+
 
 class MetricsCollector:
     """Metrics collection and aggregation system"""
@@ -20,79 +29,96 @@ class MetricsCollector:
         self.metrics = {
             "webhook_counts": defaultdict(int),
             "sync_operations": defaultdict(int),
-            "sync_durations": [],
             "error_counts": defaultdict(int),
             "conflict_counts": defaultdict(int),
             "retry_counts": defaultdict(int),
         }
+        # Sync durations are stored as parallel bounded buffers rather than
+        # a list of dicts: duration, epoch timestamp and operation type
+        self._durations = deque(maxlen=MAX_SYNC_DURATIONS)
+        self._duration_timestamps = deque(maxlen=MAX_SYNC_DURATIONS)
+        self._duration_operation_types = deque(maxlen=MAX_SYNC_DURATIONS)
+        self._duration_sum = 0.0
+        # Running totals so get_metrics doesn't rescan the counter dicts
+        self._total_operations = 0
+        self._successful_operations = 0
+        self._total_errors = 0
+        # Last get_metrics payload; cleared whenever a metric changes
+        self._metrics_cache = None
+        self._metrics_cache_time = 0.0
         self.start_time = datetime.utcnow()
 
     async def initialize(self):
         """Initialize metrics collector"""
         logger.info("Metrics collector initialized")
 
-    async def increment_webhook_count(self, source: str):
+    def increment_webhook_count(self, source: str):
         """Increment webhook count for a source"""
         self.metrics["webhook_counts"][source] += 1
-        logger.debug("Webhook count incremented", source=source)
+        self._metrics_cache = None
 
-    async def increment_sync_operation(self, operation_type: str, status: str):
+    def increment_sync_operation(self, operation_type: str, status: str):
         """Increment sync operation count"""
-        key = f"{operation_type}_{status}"
-        self.metrics["sync_operations"][key] += 1
-        logger.debug(
-            "Sync operation count incremented",
-            operation_type=operation_type,
-            status=status,
-        )
+        self.metrics["sync_operations"][f"{operation_type}_{status}"] += 1
+        self._total_operations += 1
+        if status == "completed":
+            self._successful_operations += 1
+        self._metrics_cache = None
 
-    async def record_sync_duration(self, duration: float, operation_type: str):
+    def record_sync_duration(self, duration: float, operation_type: str):
         """Record sync operation duration"""
-        self.metrics["sync_durations"].append(
-            {
-                "duration": duration,
-                "operation_type": operation_type,
-                "timestamp": datetime.utcnow().isoformat(),
-            }
-        )
-
-        # Keep only last 1000 durations to prevent memory issues
-        if len(self.metrics["sync_durations"]) > 1000:
-            self.metrics["sync_durations"] = self.metrics["sync_durations"][-1000:]
-
-    async def increment_error_count(self, error_type: str, source: str):
+        # Evict the oldest entry ourselves so the running sum stays in step
+        if len(self._durations) == MAX_SYNC_DURATIONS:
+            self._duration_sum -= self._durations.popleft()
+            self._duration_timestamps.popleft()
+            self._duration_operation_types.popleft()
+
+        self._duration_sum += duration
+        self._durations.append(duration)
+        self._duration_timestamps.append(time.time())
+        self._duration_operation_types.append(operation_type)
+        self._metrics_cache = None
+
+    def increment_error_count(self, error_type: str, source: str):
         """Increment error count"""
-        key = f"{error_type}_{source}"
-        self.metrics["error_counts"][key] += 1
-        logger.debug("Error count incremented", error_type=error_type, source=source)
+        self.metrics["error_counts"][f"{error_type}_{source}"] += 1
+        self._total_errors += 1
+        self._metrics_cache = None
 
-    async def increment_conflict_count(self, doctype: str):
+    def increment_conflict_count(self, doctype: str):
         """Increment conflict count for a doctype"""
         self.metrics["conflict_counts"][doctype] += 1
-        logger.debug("Conflict count incremented", doctype=doctype)
+        self._metrics_cache = None
 
-    async def increment_retry_count(self, operation_id: str):
+    def increment_retry_count(self, operation_id: str):
         """Increment retry count for an operation"""
         self.metrics["retry_counts"][operation_id] += 1
-        logger.debug("Retry count incremented", operation_id=operation_id)
+        self._metrics_cache = None
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get current metrics
 
-    async def get_metrics(self) -> Dict[str, Any]:
-        """Get current metrics"""
-        uptime = datetime.utcnow() - self.start_time
+        Returns a deep copy of the cached payload, so callers that modify it,
+        nested counts included, don't change what later calls return.
+        """
+        now = time.monotonic()
+        if (
+            self._metrics_cache is not None
+            and now - self._metrics_cache_time < METRICS_CACHE_TTL
+        ):
+            return copy.deepcopy(self._metrics_cache)
+
+        current_time = datetime.utcnow()
+        uptime = current_time - self.start_time
 
         # Calculate average sync duration
         avg_duration = 0
-        if self.metrics["sync_durations"]:
-            total_duration = sum(d["duration"] for d in self.metrics["sync_durations"])
-            avg_duration = total_duration / len(self.metrics["sync_durations"])
+        if self._durations:
+            avg_duration = self._duration_sum / len(self._durations)
 
         # Calculate success rate
-        total_operations = sum(self.metrics["sync_operations"].values())
-        successful_operations = sum(
-            count
-            for key, count in self.metrics["sync_operations"].items()
-            if key.endswith("_completed")
-        )
+        total_operations = self._total_operations
+        successful_operations = self._successful_operations
         success_rate = (
             (successful_operations / total_operations * 100)
             if total_operations > 0
@@ -100,23 +126,23 @@ class MetricsCollector:
         )
 
         # Calculate error rate
-        total_errors = sum(self.metrics["error_counts"].values())
+        total_errors = self._total_errors
         error_rate = (
             (total_errors / total_operations * 100) if total_operations > 0 else 0
         )
 
-        return {
-            "timestamp": datetime.utcnow().isoformat(),
+        self._metrics_cache = {
+            "timestamp": current_time.isoformat(),
             "uptime_seconds": uptime.total_seconds(),
             "uptime_human": str(uptime),
             "webhook_counts": dict(self.metrics["webhook_counts"]),
             "sync_operations": dict(self.metrics["sync_operations"]),
             "sync_durations": {
                 "average_seconds": avg_duration,
-                "total_operations": len(self.metrics["sync_durations"]),
-                "recent_durations": self.metrics["sync_durations"][
-                    -10:
-                ],  # Last 10 durations
+                "total_operations": len(self._durations),
+                "recent_durations": self._get_duration_entries(
+                    max(len(self._durations) - 10, 0)
+                ),  # Last 10 durations
             },
             "error_counts": dict(self.metrics["error_counts"]),
             "conflict_counts": dict(self.metrics["conflict_counts"]),
@@ -133,10 +159,27 @@ class MetricsCollector:
                 "total_retries": sum(self.metrics["retry_counts"].values()),
             },
         }
+        self._metrics_cache_time = now
+        return copy.deepcopy(self._metrics_cache)
+
+    def _get_duration_entries(self, start: int) -> List[Dict[str, Any]]:
+        """Build duration records for the buffered entries from ``start`` onwards"""
+        return [
+            {
+                "duration": duration,
+                "operation_type": operation_type,
+                "timestamp": datetime.utcfromtimestamp(timestamp).isoformat(),
+            }
+            for duration, timestamp, operation_type in zip(
+                islice(self._durations, start, None),
+                islice(self._duration_timestamps, start, None),
+                islice(self._duration_operation_types, start, None),
+            )
+        ]
 
-    async def get_metrics_summary(self) -> Dict[str, Any]:
+    def get_metrics_summary(self) -> Dict[str, Any]:
         """Get a summary of key metrics"""
-        metrics = await self.get_metrics()
+        metrics = self.get_metrics()
 
         return {
             "status": (
@@ -149,39 +192,48 @@ class MetricsCollector:
             "average_duration": f"{metrics['sync_durations']['average_seconds']:.2f}s",
         }
 
-    async def reset_metrics(self):
+    def reset_metrics(self):
         """Reset all metrics"""
         self.metrics = {
             "webhook_counts": defaultdict(int),
             "sync_operations": defaultdict(int),
-            "sync_durations": [],
             "error_counts": defaultdict(int),
             "conflict_counts": defaultdict(int),
             "retry_counts": defaultdict(int),
         }
+        self._durations = deque(maxlen=MAX_SYNC_DURATIONS)
+        self._duration_timestamps = deque(maxlen=MAX_SYNC_DURATIONS)
+        self._duration_operation_types = deque(maxlen=MAX_SYNC_DURATIONS)
+        self._duration_sum = 0.0
+        self._total_operations = 0
+        self._successful_operations = 0
+        self._total_errors = 0
+        self._metrics_cache = None
         self.start_time = datetime.utcnow()
         logger.info("Metrics reset")
 
-    async def get_metrics_by_timeframe(self, hours: int = 24) -> Dict[str, Any]:
+    def get_metrics_by_timeframe(self, hours: int = 24) -> Dict[str, Any]:
         """Get metrics for a specific timeframe"""
-        cutoff_time = datetime.utcnow() - timedelta(hours=hours)
+        cutoff = time.time() - hours * 3600
 
-        # Filter durations by timeframe
-        recent_durations = [
-            d
-            for d in self.metrics["sync_durations"]
-            if datetime.fromisoformat(d["timestamp"]) > cutoff_time
-        ]
+        # Durations are appended in time order, so walk back from the newest
+        # entry and stop at the first one outside the timeframe
+        start = len(self._duration_timestamps)
+        for timestamp in reversed(self._duration_timestamps):
+            if timestamp <= cutoff:
+                break
+            start -= 1
+        recent_durations = self._get_duration_entries(start)
 
         # Calculate metrics for timeframe
         avg_duration = 0
         if recent_durations:
-            total_duration = sum(d["duration"] for d in recent_durations)
+            total_duration = sum(islice(self._durations, start, None))
             avg_duration = total_duration / len(recent_durations)
 
         return {
             "timeframe_hours": hours,
-            "cutoff_time": cutoff_time.isoformat(),
+            "cutoff_time": datetime.utcfromtimestamp(cutoff).isoformat(),
             "operations_in_timeframe": len(recent_durations),
             "average_duration": avg_duration,
             "durations": recent_durations,
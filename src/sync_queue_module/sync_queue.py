@@ -2,11 +2,12 @@
 Queue system for managing sync operations
 """
 
-import json
+import orjson
+import time
 import uuid
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
-import redis
+import redis.asyncio as aioredis
 import structlog
 
 from ..models import SyncOperation, SyncStatus
@@ -20,19 +21,31 @@ class SyncQueue:
     """Queue system for managing sync operations"""
 
     def __init__(self):
-        self.redis_client = redis.from_url(settings.redis_url)
+        self.redis_client = aioredis.from_url(settings.redis_url)
         self.queue_name = "sync_operations"
         self.failed_queue_name = "failed_sync_operations"
+        # Failed operations that have exhausted their retries
+        self.dead_letter_queue_name = "dead_sync_operations"
         self.processing_queue_name = "processing_sync_operations"
+        # In-flight operations keyed by operation ID, so completing or failing
+        # an operation doesn't require scanning the processing list
+        self.processing_hash_name = "processing_sync_operations_by_id"
+        # Latest payload of every queued, in-flight or failed operation keyed
+        # by operation ID, for O(1) lookups
+        self.operations_hash_name = "sync_operations_by_id"
 
     async def enqueue_operation(self, operation: SyncOperation) -> bool:
         """Add a sync operation to the queue"""
         try:
             operation_data = operation.dict()
-            operation_data["enqueued_at"] = datetime.utcnow().isoformat()
+            operation_data["enqueued_at"] = time.time()
 
-            # Add to main queue
-            self.redis_client.lpush(self.queue_name, json.dumps(operation_data))
+            # Add to main queue and index it by ID
+            payload = orjson.dumps(operation_data)
+            async with self.redis_client.pipeline() as pipe:
+                pipe.lpush(self.queue_name, payload)
+                pipe.hset(self.operations_hash_name, operation.id, payload)
+                await pipe.execute()
 
             logger.info(
                 "Operation enqueued", operation_id=operation.id, queue=self.queue_name
@@ -45,19 +58,30 @@ class SyncQueue:
             )
             return False
 
-    async def dequeue_operation(self) -> Optional[SyncOperation]:
-        """Get the next sync operation from the queue"""
+    async def dequeue_operation(self, timeout: int = 5) -> Optional[SyncOperation]:
+        """Get the next sync operation from the queue
+
+        Blocks server-side for up to ``timeout`` seconds waiting for an
+        operation instead of returning immediately, so callers don't have
+        to poll. Returns None if nothing arrived in time.
+        """
         try:
             # Move operation to processing queue
-            operation_data = self.redis_client.rpoplpush(
-                self.queue_name, self.processing_queue_name
+            operation_data = await self.redis_client.brpoplpush(
+                self.queue_name, self.processing_queue_name, timeout=timeout
             )
 
             if not operation_data:
                 return None
 
-            operation_dict = json.loads(operation_data)
-            operation = SyncOperation(**operation_dict)
+            operation = SyncOperation.model_validate_json(operation_data)
+
+            # Index the in-flight operation by ID. The operation was just pushed
+            # to the head of the processing list, so the LREM stops immediately.
+            async with self.redis_client.pipeline() as pipe:
+                pipe.hset(self.processing_hash_name, operation.id, operation_data)
+                pipe.lrem(self.processing_queue_name, 1, operation_data)
+                await pipe.execute()
 
             logger.info("Operation dequeued", operation_id=operation.id)
             return operation
@@ -69,19 +93,15 @@ class SyncQueue:
     async def mark_operation_completed(self, operation_id: str) -> bool:
         """Mark an operation as completed and remove from processing queue"""
         try:
-            # Remove from processing queue
-            operations = self.redis_client.lrange(self.processing_queue_name, 0, -1)
-
-            for operation_data in operations:
-                operation_dict = json.loads(operation_data)
-                if operation_dict["id"] == operation_id:
-                    self.redis_client.lrem(
-                        self.processing_queue_name, 1, operation_data
-                    )
-                    logger.info(
-                        "Operation marked as completed", operation_id=operation_id
-                    )
-                    return True
+            # Remove from processing queue and the ID index
+            async with self.redis_client.pipeline() as pipe:
+                pipe.hdel(self.processing_hash_name, operation_id)
+                pipe.hdel(self.operations_hash_name, operation_id)
+                removed, _ = await pipe.execute()
+
+            if removed:
+                logger.info("Operation marked as completed", operation_id=operation_id)
+                return True
 
             logger.warning(
                 "Operation not found in processing queue", operation_id=operation_id
@@ -102,30 +122,32 @@ class SyncQueue:
         """Mark an operation as failed and move to failed queue"""
         try:
             # Get operation from processing queue
-            operations = self.redis_client.lrange(self.processing_queue_name, 0, -1)
-
-            for operation_data in operations:
-                operation_dict = json.loads(operation_data)
-                if operation_dict["id"] == operation_id:
-                    # Update operation status
-                    operation_dict["status"] = SyncStatus.FAILED
-                    operation_dict["error_message"] = error_message
-                    operation_dict["failed_at"] = datetime.utcnow().isoformat()
-
-                    # Move to failed queue
-                    self.redis_client.lpush(
-                        self.failed_queue_name, json.dumps(operation_dict)
-                    )
-                    self.redis_client.lrem(
-                        self.processing_queue_name, 1, operation_data
-                    )
+            operation_data = await self.redis_client.hget(
+                self.processing_hash_name, operation_id
+            )
 
-                    logger.info(
-                        "Operation marked as failed",
-                        operation_id=operation_id,
-                        error=error_message,
-                    )
-                    return True
+            if operation_data:
+                operation_dict = orjson.loads(operation_data)
+
+                # Update operation status
+                operation_dict["status"] = SyncStatus.FAILED
+                operation_dict["error_message"] = error_message
+                operation_dict["failed_at"] = time.time()
+
+                # Move to failed queue
+                payload = orjson.dumps(operation_dict)
+                async with self.redis_client.pipeline() as pipe:
+                    pipe.lpush(self.failed_queue_name, payload)
+                    pipe.hset(self.operations_hash_name, operation_id, payload)
+                    pipe.hdel(self.processing_hash_name, operation_id)
+                    await pipe.execute()
+
+                logger.info(
+                    "Operation marked as failed",
+                    operation_id=operation_id,
+                    error=error_message,
+                )
+                return True
 
             logger.warning(
                 "Operation not found in processing queue", operation_id=operation_id
@@ -140,25 +162,46 @@ class SyncQueue:
             )
             return False
 
-    async def retry_failed_operations(self, max_retries: int = 3) -> int:
-        """Retry failed operations that haven't exceeded max retries"""
+    async def retry_failed_operations(
+        self, max_retries: int = 3, batch_size: int = 100
+    ) -> int:
+        """Retry failed operations that haven't exceeded max retries
+
+        Handles at most ``batch_size`` failed operations per call. Operations
+        that have used up their retries are moved to the dead-letter queue
+        so later calls don't keep re-reading them.
+        """
         try:
             retried_count = 0
-            failed_operations = self.redis_client.lrange(self.failed_queue_name, 0, -1)
 
-            for operation_data in failed_operations:
-                operation_dict = json.loads(operation_data)
+            for _ in range(batch_size):
+                # Atomically take the oldest failed operation. It lands at the
+                # head of the dead-letter queue, so moving it on from there
+                # only needs an LREM that stops at the first element.
+                operation_data = await self.redis_client.rpoplpush(
+                    self.failed_queue_name, self.dead_letter_queue_name
+                )
+                if not operation_data:
+                    break
+
+                operation_dict = orjson.loads(operation_data)
                 retry_count = operation_dict.get("retry_count", 0)
 
                 if retry_count < max_retries:
                     # Increment retry count
                     operation_dict["retry_count"] = retry_count + 1
                     operation_dict["status"] = SyncStatus.PENDING
-                    operation_dict["retry_at"] = datetime.utcnow().isoformat()
+                    operation_dict["retry_at"] = time.time()
 
                     # Move back to main queue
-                    self.redis_client.lpush(self.queue_name, json.dumps(operation_dict))
-                    self.redis_client.lrem(self.failed_queue_name, 1, operation_data)
+                    payload = orjson.dumps(operation_dict)
+                    async with self.redis_client.pipeline() as pipe:
+                        pipe.lpush(self.queue_name, payload)
+                        pipe.hset(
+                            self.operations_hash_name, operation_dict["id"], payload
+                        )
+                        pipe.lrem(self.dead_letter_queue_name, 1, operation_data)
+                        await pipe.execute()
 
                     retried_count += 1
                     logger.info(
@@ -166,6 +209,12 @@ class SyncQueue:
                         operation_id=operation_dict["id"],
                         retry_count=retry_count + 1,
                     )
+                else:
+                    logger.warning(
+                        "Operation moved to dead-letter queue",
+                        operation_id=operation_dict["id"],
+                        retry_count=retry_count,
+                    )
 
             logger.info("Failed operations retried", count=retried_count)
             return retried_count
@@ -177,17 +226,28 @@ class SyncQueue:
     async def get_queue_status(self) -> Dict[str, Any]:
         """Get current queue status"""
         try:
-            main_queue_size = self.redis_client.llen(self.queue_name)
-            processing_queue_size = self.redis_client.llen(self.processing_queue_name)
-            failed_queue_size = self.redis_client.llen(self.failed_queue_name)
+            # Fetch all queue lengths in a single round-trip
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                pipe.llen(self.queue_name)
+                pipe.hlen(self.processing_hash_name)
+                pipe.llen(self.failed_queue_name)
+                pipe.llen(self.dead_letter_queue_name)
+                (
+                    main_queue_size,
+                    processing_queue_size,
+                    failed_queue_size,
+                    dead_letter_queue_size,
+                ) = await pipe.execute()
 
             return {
                 "main_queue_size": main_queue_size,
                 "processing_queue_size": processing_queue_size,
                 "failed_queue_size": failed_queue_size,
+                "dead_letter_queue_size": dead_letter_queue_size,
                 "total_operations": main_queue_size
                 + processing_queue_size
-                + failed_queue_size,
+                + failed_queue_size
+                + dead_letter_queue_size,
             }
 
         except Exception as e:
@@ -196,6 +256,7 @@ class SyncQueue:
                 "main_queue_size": 0,
                 "processing_queue_size": 0,
                 "failed_queue_size": 0,
+                "dead_letter_queue_size": 0,
                 "total_operations": 0,
                 "error": str(e),
             }
@@ -204,11 +265,40 @@ class SyncQueue:
         """Clear a specific queue or all queues"""
         try:
             if queue_name:
-                self.redis_client.delete(queue_name)
+                # Drop the cleared operations from the ID indexes as well
+                if queue_name in (
+                    self.queue_name,
+                    self.processing_queue_name,
+                    self.failed_queue_name,
+                    self.dead_letter_queue_name,
+                ):
+                    operation_ids = [
+                        orjson.loads(operation_data)["id"]
+                        for operation_data in await self.redis_client.lrange(
+                            queue_name, 0, -1
+                        )
+                    ]
+                    if queue_name == self.processing_queue_name:
+                        # Dequeued operations are tracked in the processing
+                        # hash once they leave the list
+                        operation_ids.extend(
+                            await self.redis_client.hkeys(self.processing_hash_name)
+                        )
+                    if operation_ids:
+                        async with self.redis_client.pipeline() as pipe:
+                            pipe.hdel(self.operations_hash_name, *operation_ids)
+                            pipe.hdel(self.processing_hash_name, *operation_ids)
+                            await pipe.execute()
+                await self.redis_client.delete(queue_name)
                 logger.info("Queue cleared", queue_name=queue_name)
             else:
-                self.redis_client.delete(
-                    self.queue_name, self.processing_queue_name, self.failed_queue_name
+                await self.redis_client.delete(
+                    self.queue_name,
+                    self.processing_queue_name,
+                    self.processing_hash_name,
+                    self.failed_queue_name,
+                    self.dead_letter_queue_name,
+                    self.operations_hash_name,
                 )
                 logger.info("All queues cleared")
 
@@ -221,18 +311,11 @@ class SyncQueue:
     async def get_operation_by_id(self, operation_id: str) -> Optional[SyncOperation]:
         """Get an operation by ID from any queue"""
         try:
-            # Check all queues
-            for queue_name in [
-                self.queue_name,
-                self.processing_queue_name,
-                self.failed_queue_name,
-            ]:
-                operations = self.redis_client.lrange(queue_name, 0, -1)
-
-                for operation_data in operations:
-                    operation_dict = json.loads(operation_data)
-                    if operation_dict["id"] == operation_id:
-                        return SyncOperation(**operation_dict)
+            operation_data = await self.redis_client.hget(
+                self.operations_hash_name, operation_id
+            )
+            if operation_data:
+                return SyncOperation.model_validate_json(operation_data)
 
             return None
 
@@ -246,13 +329,14 @@ class SyncQueue:
         """Get failed operations for analysis"""
         try:
             failed_operations = []
-            operations_data = self.redis_client.lrange(
+            operations_data = await self.redis_client.lrange(
                 self.failed_queue_name, 0, limit - 1
             )
 
             for operation_data in operations_data:
-                operation_dict = json.loads(operation_data)
-                failed_operations.append(SyncOperation(**operation_dict))
+                failed_operations.append(
+                    SyncOperation.model_validate_json(operation_data)
+                )
 
             return failed_operations
 
@@ -2,8 +2,10 @@
 Frappe API client for sync operations
 """
 
+import json
+from functools import lru_cache
 import httpx
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from tenacity import retry, stop_after_attempt, wait_exponential
 import structlog
 
@@ -13,6 +15,12 @@ from .logger import get_logger
 logger = get_logger(__name__)
 
 
+@lru_cache(maxsize=256)
+def _dumps_fields(fields: Tuple[str, ...]) -> str:
+    """JSON-encode a field list, memoized"""
+    return json.dumps(list(fields))
+
+
 class FrappeClient:
     """Client for interacting with Frappe API"""
 
@@ -24,6 +32,24 @@ class FrappeClient:
             "Authorization": f"token {self.api_key}:{self.api_secret}",
             "Content-Type": "application/json",
         }
+        # One client per FrappeClient so connections are kept alive and
+        # reused across requests instead of re-handshaking on every call.
+        # HTTP/2 lets concurrent requests share a single connection.
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=self.headers,
+            timeout=30.0,
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=50,
+                max_keepalive_connections=20,
+                keepalive_expiry=30.0,
+            ),
+        )
+
+    async def aclose(self) -> None:
+        """Close the underlying HTTP connection pool"""
+        await self._client.aclose()
 
     @retry(
         stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10)
@@ -31,14 +57,9 @@ class FrappeClient:
     async def get_document(self, doctype: str, name: str) -> Optional[Dict[str, Any]]:
         """Get a single document from Frappe"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/api/resource/{doctype}/{name}",
-                    headers=self.headers,
-                    timeout=30.0,
-                )
-                response.raise_for_status()
-                return response.json()["data"]
+            response = await self._client.get(f"/api/resource/{doctype}/{name}")
+            response.raise_for_status()
+            return response.json()["data"]
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 404:
                 logger.warning("Document not found", doctype=doctype, name=name)
@@ -64,28 +85,43 @@ class FrappeClient:
         try:
             params = {}
             if filters:
-                import json
-
                 params["filters"] = json.dumps(filters)
             if fields:
-                import json
-
-                params["fields"] = json.dumps(fields)
+                params["fields"] = _dumps_fields(tuple(fields))
             params["limit_page_length"] = limit
 
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/api/resource/{doctype}",
-                    headers=self.headers,
-                    params=params,
-                    timeout=30.0,
-                )
-                response.raise_for_status()
-                return response.json()["data"]
+            response = await self._client.get(
+                f"/api/resource/{doctype}",
+                params=params,
+            )
+            response.raise_for_status()
+            return response.json()["data"]
         except Exception as e:
             logger.error("Failed to get documents", doctype=doctype, error=str(e))
             raise
 
+    async def get_documents_by_names(
+        self,
+        doctype: str,
+        names: List[str],
+        fields: Optional[List[str]] = None,
+        chunk_size: int = 100,
+    ) -> List[Dict[str, Any]]:
+        """Get many documents by name using one "in" filtered request per chunk"""
+        fields = fields or ["*"]
+        documents = []
+        for i in range(0, len(names), chunk_size):
+            chunk = names[i : i + chunk_size]
+            documents.extend(
+                await self.get_documents(
+                    doctype,
+                    filters={"name": ["in", chunk]},
+                    fields=fields,
+                    limit=len(chunk),
+                )
+            )
+        return documents
+
     @retry(
         stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10)
     )
@@ -94,15 +130,12 @@ class FrappeClient:
     ) -> Dict[str, Any]:
         """Create a new document in Frappe"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.base_url}/api/resource/{doctype}",
-                    headers=self.headers,
-                    json=data,
-                    timeout=30.0,
-                )
-                response.raise_for_status()
-                return response.json()["data"]
+            response = await self._client.post(
+                f"/api/resource/{doctype}",
+                json=data,
+            )
+            response.raise_for_status()
+            return response.json()["data"]
         except Exception as e:
             # Log response body for debugging
             try:
@@ -139,15 +172,12 @@ class FrappeClient:
     ) -> Dict[str, Any]:
         """Update an existing document in Frappe"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.put(
-                    f"{self.base_url}/api/resource/{doctype}/{name}",
-                    headers=self.headers,
-                    json=data,
-                    timeout=30.0,
-                )
-                response.raise_for_status()
-                return response.json()["data"]
+            response = await self._client.put(
+                f"/api/resource/{doctype}/{name}",
+                json=data,
+            )
+            response.raise_for_status()
+            return response.json()["data"]
         except Exception as e:
             logger.error(
                 "Failed to update document",
@@ -164,14 +194,9 @@ class FrappeClient:
     async def delete_document(self, doctype: str, name: str) -> bool:
         """Delete a document from Frappe"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.delete(
-                    f"{self.base_url}/api/resource/{doctype}/{name}",
-                    headers=self.headers,
-                    timeout=30.0,
-                )
-                response.raise_for_status()
-                return True
+            response = await self._client.delete(f"/api/resource/{doctype}/{name}")
+            response.raise_for_status()
+            return True
         except Exception as e:
             logger.error(
                 "Failed to delete document", doctype=doctype, name=name, error=str(e)
@@ -187,15 +212,12 @@ class FrappeClient:
             if fields:
                 params["fields"] = str(fields)
 
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/api/resource/{doctype}",
-                    headers=self.headers,
-                    params=params,
-                    timeout=30.0,
-                )
-                response.raise_for_status()
-                return response.json()["data"]
+            response = await self._client.get(
+                f"/api/resource/{doctype}",
+                params=params,
+            )
+            response.raise_for_status()
+            return response.json()["data"]
         except Exception as e:
             logger.error(
                 "Failed to search documents",
@@ -213,20 +235,17 @@ class FrappeClient:
     ) -> Optional[Dict[str, Any]]:
         """Find a document by a specific field value"""
         try:
-            async with httpx.AsyncClient() as client:
-                params = {
-                    "filters": f'[["{field}", "=", "{value}"]]',
-                    "limit_page_length": 1,
-                }
-                response = await client.get(
-                    f"{self.base_url}/api/resource/{doctype}",
-                    headers=self.headers,
-                    params=params,
-                    timeout=30.0,
-                )
-                response.raise_for_status()
-                data = response.json()["data"]
-                return data[0] if data else None
+            params = {
+                "filters": json.dumps([[field, "=", value]]),
+                "limit_page_length": 1,
+            }
+            response = await self._client.get(
+                f"/api/resource/{doctype}",
+                params=params,
+            )
+            response.raise_for_status()
+            data = response.json()["data"]
+            return data[0] if data else None
         except Exception as e:
             logger.error(
                 "Failed to find document by field",
@@ -240,15 +259,12 @@ class FrappeClient:
     async def get_doctype_meta(self, doctype: str) -> Dict[str, Any]:
         """Get doctype metadata from Frappe"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/api/method/frappe.desk.form.load.getdoctype",
-                    headers=self.headers,
-                    params={"doctype": doctype},
-                    timeout=30.0,
-                )
-                response.raise_for_status()
-                return response.json()["message"]
+            response = await self._client.get(
+                "/api/method/frappe.desk.form.load.getdoctype",
+                params={"doctype": doctype},
+            )
+            response.raise_for_status()
+            return response.json()["message"]
         except Exception as e:
             logger.error("Failed to get doctype meta", doctype=doctype, error=str(e))
             raise
@@ -5,10 +5,18 @@ Logging utilities for Frappe-Supabase Sync Service
 import logging
 import sys
 from typing import Any, Dict, Optional
+import orjson
 import structlog
 from structlog.stdlib import LoggerFactory
 
 
+def _orjson_dumps(event_dict: Dict[str, Any], **kwargs: Any) -> str:
+    """Serialize a log event with orjson, returning str for stdlib handlers"""
+    return orjson.dumps(
+        event_dict, default=kwargs.get("default"), option=kwargs.get("option")
+    ).decode()
+
+
 def setup_logging(log_level: str = "INFO") -> None:
     """Setup structured logging for the sync service"""
 
@@ -19,11 +27,15 @@ def setup_logging(log_level: str = "INFO") -> None:
             structlog.stdlib.add_logger_name,
             structlog.stdlib.add_log_level,
             structlog.stdlib.PositionalArgumentsFormatter(),
-            structlog.processors.TimeStamper(fmt="iso"),
-            structlog.processors.StackInfoRenderer(),
+            # Epoch float timestamps avoid formatting a datetime per event
+            structlog.processors.TimeStamper(fmt=None, utc=True),
             structlog.processors.format_exc_info,
             structlog.processors.UnicodeDecoder(),
-            structlog.processors.JSONRenderer(),
+            # Like json.dumps, accept non-str dict keys and stringify
+            # values orjson can't serialize instead of failing the log call
+            structlog.processors.JSONRenderer(
+                serializer=_orjson_dumps, option=orjson.OPT_NON_STR_KEYS, default=str
+            ),
         ],
         context_class=dict,
         logger_factory=LoggerFactory(),
@@ -45,15 +57,23 @@ def get_logger(name: str) -> structlog.BoundLogger:
 
 
 class SyncLogger:
-    """Specialized logger for sync operations"""
+    """Specialized logger for sync operations
+
+    Each method checks the level first so the event kwargs are never built
+    for messages that ``filter_by_level`` would drop anyway.
+    """
 
     def __init__(self, name: str = "sync"):
         self.logger = get_logger(name)
+        # The stdlib logger that filter_by_level consults for this name
+        self._stdlib_logger = logging.getLogger(name)
 
     def log_sync_start(
         self, operation_id: str, direction: str, doctype: str, record_id: str
     ) -> None:
         """Log sync operation start"""
+        if not self._stdlib_logger.isEnabledFor(logging.INFO):
+            return
         self.logger.info(
             "Sync operation started",
             operation_id=operation_id,
@@ -64,6 +84,8 @@ class SyncLogger:
 
     def log_sync_success(self, operation_id: str, duration: float) -> None:
         """Log successful sync operation"""
+        if not self._stdlib_logger.isEnabledFor(logging.INFO):
+            return
         self.logger.info(
             "Sync operation completed successfully",
             operation_id=operation_id,
@@ -74,6 +96,8 @@ class SyncLogger:
         self, operation_id: str, error: str, retry_count: int = 0
     ) -> None:
         """Log sync operation error"""
+        if not self._stdlib_logger.isEnabledFor(logging.ERROR):
+            return
         self.logger.error(
             "Sync operation failed",
             operation_id=operation_id,
@@ -83,6 +107,8 @@ class SyncLogger:
 
     def log_conflict_detected(self, operation_id: str, conflict_fields: list) -> None:
         """Log conflict detection"""
+        if not self._stdlib_logger.isEnabledFor(logging.WARNING):
+            return
         self.logger.warning(
             "Sync conflict detected",
             operation_id=operation_id,
@@ -91,6 +117,8 @@ class SyncLogger:
 
     def log_webhook_received(self, source: str, doctype: str, operation: str) -> None:
         """Log webhook reception"""
+        if not self._stdlib_logger.isEnabledFor(logging.INFO):
+            return
         self.logger.info(
             "Webhook received", source=source, doctype=doctype, operation=operation
         )
@@ -99,6 +127,8 @@ class SyncLogger:
         self, operation_id: str, attempt: int, max_attempts: int
     ) -> None:
         """Log retry attempt"""
+        if not self._stdlib_logger.isEnabledFor(logging.WARNING):
+            return
         self.logger.warning(
             "Retrying sync operation",
             operation_id=operation_id,
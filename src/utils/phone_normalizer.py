@@ -2,25 +2,80 @@
 Phone number normalization utilities for sync operations
 """
 
-import re
-from typing import Optional, List
+import regex
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple
+
+# Matches any non-digit character
+_NON_DIGIT_RE = regex.compile(r"\D")
+
+# Translation table deleting every non-digit ASCII character
+_ASCII_NON_DIGITS_TABLE = str.maketrans(
+    "", "", "".join(c for c in map(chr, range(128)) if not c.isdigit())
+)
+
+# Field names to check for phone numbers / email addresses, keyed by
+# (source_system, target_system)
+_PHONE_LOOKUP_FIELDS = {
+    # Frappe to Supabase: check Frappe phone fields, map to Supabase phone field
+    ("frappe", "supabase"): ("cell_number", "mobile_no", "phone", "contact_number"),
+    # Supabase to Frappe: check Supabase phone field, map to Frappe phone fields
+    ("supabase", "frappe"): ("phone_number", "mobile", "phone", "contact_number"),
+}
+_DEFAULT_PHONE_LOOKUP_FIELDS = (
+    "phone_number",
+    "cell_number",
+    "mobile_no",
+    "phone",
+    "contact_number",
+)
+
+_EMAIL_LOOKUP_FIELDS = {
+    # Frappe to Supabase: check Frappe email fields, map to Supabase email field
+    ("frappe", "supabase"): (
+        "personal_email",
+        "company_email",
+        "preferred_contact_email",
+        "email",
+    ),
+    # Supabase to Frappe: check Supabase email field, map to Frappe email fields
+    ("supabase", "frappe"): ("email", "personal_email", "company_email"),
+}
+_DEFAULT_EMAIL_LOOKUP_FIELDS = (
+    "email",
+    "personal_email",
+    "company_email",
+    "preferred_contact_email",
+)
+
+
+def _strip_non_digits(phone: str) -> str:
+    """Remove all non-digit characters from a phone string"""
+    if phone.isascii():
+        return phone.translate(_ASCII_NON_DIGITS_TABLE)
+    # Non-ASCII input may contain other Unicode digits; let the regex decide
+    digits: str = _NON_DIGIT_RE.sub("", phone)
+    return digits
 
 
 class PhoneNormalizer:
-    """Phone number normalization class for sync operations"""
+    """Phone number normalization class for sync operations
 
-    def __init__(self):
-        pass
+    Holds no state; use the methods on the class or the shared ``normalizer``
+    instance rather than creating one per record.
+    """
 
-    def normalize_phone(self, phone: str) -> Optional[str]:
+    @staticmethod
+    def normalize_phone(phone: str) -> Optional[str]:
         """Normalize phone number to last 10 digits for consistent lookup"""
         return normalize_phone_number(phone)
 
-    def _extract_phone_digits(self, phone: str) -> str:
+    @staticmethod
+    def _extract_phone_digits(phone: str) -> str:
         """Extract only digits from phone number"""
         if not phone or not isinstance(phone, str):
             return ""
-        return re.sub(r"\D", "", phone)
+        return _strip_non_digits(phone)
 
 
 def normalize_phone_number(phone: str) -> Optional[str]:
@@ -37,8 +92,19 @@ def normalize_phone_number(phone: str) -> Optional[str]:
     if not phone or not isinstance(phone, str):
         return None
 
+    return _normalize_phone_string(phone)
+
+
+@lru_cache(maxsize=8192)
+def _normalize_phone_string(phone: str) -> Optional[str]:
+    """Normalize a non-empty phone string, cached as numbers recur across records"""
+    # Already digits only - nothing to strip. isdecimal matches the same
+    # characters as the regex's \d, unlike isdigit.
+    if phone.isdecimal():
+        return phone[-10:] if len(phone) >= 10 else None
+
     # Remove all non-digit characters
-    digits_only = re.sub(r"\D", "", phone)
+    digits_only: str = _strip_non_digits(phone)
 
     # If we have more than 10 digits, take the last 10
     if len(digits_only) > 10:
@@ -50,26 +116,43 @@ def normalize_phone_number(phone: str) -> Optional[str]:
         return None
 
 
-def extract_phone_from_data(data: dict, phone_fields: List[str]) -> Optional[str]:
+def normalize_phone_numbers(phones: Iterable[str]) -> List[Optional[str]]:
+    """
+    Normalize many phone numbers at once
+
+    Args:
+        phones: Phone numbers in any of the formats normalize_phone_number accepts
+
+    Returns:
+        Normalized phone numbers (or None for invalid ones), in input order
+    """
+    normalize = _normalize_phone_string
+    return [
+        normalize(phone) if phone and isinstance(phone, str) else None
+        for phone in phones
+    ]
+
+
+def extract_phone_from_data(data: dict, phone_fields: Iterable[str]) -> Optional[str]:
     """
     Extract and normalize phone number from data using multiple possible field names
 
     Args:
         data: Dictionary containing the data
-        phone_fields: List of field names to check for phone numbers
+        phone_fields: Field names to check for phone numbers
 
     Returns:
         Normalized phone number or None if not found
     """
     for field in phone_fields:
         if field in data and data[field]:
-            normalized = normalize_phone_number(str(data[field]))
+            normalized: Optional[str] = normalize_phone_number(str(data[field]))
             if normalized:
                 return normalized
     return None
 
 
-def get_phone_lookup_fields(source_system: str, target_system: str) -> List[str]:
+def get_phone_lookup_fields(source_system: str, target_system: str) -> Tuple[str, ...]:
     """
     Get the appropriate phone field names for lookup based on source and target systems
 
@@ -78,20 +161,14 @@ def get_phone_lookup_fields(source_system: str, target_system: str) -> List[str]
         target_system: Target system (frappe/supabase)
 
     Returns:
-        List of field names to check for phone numbers
+        Tuple of field names to check for phone numbers
     """
-    if source_system == "frappe" and target_system == "supabase":
-        # Frappe to Supabase: check Frappe phone fields, map to Supabase phone field
-        return ["cell_number", "mobile_no", "phone", "contact_number"]
-    elif source_system == "supabase" and target_system == "frappe":
-        # Supabase to Frappe: check Supabase phone field, map to Frappe phone fields
-        return ["phone_number", "mobile", "phone", "contact_number"]
-    else:
-        # Default fallback
-        return ["phone_number", "cell_number", "mobile_no", "phone", "contact_number"]
+    return _PHONE_LOOKUP_FIELDS.get(
+        (source_system, target_system), _DEFAULT_PHONE_LOOKUP_FIELDS
+    )
 
 
-def get_email_lookup_fields(source_system: str, target_system: str) -> List[str]:
+def get_email_lookup_fields(source_system: str, target_system: str) -> Tuple[str, ...]:
     """
     Get the appropriate email field names for lookup based on source and target systems
 
@@ -100,14 +177,12 @@ def get_email_lookup_fields(source_system: str, target_system: str) -> List[str]
         target_system: Target system (frappe/supabase)
 
     Returns:
-        List of field names to check for email addresses
+        Tuple of field names to check for email addresses
     """
-    if source_system == "frappe" and target_system == "supabase":
-        # Frappe to Supabase: check Frappe email fields, map to Supabase email field
-        return ["personal_email", "company_email", "preferred_contact_email", "email"]
-    elif source_system == "supabase" and target_system == "frappe":
-        # Supabase to Frappe: check Supabase email field, map to Frappe email fields
-        return ["email", "personal_email", "company_email"]
-    else:
-        # Default fallback
-        return ["email", "personal_email", "company_email", "preferred_contact_email"]
+    return _EMAIL_LOOKUP_FIELDS.get(
+        (source_system, target_system), _DEFAULT_EMAIL_LOOKUP_FIELDS
+    )
+
+
+# Shared instance for callers that want the object API
+normalizer = PhoneNormalizer()
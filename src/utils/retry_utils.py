@@ -4,14 +4,23 @@ Retry utilities with exponential backoff for HTTP requests
 
 import asyncio
 import random
+import time
 from typing import Callable, Any, Optional
 import structlog
 
 logger = structlog.get_logger(__name__)
 
+# Backoff delays at or below this (seconds) retry immediately, without
+# a round-trip through the event loop scheduler
+MIN_SLEEP_DELAY = 1e-4
+
 
 class RetryConfig:
-    """Configuration for retry behavior"""
+    """Configuration for retry behavior
+
+    Instances are shared between calls, so treat them as read-only once
+    constructed.
+    """
 
     def __init__(
         self,
@@ -26,6 +35,9 @@ class RetryConfig:
         self.max_delay = max_delay
         self.exponential_base = exponential_base
         self.jitter = jitter
+        # Jitter source for retries using this config, so they don't
+        # share the module-level random state
+        self.rng = random.Random(time.monotonic_ns())
 
 
 async def retry_with_exponential_backoff(
@@ -49,33 +61,40 @@ async def retry_with_exponential_backoff(
     if retry_config is None:
         retry_config = RetryConfig()
 
-    last_exception = None
+    # Fast path: most calls succeed on the first attempt
+    try:
+        return await func(*args, **kwargs)
+    except Exception as e:
+        last_exception = e
+        logger.warning("Attempt failed", attempt=1, error=str(e))
+
+    # Exponential backoff delays, capped at max_delay
+    delays = [
+        min(
+            retry_config.max_delay,
+            retry_config.base_delay * retry_config.exponential_base**attempt,
+        )
+        for attempt in range(retry_config.max_retries)
+    ]
+
+    for attempt, delay in enumerate(delays, start=2):
+        # Add jitter to prevent thundering herd
+        if retry_config.jitter:
+            delay *= 0.5 + retry_config.rng.random() * 0.5
+
+        if delay > MIN_SLEEP_DELAY:
+            logger.info("Waiting before retry", delay_seconds=round(delay, 2))
+            await asyncio.sleep(delay)
 
-    for attempt in range(retry_config.max_retries + 1):
         try:
-            logger.info(f"Attempt {attempt + 1}/{retry_config.max_retries + 1}")
             result = await func(*args, **kwargs)
-            if attempt > 0:
-                logger.info(f"Function succeeded on attempt {attempt + 1}")
+            logger.info("Function succeeded on retry", attempt=attempt)
             return result
         except Exception as e:
             last_exception = e
-            logger.warning(f"Attempt {attempt + 1} failed: {str(e)}")
+            logger.warning("Attempt failed", attempt=attempt, error=str(e))
 
-            if attempt == retry_config.max_retries:
-                logger.error(f"All {retry_config.max_retries + 1} attempts failed")
-                break
-
-            # Calculate delay with exponential backoff
-            delay = retry_config.base_delay * (retry_config.exponential_base**attempt)
-            delay = min(delay, retry_config.max_delay)
-
-            # Add jitter to prevent thundering herd
-            if retry_config.jitter:
-                delay *= 0.5 + random.random() * 0.5
-
-            logger.info(f"Waiting {delay:.2f} seconds before retry")
-            await asyncio.sleep(delay)
+    logger.error("All attempts failed", attempts=retry_config.max_retries + 1)
 
     # If we get here, all retries failed
     raise last_exception
@@ -1,376 +1,589 @@
-"""
-Supabase client for sync operations
-"""
-
-from typing import Any, Dict, List, Optional
-from supabase import create_client, Client
-import structlog
-
-from ..config import settings
-from .logger import get_logger
-from .retry_utils import retry_with_exponential_backoff, create_retry_config
-
-logger = get_logger(__name__)
-
-
-class SupabaseClient:
-    """Client for interacting with Supabase"""
-
-    def __init__(self):
-        self.url = settings.supabase_url
-        self.key = settings.supabase_service_role_key
-        # Create client with minimal options to avoid compatibility issues
-        try:
-            self.client: Client = create_client(self.url, self.key)
-        except Exception as e:
-            logger.error(f"Failed to create Supabase client: {e}")
-            # Create a mock client for testing
-            self.client = None
-
-    async def get_record(self, table: str, record_id: str) -> Optional[Dict[str, Any]]:
-        """Get a single record from Supabase"""
-
-        async def _get_record():
-            response = (
-                self.client.table(table).select("*").eq("id", record_id).execute()
-            )
-            if response.data:
-                return response.data[0]
-            return None
-
-        try:
-            return await retry_with_exponential_backoff(
-                _get_record,
-                retry_config=create_retry_config(max_retries=3, base_delay=1.0),
-            )
-        except Exception as e:
-            logger.error(
-                "Failed to get record", table=table, record_id=record_id, error=str(e)
-            )
-            raise
-
-    async def get_records(
-        self,
-        table: str,
-        filters: Optional[Dict[str, Any]] = None,
-        columns: Optional[List[str]] = None,
-        limit: int = 100,
-    ) -> List[Dict[str, Any]]:
-        """Get multiple records from Supabase"""
-
-        async def _get_records():
-            query = self.client.table(table).select(
-                "*" if not columns else ",".join(columns)
-            )
-
-            if filters:
-                for key, value in filters.items():
-                    query = query.eq(key, value)
-
-            query = query.limit(limit)
-            response = query.execute()
-            return response.data
-
-        try:
-            return await retry_with_exponential_backoff(
-                _get_records,
-                retry_config=create_retry_config(max_retries=3, base_delay=1.0),
-            )
-        except Exception as e:
-            logger.error(
-                "Failed to get records", table=table, filters=filters, error=str(e)
-            )
-            raise
-
-    async def create_record(self, table: str, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Create a new record in Supabase"""
-        # Debug logging to see what data is actually being sent
-        logger.info(f"Supabase create_record called with data: {data}")
-
-        async def _create_record():
-            response = self.client.table(table).insert(data).execute()
-            if response.data:
-                return response.data[0]
-            raise Exception("No data returned from insert operation")
-
-        try:
-            return await retry_with_exponential_backoff(
-                _create_record,
-                retry_config=create_retry_config(max_retries=3, base_delay=1.0),
-            )
-        except Exception as e:
-            logger.error(
-                "Failed to create record", table=table, data=data, error=str(e)
-            )
-            raise
-
-    async def insert_data(self, table: str, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Insert data into Supabase table (alias for create_record)"""
-        return await self.create_record(table, data)
-
-    async def update_record(
-        self, table: str, record_id: str, data: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        """Update an existing record in Supabase"""
-
-        async def _update_record():
-            response = (
-                self.client.table(table).update(data).eq("id", record_id).execute()
-            )
-            if response.data:
-                return response.data[0]
-            raise Exception("No data returned from update operation")
-
-        try:
-            return await retry_with_exponential_backoff(
-                _update_record,
-                retry_config=create_retry_config(max_retries=3, base_delay=1.0),
-            )
-        except Exception as e:
-            logger.error(
-                "Failed to update record",
-                table=table,
-                record_id=record_id,
-                data=data,
-                error=str(e),
-            )
-            raise
-
-    async def delete_record(self, table: str, record_id: str) -> bool:
-        """Delete a record from Supabase"""
-
-        async def _delete_record():
-            response = self.client.table(table).delete().eq("id", record_id).execute()
-            return True
-
-        try:
-            return await retry_with_exponential_backoff(
-                _delete_record,
-                retry_config=create_retry_config(max_retries=3, base_delay=1.0),
-            )
-        except Exception as e:
-            logger.error(
-                "Failed to delete record",
-                table=table,
-                record_id=record_id,
-                error=str(e),
-            )
-            raise
-
-    async def upsert_record(
-        self, table: str, data: Dict[str, Any], on_conflict: str = "id"
-    ) -> Dict[str, Any]:
-        """Upsert (insert or update) a record in Supabase"""
-
-        async def _upsert_record():
-            response = (
-                self.client.table(table).upsert(data, on_conflict=on_conflict).execute()
-            )
-            if response.data:
-                return response.data[0]
-            raise Exception("No data returned from upsert operation")
-
-        try:
-            return await retry_with_exponential_backoff(
-                _upsert_record,
-                retry_config=create_retry_config(max_retries=3, base_delay=1.0),
-            )
-        except Exception as e:
-            logger.error(
-                "Failed to upsert record", table=table, data=data, error=str(e)
-            )
-            raise
-
-    async def find_record_by_field(
-        self, table: str, field: str, value: str
-    ) -> Optional[Dict[str, Any]]:
-        """Find a record by a specific field value"""
-
-        async def _find_record_by_field():
-            response = (
-                self.client.table(table).select("*").eq(field, value).limit(1).execute()
-            )
-            if response.data:
-                return response.data[0]
-            return None
-
-        try:
-            return await retry_with_exponential_backoff(
-                _find_record_by_field,
-                retry_config=create_retry_config(max_retries=3, base_delay=1.0),
-            )
-        except Exception as e:
-            logger.error(
-                "Failed to find record by field",
-                table=table,
-                field=field,
-                value=value,
-                error=str(e),
-            )
-            return None
-
-    async def search_records(
-        self, table: str, search_term: str, columns: Optional[List[str]] = None
-    ) -> List[Dict[str, Any]]:
-        """Search records in Supabase using text search"""
-        try:
-            query = self.client.table(table).select(
-                "*" if not columns else ",".join(columns)
-            )
-            # Note: This is a basic implementation. Supabase text search requires specific setup
-            response = query.ilike("name", f"%{search_term}%").execute()
-            return response.data
-        except Exception as e:
-            logger.error(
-                "Failed to search records",
-                table=table,
-                search_term=search_term,
-                error=str(e),
-            )
-            return []
-
-    async def count_records(
-        self, table: str, filters: Optional[Dict[str, Any]] = None
-    ) -> int:
-        """Count records in Supabase table"""
-        try:
-            query = self.client.table(table).select("id", count="exact")
-
-            if filters:
-                for key, value in filters.items():
-                    query = query.eq(key, value)
-
-            response = query.execute()
-            return response.count or 0
-        except Exception as e:
-            logger.error(
-                "Failed to count records", table=table, filters=filters, error=str(e)
-            )
-            return 0
-
-    async def update_record(
-        self, table: str, record_id: str, data: Dict[str, Any]
-    ) -> Optional[Dict[str, Any]]:
-        """Update a record in Supabase table"""
-        try:
-            response = await retry_with_exponential_backoff(
-                self._update_record,
-                table,
-                record_id,
-                data,
-                config=create_retry_config(max_retries=4),
-            )
-            return response
-        except Exception as e:
-            logger.error(
-                "Failed to update record",
-                table=table,
-                record_id=record_id,
-                data=data,
-                error=str(e),
-            )
-            return None
-
-    async def _update_record(
-        self, table: str, record_id: str, data: Dict[str, Any], **kwargs
-    ) -> Optional[Dict[str, Any]]:
-        """Internal method to update a record"""
-        response = self.client.table(table).update(data).eq("id", record_id).execute()
-        if response.data:
-            return response.data[0]
-        return None
-
-    async def delete_record(self, table: str, record_id: str) -> bool:
-        """Delete a record from Supabase table"""
-        try:
-            response = await retry_with_exponential_backoff(
-                self._delete_record,
-                table,
-                record_id,
-                config=create_retry_config(max_retries=4),
-            )
-            return response
-        except Exception as e:
-            logger.error(
-                "Failed to delete record",
-                table=table,
-                record_id=record_id,
-                error=str(e),
-            )
-            return False
-
-    async def _delete_record(self, table: str, record_id: str, **kwargs) -> bool:
-        """Internal method to delete a record"""
-        response = self.client.table(table).delete().eq("id", record_id).execute()
-        return True
-
-    async def get_documents(
-        self,
-        table: str,
-        filters: Optional[Dict[str, Any]] = None,
-        fields: Optional[List[str]] = None,
-        limit: int = 100,
-    ) -> List[Dict[str, Any]]:
-        """Get multiple documents from Supabase table"""
-
-        async def _get_documents():
-            # Start with base query and select
-            if fields:
-                query = self.client.table(table).select(",".join(fields))
-            else:
-                query = self.client.table(table).select("*")
-
-            if filters:
-                # Handle both dictionary and list formats
-                if isinstance(filters, dict):
-                    # Dictionary format: {"field": "value"}
-                    for field, value in filters.items():
-                        query = query.eq(field, value)
-                elif isinstance(filters, list):
-                    # List format: [["field", "=", "value"]]
-                    for filter_condition in filters:
-                        if len(filter_condition) == 3:
-                            field, operator, value = filter_condition
-                            if operator == "=":
-                                query = query.eq(field, value)
-                            elif operator == "!=":
-                                query = query.neq(field, value)
-                            elif operator == ">":
-                                query = query.gt(field, value)
-                            elif operator == ">=":
-                                query = query.gte(field, value)
-                            elif operator == "<":
-                                query = query.lt(field, value)
-                            elif operator == "<=":
-                                query = query.lte(field, value)
-                            elif operator == "in":
-                                query = query.in_(field, value)
-                            elif operator == "like":
-                                query = query.like(field, value)
-
-            # Apply limit
-            query = query.limit(limit)
-
-            response = query.execute()
-            return response.data
-
-        try:
-            return await retry_with_exponential_backoff(
-                _get_documents, retry_config=create_retry_config(max_retries=4)
-            )
-        except Exception as e:
-            logger.error("Failed to get documents", table=table, error=str(e))
-            raise
-
-    async def health_check(self) -> bool:
-        """Check if Supabase connection is healthy"""
-        try:
-            if not self.client:
-                return False
-
-            # Try to get a simple record to test connection
-            response = self.client.table("users").select("id").limit(1).execute()
-            return True
-        except Exception as e:
-            logger.error("Supabase health check failed", error=str(e))
-            return False
+"""
+Supabase client for sync operations
+"""
+
+import asyncio
+from collections import defaultdict
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+import httpx
+from postgrest import AsyncPostgrestClient
+from supabase import create_client, Client
+import structlog
+
+from ..config import settings
+from .logger import get_logger
+from .retry_utils import (
+    RetryConfig,
+    create_retry_config,
+    retry_with_exponential_backoff,
+)
+
+logger = get_logger(__name__)
+
+# Maximum number of values sent in a single batched "in" lookup
+BATCH_LOAD_MAX_KEYS = 100
+
+# Retry configurations shared by every call
+_DEFAULT_RETRY_CONFIG = create_retry_config(max_retries=3, base_delay=1.0)
+_WRITE_RETRY_CONFIG = create_retry_config(max_retries=4)
+
+
+@lru_cache(maxsize=1)
+def _get_client(url: str, key: str) -> Client:
+    """Create the underlying supabase-py client once per process
+
+    Table operations go through the shared async PostgREST client, which
+    takes its REST URL, headers and timeout from this one. Failures aren't
+    cached, so a later instantiation retries.
+    """
+    return create_client(url, key)
+
+
+class _PooledAsyncPostgrestClient(AsyncPostgrestClient):
+    """PostgREST client whose requests don't block the event loop
+
+    supabase-py 2.0 only ships a synchronous client, so table operations
+    go through postgrest's async client. Its session gets bounded, retrying
+    connections: httpx's default limits let sync bursts open more
+    connections than Supabase allows per client. Only one instance exists
+    per process (see _get_postgrest), so the limits bound the whole
+    process rather than each SupabaseClient.
+    """
+
+    def create_session(
+        self,
+        base_url: str,
+        headers: Dict[str, str],
+        timeout: Union[int, float, httpx.Timeout],
+    ) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            base_url=base_url,
+            headers=headers,
+            timeout=timeout,
+            transport=httpx.AsyncHTTPTransport(
+                limits=httpx.Limits(
+                    max_connections=settings.supabase_max_connections,
+                    max_keepalive_connections=settings.supabase_max_keepalive_connections,
+                    keepalive_expiry=settings.supabase_keepalive_expiry,
+                ),
+                retries=settings.supabase_transport_retries,
+            ),
+        )
+
+
+# Async PostgREST client shared by every SupabaseClient in the process, so
+# they all draw on one connection pool. Created on first use.
+_postgrest: Optional[_PooledAsyncPostgrestClient] = None
+
+
+def _get_postgrest(client: Client) -> _PooledAsyncPostgrestClient:
+    """Return the shared async PostgREST client, creating it if needed"""
+    global _postgrest
+    if _postgrest is None:
+        _postgrest = _PooledAsyncPostgrestClient(
+            client.rest_url,
+            headers=client.options.headers,
+            schema=client.options.schema,
+            timeout=client.options.postgrest_client_timeout,
+        )
+    return _postgrest
+
+
+async def close_postgrest() -> None:
+    """Close the shared PostgREST connection pool
+
+    Call on shutdown; a query made afterwards opens a new pool.
+    """
+    global _postgrest
+    if _postgrest is not None:
+        postgrest, _postgrest = _postgrest, None
+        await postgrest.aclose()
+
+
+def _postgrest_in_list(values: List[Any]) -> str:
+    """Format values as a PostgREST ``in`` list, quoting every one
+
+    postgrest's in_() only quotes values containing reserved characters and
+    doesn't escape double quotes or backslashes inside them.
+    """
+    quoted = (
+        '"{}"'.format(str(value).replace("\\", "\\\\").replace('"', '\\"'))
+        for value in values
+    )
+    return "({})".format(",".join(quoted))
+
+
+class _RecordBatchLoader:
+    """Coalesces single-record lookups made in the same event-loop tick
+
+    Lookups queued for the same (table, field, select list) before the flush
+    task runs are fetched with one ``in`` query instead of one query each, and
+    each caller gets back the first matching row (or None). If the batched
+    query fails, each value is looked up once on its own, without retries,
+    so only the lookups for a bad value fail.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[
+            [str, str, List[Any], str, Optional[int], bool],
+            Awaitable[List[Dict[str, Any]]],
+        ],
+    ):
+        self._fetch = fetch
+        self._pending: Dict[Tuple[str, str, str], List[Tuple[Any, asyncio.Future]]] = (
+            defaultdict(list)
+        )
+        self._flush_task: Optional[asyncio.Task] = None
+
+    async def load(
+        self, table: str, field: str, value: Any, select: str = "*"
+    ) -> Optional[Dict]:
+        """Queue a lookup and wait for the batch it lands in"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending[(table, field, select)].append((value, future))
+        if self._flush_task is None:
+            self._flush_task = loop.create_task(self._flush())
+        return await future
+
+    async def _flush(self):
+        """Run every queued lookup, one batched query per batch key"""
+        pending, self._pending = self._pending, defaultdict(list)
+        self._flush_task = None
+        await asyncio.gather(
+            *(
+                self._load_batch(table, field, select, entries)
+                for (table, field, select), entries in pending.items()
+            )
+        )
+
+    async def _load_batch(
+        self,
+        table: str,
+        field: str,
+        select: str,
+        entries: List[Tuple[Any, asyncio.Future]],
+    ):
+        """Fetch one batch and resolve its futures"""
+        # Rows come back with typed values, so match on their string form
+        values = list({str(value): value for value, _ in entries}.values())
+        found = {}
+        for start in range(0, len(values), BATCH_LOAD_MAX_KEYS):
+            found.update(
+                await self._fetch_first_rows(
+                    table, field, select, values[start : start + BATCH_LOAD_MAX_KEYS]
+                )
+            )
+
+        for value, future in entries:
+            if future.done():
+                continue
+            row = found.get(str(value))
+            if isinstance(row, Exception):
+                future.set_exception(row)
+            else:
+                future.set_result(row)
+
+    async def _fetch_first_rows(
+        self, table: str, field: str, select: str, values: List[Any]
+    ) -> Dict[str, Any]:
+        """Map each value's string form to its first row, or to the error for it
+
+        Values with no matching row are left out.
+        """
+        try:
+            # At most one row per value, as with a single limit(1) lookup
+            rows = await self._fetch(table, field, values, select, len(values), True)
+        except Exception as e:
+            if len(values) == 1:
+                return {str(values[0]): e}
+            # Look each value up on its own so a bad value only fails its own
+            # lookup; the batch was already retried, so these aren't
+            return await self._fetch_each(table, field, select, values, retry=False)
+
+        found = {}
+        for row in rows:
+            found.setdefault(str(row.get(field)), row)
+        if len(rows) == len(values) > len(found):
+            # On a non-unique field, values with several rows can use up the
+            # limit; look up the ones it cut off individually
+            found.update(
+                await self._fetch_each(
+                    table,
+                    field,
+                    select,
+                    [value for value in values if str(value) not in found],
+                    retry=True,
+                )
+            )
+        return found
+
+    async def _fetch_each(
+        self, table: str, field: str, select: str, values: List[Any], retry: bool
+    ) -> Dict[str, Any]:
+        """Look up each value with its own concurrent query"""
+        results = await asyncio.gather(
+            *(self._fetch(table, field, [value], select, 1, retry) for value in values),
+            return_exceptions=True,
+        )
+        found = {}
+        for value, result in zip(values, results):
+            if isinstance(result, Exception):
+                found[str(value)] = result
+            elif result:
+                found[str(value)] = result[0]
+        return found
+
+
+class SupabaseClient:
+    """Client for interacting with Supabase"""
+
+    def __init__(self):
+        self.url = settings.supabase_url
+        self.key = settings.supabase_service_role_key
+        # Create client with minimal options to avoid compatibility issues
+        try:
+            self.client: Client = _get_client(self.url, self.key)
+        except Exception as e:
+            logger.error(f"Failed to create Supabase client: {e}")
+            # Create a mock client for testing
+            self.client = None
+        self._record_loader = _RecordBatchLoader(self._get_records_in)
+
+    @property
+    def postgrest(self) -> Optional[AsyncPostgrestClient]:
+        """The process-wide async PostgREST client, or None without a client"""
+        return _get_postgrest(self.client) if self.client else None
+
+    async def _execute(self, query, retry_config: RetryConfig = _DEFAULT_RETRY_CONFIG):
+        """Execute a PostgREST query, retrying failed attempts"""
+        return await retry_with_exponential_backoff(
+            query.execute, retry_config=retry_config
+        )
+
+    async def _get_records_in(
+        self,
+        table: str,
+        field: str,
+        values: List[Any],
+        select: str = "*",
+        limit: Optional[int] = None,
+        retry: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """Get the records whose field matches one of the values"""
+        query = (
+            self.postgrest.from_(table)
+            .select(select)
+            .filter(field, "in", _postgrest_in_list(values))
+        )
+        if limit is not None:
+            query = query.limit(limit)
+        if retry:
+            response = await self._execute(query)
+        else:
+            response = await query.execute()
+        return response.data
+
+    async def get_record(self, table: str, record_id: str) -> Optional[Dict[str, Any]]:
+        """Get a single record from Supabase"""
+        try:
+            # Batched with other get_record calls made in the same tick
+            return await self._record_loader.load(table, "id", record_id)
+        except Exception as e:
+            logger.error(
+                "Failed to get record", table=table, record_id=record_id, error=str(e)
+            )
+            raise
+
+    async def get_records(
+        self,
+        table: str,
+        filters: Optional[Dict[str, Any]] = None,
+        columns: Optional[List[str]] = None,
+        limit: int = 100,
+    ) -> List[Dict[str, Any]]:
+        """Get multiple records from Supabase"""
+        try:
+            query = self.postgrest.from_(table).select(
+                "*" if not columns else ",".join(columns)
+            )
+
+            if filters:
+                for key, value in filters.items():
+                    query = query.eq(key, value)
+
+            response = await self._execute(query.limit(limit))
+            return response.data
+        except Exception as e:
+            logger.error(
+                "Failed to get records", table=table, filters=filters, error=str(e)
+            )
+            raise
+
+    async def create_record(self, table: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Create a new record in Supabase"""
+        # Log field names only - values may contain personal data
+        logger.debug("Supabase create_record called", table=table, keys=list(data))
+
+        try:
+            response = await self._execute(self.postgrest.from_(table).insert(data))
+            if response.data:
+                return response.data[0]
+            raise Exception("No data returned from insert operation")
+        except Exception as e:
+            logger.error(
+                "Failed to create record", table=table, data=data, error=str(e)
+            )
+            raise
+
+    async def insert_data(self, table: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Insert data into Supabase table (alias for create_record)"""
+        return await self.create_record(table, data)
+
+    async def upsert_record(
+        self, table: str, data: Dict[str, Any], on_conflict: str = "id"
+    ) -> Dict[str, Any]:
+        """Upsert (insert or update) a record in Supabase"""
+        try:
+            response = await self._execute(
+                self.postgrest.from_(table).upsert(data, on_conflict=on_conflict)
+            )
+            if response.data:
+                return response.data[0]
+            raise Exception("No data returned from upsert operation")
+        except Exception as e:
+            logger.error(
+                "Failed to upsert record", table=table, data=data, error=str(e)
+            )
+            raise
+
+    async def bulk_upsert(
+        self,
+        table: str,
+        rows: List[Dict[str, Any]],
+        on_conflict: str = "id",
+        chunk_size: int = 500,
+    ) -> List[Dict[str, Any]]:
+        """Upsert many records using one request per chunk of rows"""
+        records = []
+        try:
+            for i in range(0, len(rows), chunk_size):
+                chunk = rows[i : i + chunk_size]
+                response = await self._execute(
+                    self.postgrest.from_(table).upsert(chunk, on_conflict=on_conflict)
+                )
+                records.extend(response.data)
+            return records
+        except Exception as e:
+            logger.error(
+                "Failed to bulk upsert records",
+                table=table,
+                row_count=len(rows),
+                upserted_count=len(records),
+                error=str(e),
+            )
+            raise
+
+    async def find_record_by_field(
+        self,
+        table: str,
+        field: str,
+        value: str,
+        columns: Optional[List[str]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Find a record by a specific field value
+
+        Pass ``columns`` to fetch only those columns instead of the whole row.
+        """
+        # The lookup field is always selected so batched rows can be matched
+        select = (
+            ",".join(columns if field in columns else [*columns, field])
+            if columns
+            else "*"
+        )
+        try:
+            # Batched with other lookups on the same field made in the same tick
+            return await self._record_loader.load(table, field, value, select)
+        except Exception as e:
+            logger.error(
+                "Failed to find record by field",
+                table=table,
+                field=field,
+                value=value,
+                error=str(e),
+            )
+            return None
+
+    async def search_records(
+        self,
+        table: str,
+        search_term: str,
+        columns: Optional[List[str]] = None,
+        use_fts: bool = True,
+        text_search_config: str = "english",
+    ) -> List[Dict[str, Any]]:
+        """Search records in Supabase using text search
+
+        Full-text search matches words in the name column and needs a GIN
+        index on the table to avoid a scan, e.g.
+        ``CREATE INDEX ... USING GIN (to_tsvector('english', name))``.
+        Pass ``use_fts=False`` for the old substring (ILIKE) match.
+        """
+        try:
+            query = self.postgrest.from_(table).select(
+                "*" if not columns else ",".join(columns)
+            )
+            if use_fts:
+                # websearch_to_tsquery syntax: quoted phrases, "or", -exclusions
+                query = query.filter("name", f"wfts({text_search_config})", search_term)
+            else:
+                query = query.ilike("name", f"%{search_term}%")
+            response = await self._execute(query)
+            return response.data
+        except Exception as e:
+            logger.error(
+                "Failed to search records",
+                table=table,
+                search_term=search_term,
+                error=str(e),
+            )
+            return []
+
+    async def count_records(
+        self, table: str, filters: Optional[Dict[str, Any]] = None, exact: bool = False
+    ) -> int:
+        """Count records in Supabase table
+
+        Unless ``exact`` is set, the count comes from Postgres statistics
+        (or the planner's estimate when filtered) instead of a full count(*)
+        scan, so it may be approximate.
+        """
+        if exact:
+            count_method = "exact"
+        elif filters:
+            count_method = "planned"
+        else:
+            count_method = "estimated"
+
+        try:
+            query = self.postgrest.from_(table).select("id", count=count_method)
+
+            if filters:
+                for key, value in filters.items():
+                    query = query.eq(key, value)
+
+            response = await self._execute(query)
+            return response.count or 0
+        except Exception as e:
+            logger.error(
+                "Failed to count records", table=table, filters=filters, error=str(e)
+            )
+            return 0
+
+    async def update_record(
+        self, table: str, record_id: str, data: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """Update a record in Supabase table"""
+        try:
+            response = await self._execute(
+                self.postgrest.from_(table).update(data).eq("id", record_id),
+                _WRITE_RETRY_CONFIG,
+            )
+            if response.data:
+                return response.data[0]
+            return None
+        except Exception as e:
+            logger.error(
+                "Failed to update record",
+                table=table,
+                record_id=record_id,
+                data=data,
+                error=str(e),
+            )
+            return None
+
+    async def delete_record(self, table: str, record_id: str) -> bool:
+        """Delete a record from Supabase table"""
+        try:
+            await self._execute(
+                self.postgrest.from_(table).delete().eq("id", record_id),
+                _WRITE_RETRY_CONFIG,
+            )
+            return True
+        except Exception as e:
+            logger.error(
+                "Failed to delete record",
+                table=table,
+                record_id=record_id,
+                error=str(e),
+            )
+            return False
+
+    async def get_documents(
+        self,
+        table: str,
+        filters: Optional[Dict[str, Any]] = None,
+        fields: Optional[List[str]] = None,
+        limit: int = 100,
+    ) -> List[Dict[str, Any]]:
+        """Get multiple documents from Supabase table"""
+        try:
+            # Start with base query and select
+            if fields:
+                query = self.postgrest.from_(table).select(",".join(fields))
+            else:
+                query = self.postgrest.from_(table).select("*")
+
+            if filters:
+                # Handle both dictionary and list formats
+                if isinstance(filters, dict):
+                    # Dictionary format: {"field": "value"}
+                    for field, value in filters.items():
+                        query = query.eq(field, value)
+                elif isinstance(filters, list):
+                    # List format: [["field", "=", "value"]]
+                    for filter_condition in filters:
+                        if len(filter_condition) == 3:
+                            field, operator, value = filter_condition
+                            if operator == "=":
+                                query = query.eq(field, value)
+                            elif operator == "!=":
+                                query = query.neq(field, value)
+                            elif operator == ">":
+                                query = query.gt(field, value)
+                            elif operator == ">=":
+                                query = query.gte(field, value)
+                            elif operator == "<":
+                                query = query.lt(field, value)
+                            elif operator == "<=":
+                                query = query.lte(field, value)
+                            elif operator == "in":
+                                query = query.in_(field, value)
+                            elif operator == "like":
+                                query = query.like(field, value)
+
+            # Apply limit
+            query = query.limit(limit)
+
+            response = await self._execute(query, _WRITE_RETRY_CONFIG)
+            return response.data
+        except Exception as e:
+            logger.error("Failed to get documents", table=table, error=str(e))
+            raise
+
+    async def health_check(self) -> bool:
+        """Check if Supabase connection is healthy"""
+        try:
+            if not self.postgrest:
+                return False
+
+            # Try to get a simple record to test connection
+            response = (
+                await self.postgrest.from_("users").select("id").limit(1).execute()
+            )
+            return True
+        except Exception as e:
+            logger.error("Supabase health check failed", error=str(e))
+            return False
@@ -2,15 +2,161 @@
 Webhook deduplication service to prevent infinite sync loops
 """
 
+import logging
+import sys
 import time
-from typing import Dict, Set, Optional
+from collections import OrderedDict
+from enum import Enum
+from functools import lru_cache
+from itertools import islice
+from typing import Callable, Dict, List, Set, Optional, Tuple
 from datetime import datetime, timedelta
+import redis.asyncio as aioredis
 import structlog
 
 from ..config import settings
 from .logger import get_logger
+from .phone_normalizer import (
+    extract_phone_from_data,
+    get_phone_lookup_fields,
+    get_email_lookup_fields,
+)
 
 logger = get_logger(__name__)
+# The stdlib logger that filter_by_level consults for this module; checked
+# before building the kwargs of per-webhook info logs
+_stdlib_logger = logging.getLogger(__name__)
+
+# Most keys per map that get_stats(include_keys=True) returns
+STATS_MAX_KEYS = 100
+
+# Dedup map key: (source, doctype, record identifier)
+WebhookKey = Tuple[str, str, str]
+
+# Timestamp slots of a dedup entry
+_PROCESSED = 0
+_SUCCEEDED = 1
+
+
+class DedupResult(str, Enum):
+    """Outcome of checking an incoming webhook with classify"""
+
+    PROCESS = "process"
+    DUPLICATE = "duplicate_webhook"
+    OPPOSITE_ECHO = "opposite_service_webhook_after_sync"
+
+
+def _format_key(key: WebhookKey) -> str:
+    """Render a dedup key for logs and stats"""
+    return ":".join(key)
+
+
+def _opposite_key(source: str, doctype: str, record_id: str) -> WebhookKey:
+    """Key under which the opposite service records syncs of this record"""
+    opposite_source = "supabase" if source == "frappe" else "frappe"
+    return (opposite_source, sys.intern(doctype), record_id)
+
+
+def _redis_key(kind: str, key: WebhookKey) -> str:
+    """Redis key holding one kind ("processed"/"synced") of dedup marker"""
+    return f"webhook_dedup:{kind}:{_format_key(key)}"
+
+
+def _log_recorded_sync(sync_key: WebhookKey, source: str) -> None:
+    """Log a successful sync recorded to catch its echoed webhook"""
+    if not _stdlib_logger.isEnabledFor(logging.INFO):
+        return
+    logger.info(
+        "Recorded successful sync to prevent opposite service webhook",
+        sync_key=_format_key(sync_key),
+        source=source,
+    )
+
+
+def _log_shared_store_unavailable(error: Exception) -> None:
+    """Log a Redis failure before falling back to the local store"""
+    logger.warning(
+        "Shared webhook dedup store unavailable, using local store", error=str(error)
+    )
+
+
+def _employee_identifier_for(source: str) -> Callable[[dict], Optional[str]]:
+    """Build the Employee/Users identifier for webhooks from ``source``
+
+    Identifies records by phone number, falling back to email, with the
+    source's lookup fields resolved up front.
+    """
+    phone_fields = get_phone_lookup_fields(source, "any")
+    email_fields = get_email_lookup_fields(source, "any")
+
+    def employee_identifier(data: dict) -> Optional[str]:
+        phone = extract_phone_from_data(data, phone_fields)
+        if phone:
+            return f"phone:{phone}"
+
+        for field in email_fields:
+            email = data.get(field)
+            if email:
+                return f"email:{email}"
+        return None
+
+    return employee_identifier
+
+
+def _task_identifier(data: dict) -> Optional[str]:
+    """Identify Task records by subject/task_name plus description/page_content"""
+    subject = data.get("subject") or data.get("task_name") or data.get("name")
+    if not subject:
+        return None
+
+    # Only the first 50 chars of the description are used, so don't make
+    # the cache below hash the rest
+    description = data.get("description") or data.get("page_content")
+    return _subject_identifier(
+        str(subject), str(description)[:50] if description else ""
+    )
+
+
+# Flattens line breaks and tabs in a description snippet to spaces
+_DESC_WHITESPACE_TABLE = str.maketrans("\n\r\t", "   ")
+
+
+@lru_cache(maxsize=4096)
+def _subject_identifier(subject: str, description: str) -> str:
+    """Build a task identifier, cached as the same task is seen repeatedly"""
+    # Use subject + the description prefix for better uniqueness
+    desc_snippet = description.translate(_DESC_WHITESPACE_TABLE).strip()
+    identifier = f"subject:{subject}"
+    if desc_snippet:
+        identifier += f"_desc:{desc_snippet}"
+    return identifier
+
+
+def _generic_identifier(data: dict) -> Optional[str]:
+    """Identify other records by their name field"""
+    name = data.get("name") or data.get("title") or data.get("subject")
+    return f"name:{name}" if name else None
+
+
+# Identifier builder factories keyed by lowercased doctype; each takes the
+# webhook source and returns a function of the payload alone
+_IDENTIFIER_FACTORIES: Dict[str, Callable[[str], Callable[[dict], Optional[str]]]] = {
+    "employee": _employee_identifier_for,
+    "users": _employee_identifier_for,
+    "task": lambda source: _task_identifier,
+    "tasks": lambda source: _task_identifier,
+}
+
+
+@lru_cache(maxsize=256)
+def _identifier_for(source: str, doctype: str) -> Callable[[dict], Optional[str]]:
+    """Identifier builder specialised for one (source, doctype) pair
+
+    Resolved once per pair, so the per-webhook path is a single cached
+    lookup with no lowercasing, branching or field-list resolution.
+    """
+    factory = _IDENTIFIER_FACTORIES.get(doctype.lower())
+    return factory(source) if factory else _generic_identifier
 
 
 class WebhookDeduplicator:
@@ -19,14 +165,27 @@ class WebhookDeduplicator:
     """
 
     def __init__(self):
-        self.processed_webhooks: Dict[str, float] = {}
-        self.successful_syncs: Dict[str, float] = (
-            {}
-        )  # Track successful syncs by identifier
+        # Latest [processed, successful sync] time.monotonic_ns() timestamps
+        # per webhook key, 0 when unset. Entries are kept in order of their
+        # last update (oldest first), so expired ones can be dropped from
+        # the front without a full scan. Expiry is by elapsed time rather
+        # than by how many events arrived since, as echoed webhooks come
+        # back after a delay that doesn't depend on traffic volume.
+        self.entries: "OrderedDict[WebhookKey, List[int]]" = OrderedDict()
+        # Number of entries with each timestamp slot set, kept up to date
+        # as slots are set and cleared so get_stats needn't scan entries
+        self._slot_counts = [0, 0]
         self.timeout_ms = settings.webhook_deduplication_timeout
+        self.timeout_ns = self.timeout_ms * 1_000_000
+        # Expired entries are pruned at most this often
+        self._cleanup_interval_ns = self.timeout_ns // 4
+        self._last_cleanup_ns = 0
         self.enabled = settings.enable_webhook_deduplication
+        # Hard cap on tracked keys; keys come from webhook payloads, so a
+        # burst of distinct records must not grow memory without bound
+        self.max_entries = settings.webhook_dedup_max_entries
 
-    def _get_record_identifier(
+    def get_record_identifier(
         self, source: str, doctype: str, data: dict
     ) -> Optional[str]:
         """
@@ -35,52 +194,12 @@ class WebhookDeduplicator:
         For Employee records: use phone number (last 10 digits) or email
         For Task records: use subject/task_name
         For other records: use name field
+
+        Callers that run several checks for the same webhook can compute
+        this once and pass it as ``record_id`` to each of them.
         """
         try:
-            if doctype.lower() in ["employee", "users"]:
-                # For Employee/Users: prioritize phone number, fallback to email
-                from .phone_normalizer import (
-                    extract_phone_from_data,
-                    get_phone_lookup_fields,
-                    get_email_lookup_fields,
-                )
-
-                # Try phone number first
-                phone_fields = get_phone_lookup_fields(source, "any")
-                phone = extract_phone_from_data(data, phone_fields)
-                if phone:
-                    return f"phone:{phone}"
-
-                # Fallback to email
-                email_fields = get_email_lookup_fields(source, "any")
-                for field in email_fields:
-                    if field in data and data[field]:
-                        return f"email:{data[field]}"
-
-            elif doctype.lower() in ["task", "tasks"]:
-                # For Task records: use subject/task_name + description/page_content for better deduplication
-                subject = (
-                    data.get("subject") or data.get("task_name") or data.get("name")
-                )
-                description = data.get("description") or data.get("page_content") or ""
-
-                if subject:
-                    # Use subject + first 50 chars of description for better uniqueness
-                    desc_snippet = (
-                        description[:50].replace("\n", " ").strip()
-                        if description
-                        else ""
-                    )
-                    identifier = f"subject:{subject}"
-                    if desc_snippet:
-                        identifier += f"_desc:{desc_snippet}"
-                    return identifier
-
-            else:
-                # For other records: use name field
-                name = data.get("name") or data.get("title") or data.get("subject")
-                if name:
-                    return f"name:{name}"
+            return _identifier_for(source, doctype)(data)
 
         except Exception as e:
             logger.error(
@@ -89,7 +208,13 @@ class WebhookDeduplicator:
 
         return None
 
-    def is_duplicate(self, source: str, doctype: str, data: dict) -> bool:
+    def is_duplicate(
+        self,
+        source: str,
+        doctype: str,
+        data: dict,
+        record_id: Optional[str] = None,
+    ) -> bool:
         """
         Check if this webhook is a duplicate that should be ignored
 
@@ -97,6 +222,7 @@ class WebhookDeduplicator:
             source: Source system (frappe/supabase)
             doctype: Document type
             data: Record data
+            record_id: Precomputed get_record_identifier result, if available
 
         Returns:
             True if this is a duplicate webhook that should be ignored
@@ -104,131 +230,502 @@ class WebhookDeduplicator:
         if not self.enabled:
             return False
 
-        try:
-            # Generate record identifier
-            record_id = self._get_record_identifier(source, doctype, data)
-            if not record_id:
-                return False
+        # Generate record identifier (logs and returns None on bad payloads)
+        if record_id is None:
+            record_id = self.get_record_identifier(source, doctype, data)
+        if not record_id:
+            return False
 
-            # Create unique key for this webhook
-            webhook_key = f"{source}:{doctype}:{record_id}"
-            current_time = time.time() * 1000  # Convert to milliseconds
-
-            # Check if we've seen this webhook recently
-            if webhook_key in self.processed_webhooks:
-                last_processed = self.processed_webhooks[webhook_key]
-                time_diff = current_time - last_processed
-
-                if time_diff < self.timeout_ms:
-                    logger.info(
-                        "Duplicate webhook detected, ignoring",
-                        webhook_key=webhook_key,
-                        time_diff_ms=time_diff,
-                        timeout_ms=self.timeout_ms,
-                    )
-                    return True
-                else:
-                    # Timeout expired, remove old entry
-                    del self.processed_webhooks[webhook_key]
-
-            # Record this webhook
-            self.processed_webhooks[webhook_key] = current_time
-
-            # Clean up old entries (older than 2x timeout)
-            self._cleanup_old_entries(current_time)
+        current_time = time.monotonic_ns()
 
-            return False
+        # Drop entries older than 2x timeout first (at most every quarter
+        # timeout), so the probe below only sees a near-live window
+        self._cleanup_old_entries(current_time)
 
-        except Exception as e:
-            logger.error("Error in webhook deduplication", error=str(e))
-            return False
+        return self._check_and_record(source, doctype, record_id, current_time)
 
-    def _cleanup_old_entries(self, current_time: float):
-        """Clean up old webhook entries to prevent memory leaks"""
-        try:
-            cutoff_time = current_time - (self.timeout_ms * 2)
-            old_keys = [
-                key
-                for key, timestamp in self.processed_webhooks.items()
-                if timestamp < cutoff_time
-            ]
-            for key in old_keys:
-                del self.processed_webhooks[key]
-        except Exception as e:
-            logger.error("Error cleaning up old webhook entries", error=str(e))
+    def is_duplicate_batch(self, events: List[Tuple[str, str, dict]]) -> List[bool]:
+        """
+        Check a batch of webhooks for duplicates in one pass
+
+        Equivalent to calling is_duplicate for each event in order (so a
+        repeat within the batch is a duplicate of the earlier event), but
+        reads the clock and prunes expired entries once for the whole batch.
 
-    def record_successful_sync(self, source: str, doctype: str, data: dict):
+        Args:
+            events: (source, doctype, data) tuples
+
+        Returns:
+            For each event, True if it is a duplicate that should be ignored
+        """
+        if not self.enabled:
+            return [False] * len(events)
+
+        record_ids = [
+            self.get_record_identifier(source, doctype, data)
+            for source, doctype, data in events
+        ]
+
+        current_time = time.monotonic_ns()
+        self._cleanup_old_entries(current_time)
+
+        results = []
+        for (source, doctype, _), record_id in zip(events, record_ids):
+            results.append(
+                bool(record_id)
+                and self._check_and_record(source, doctype, record_id, current_time)
+            )
+        return results
+
+    def _check_and_record(
+        self, source: str, doctype: str, record_id: str, current_time: int
+    ) -> bool:
+        """Return True if the webhook was seen within the timeout, else record it"""
+        # Create unique key for this webhook. source/doctype come from a
+        # small set of values, so interning them makes key comparisons
+        # mostly identity checks.
+        webhook_key = (sys.intern(source), sys.intern(doctype), record_id)
+
+        # Check if we've seen this webhook recently
+        entry = self.entries.get(webhook_key)
+        if entry is not None and entry[_PROCESSED]:
+            time_diff = current_time - entry[_PROCESSED]
+
+            if time_diff < self.timeout_ns:
+                self._log_duplicate(webhook_key, time_diff)
+                return True
+
+        # Record this webhook (replacing any expired timestamp)
+        self._touch(webhook_key, entry, _PROCESSED, current_time)
+        return False
+
+    def _log_duplicate(
+        self, webhook_key: WebhookKey, time_diff: Optional[int] = None
+    ) -> None:
+        """Log a webhook skipped as a duplicate"""
+        if not _stdlib_logger.isEnabledFor(logging.INFO):
+            return
+        logger.info(
+            "Duplicate webhook detected, ignoring",
+            webhook_key=_format_key(webhook_key),
+            time_diff_ms=time_diff / 1_000_000 if time_diff is not None else None,
+            timeout_ms=self.timeout_ms,
+        )
+
+    def _touch(
+        self,
+        key: WebhookKey,
+        entry: Optional[List[int]],
+        slot: int,
+        current_time: int,
+    ) -> None:
+        """Set one timestamp of an entry and move it to the newest position"""
+        if entry is None:
+            entry = [0, 0]
+            self.entries[key] = entry
+            if len(self.entries) > self.max_entries:
+                self._pop_oldest()
+        else:
+            self.entries.move_to_end(key)
+        if not entry[slot]:
+            self._slot_counts[slot] += 1
+        entry[slot] = current_time
+
+    def _pop_oldest(self) -> None:
+        """Drop the least recently updated entry"""
+        _, entry = self.entries.popitem(last=False)
+        for slot, timestamp in enumerate(entry):
+            if timestamp:
+                self._slot_counts[slot] -= 1
+
+    def _cleanup_old_entries(self, current_time: int):
+        """Clean up old webhook entries to prevent memory leaks"""
+        if current_time - self._last_cleanup_ns <= self._cleanup_interval_ns:
+            return
+        self._last_cleanup_ns = current_time
+
+        cutoff_time = current_time - (self.timeout_ns * 2)
+        # Entries are in update order, so stop at the first live one
+        while self.entries:
+            entry = next(iter(self.entries.values()))
+            if max(entry) >= cutoff_time:
+                break
+            self._pop_oldest()
+
+    def record_successful_sync(
+        self,
+        source: str,
+        doctype: str,
+        data: dict,
+        record_id: Optional[str] = None,
+    ):
         """Record a successful sync to prevent opposite service webhooks"""
+        if not self.enabled:
+            return
+
         try:
-            record_id = self._get_record_identifier(source, doctype, data)
+            if record_id is None:
+                record_id = self.get_record_identifier(source, doctype, data)
             if record_id:
                 # Create identifier for the same service (not opposite)
-                sync_key = f"{source}:{doctype}:{record_id}"
-                current_time = time.time() * 1000
-
-                self.successful_syncs[sync_key] = current_time
-                logger.info(
-                    "Recorded successful sync to prevent opposite service webhook",
-                    sync_key=sync_key,
-                    source=source,
+                sync_key = (sys.intern(source), sys.intern(doctype), record_id)
+
+                current_time = time.monotonic_ns()
+                self._touch(
+                    sync_key, self.entries.get(sync_key), _SUCCEEDED, current_time
                 )
+                self._cleanup_old_entries(current_time)
+                _log_recorded_sync(sync_key, source)
         except Exception as e:
             logger.error("Error recording successful sync", error=str(e))
 
     def is_opposite_service_webhook(
-        self, source: str, doctype: str, data: dict
+        self,
+        source: str,
+        doctype: str,
+        data: dict,
+        record_id: Optional[str] = None,
     ) -> bool:
         """Check if this is a webhook from the opposite service after a recent successful sync"""
         if not self.enabled:
             return False
 
         try:
-            record_id = self._get_record_identifier(source, doctype, data)
+            if record_id is None:
+                record_id = self.get_record_identifier(source, doctype, data)
             if not record_id:
                 return False
 
-            # Determine the opposite service
-            opposite_source = "supabase" if source == "frappe" else "frappe"
-
-            # Check for successful sync from the OPPOSITE service
-            opposite_webhook_key = f"{opposite_source}:{doctype}:{record_id}"
-            current_time = time.time() * 1000
-
-            # Check if we have a recent successful sync from the opposite service
-            if opposite_webhook_key in self.successful_syncs:
-                last_sync = self.successful_syncs[opposite_webhook_key]
-                time_diff = current_time - last_sync
-
-                if time_diff < self.timeout_ms:
-                    logger.info(
-                        "Skipping opposite service webhook after recent successful sync",
-                        webhook_key=f"{source}:{doctype}:{record_id}",
-                        opposite_webhook_key=opposite_webhook_key,
-                        time_diff_ms=time_diff,
-                        timeout_ms=self.timeout_ms,
-                    )
-                    return True
-                else:
-                    # Timeout expired, remove old entry
-                    del self.successful_syncs[opposite_webhook_key]
-
-            return False
+            return self._check_opposite(source, doctype, record_id, time.monotonic_ns())
 
         except Exception as e:
             logger.error("Error checking opposite service webhook", error=str(e))
             return False
 
-    def get_stats(self) -> dict:
-        """Get deduplication statistics"""
-        return {
+    def _check_opposite(
+        self, source: str, doctype: str, record_id: str, current_time: int
+    ) -> bool:
+        """Return True if the opposite service synced this record within the timeout"""
+        opposite_webhook_key = _opposite_key(source, doctype, record_id)
+
+        # Check if we have a recent successful sync from the opposite service
+        entry = self.entries.get(opposite_webhook_key)
+        if entry is not None and entry[_SUCCEEDED]:
+            time_diff = current_time - entry[_SUCCEEDED]
+
+            if time_diff < self.timeout_ns:
+                self._log_opposite_echo(
+                    source, doctype, record_id, opposite_webhook_key, time_diff
+                )
+                return True
+            else:
+                # Timeout expired, forget the sync (and the entry if the
+                # webhook timestamp is unset too)
+                entry[_SUCCEEDED] = 0
+                self._slot_counts[_SUCCEEDED] -= 1
+                if not entry[_PROCESSED]:
+                    del self.entries[opposite_webhook_key]
+
+        return False
+
+    def _log_opposite_echo(
+        self,
+        source: str,
+        doctype: str,
+        record_id: str,
+        opposite_webhook_key: WebhookKey,
+        time_diff: Optional[int] = None,
+    ) -> None:
+        """Log a webhook skipped as the echo of a sync from the opposite service"""
+        if not _stdlib_logger.isEnabledFor(logging.INFO):
+            return
+        logger.info(
+            "Skipping opposite service webhook after recent successful sync",
+            webhook_key=f"{source}:{doctype}:{record_id}",
+            opposite_webhook_key=_format_key(opposite_webhook_key),
+            time_diff_ms=time_diff / 1_000_000 if time_diff is not None else None,
+            timeout_ms=self.timeout_ms,
+        )
+
+    def classify(
+        self,
+        source: str,
+        doctype: str,
+        data: dict,
+        record_id: Optional[str] = None,
+    ) -> DedupResult:
+        """
+        Run the duplicate and opposite-service checks for a webhook in one go
+
+        Same outcome as calling is_duplicate and then, if that is False,
+        is_opposite_service_webhook, but with a single identifier and clock
+        read.
+
+        Args:
+            source: Source system (frappe/supabase)
+            doctype: Document type
+            data: Record data
+            record_id: Precomputed get_record_identifier result, if available
+
+        Returns:
+            Whether to process the webhook, or why to skip it
+        """
+        if not self.enabled:
+            return DedupResult.PROCESS
+
+        if record_id is None:
+            record_id = self.get_record_identifier(source, doctype, data)
+        if not record_id:
+            return DedupResult.PROCESS
+
+        current_time = time.monotonic_ns()
+        self._cleanup_old_entries(current_time)
+
+        if self._check_and_record(source, doctype, record_id, current_time):
+            return DedupResult.DUPLICATE
+        if self._check_opposite(source, doctype, record_id, current_time):
+            return DedupResult.OPPOSITE_ECHO
+        return DedupResult.PROCESS
+
+    def get_stats(self, include_keys: bool = False) -> dict:
+        """
+        Get deduplication statistics
+
+        Args:
+            include_keys: Also return the oldest tracked keys of each kind,
+                up to STATS_MAX_KEYS per kind
+
+        Returns:
+            Dictionary of counts, plus key lists if requested
+        """
+        stats = {
             "enabled": self.enabled,
             "timeout_ms": self.timeout_ms,
-            "active_webhooks": len(self.processed_webhooks),
-            "successful_syncs": len(self.successful_syncs),
-            "processed_webhooks": list(self.processed_webhooks.keys()),
-            "successful_syncs_keys": list(self.successful_syncs.keys()),
+            "active_webhooks": self._slot_counts[_PROCESSED],
+            "successful_syncs": self._slot_counts[_SUCCEEDED],
         }
 
+        if include_keys:
+            stats["processed_webhooks"] = self._stats_keys(_PROCESSED)
+            stats["successful_syncs_keys"] = self._stats_keys(_SUCCEEDED)
+
+        return stats
+
+    def _stats_keys(self, slot: int) -> List[str]:
+        """Oldest keys with the given timestamp set, up to STATS_MAX_KEYS"""
+        keys = (key for key, entry in self.entries.items() if entry[slot])
+        return [_format_key(key) for key in islice(keys, STATS_MAX_KEYS)]
+
+
+class SharedWebhookDeduplicator:
+    """
+    Async front end sharing dedup state between service instances in Redis
+
+    Markers are Redis keys expiring after the timeout, so Redis expiry
+    replaces local cleanup. Whenever Redis errors, a check falls back to
+    the wrapped in-process deduplicator. Only used when
+    WEBHOOK_DEDUP_USE_REDIS is set; the local store is enough otherwise.
+    """
+
+    def __init__(self, local: WebhookDeduplicator, redis_client: aioredis.Redis):
+        self.local = local
+        self.redis_client = redis_client
+
+    @property
+    def enabled(self) -> bool:
+        return self.local.enabled
+
+    @property
+    def timeout_ms(self) -> int:
+        return self.local.timeout_ms
+
+    def get_record_identifier(
+        self, source: str, doctype: str, data: dict
+    ) -> Optional[str]:
+        """See WebhookDeduplicator.get_record_identifier"""
+        return self.local.get_record_identifier(source, doctype, data)
+
+    async def is_duplicate(
+        self,
+        source: str,
+        doctype: str,
+        data: dict,
+        record_id: Optional[str] = None,
+    ) -> bool:
+        """WebhookDeduplicator.is_duplicate as one atomic SET NX with expiry"""
+        if not self.enabled:
+            return False
+
+        if record_id is None:
+            record_id = self.get_record_identifier(source, doctype, data)
+        if not record_id:
+            return False
+
+        webhook_key = (source, doctype, record_id)
+        try:
+            was_set = await self.redis_client.set(
+                _redis_key("processed", webhook_key), 1, nx=True, px=self.timeout_ms
+            )
+        except Exception as e:
+            _log_shared_store_unavailable(e)
+            return self.local.is_duplicate(source, doctype, data, record_id)
+
+        if not was_set:
+            self.local._log_duplicate(webhook_key)
+        return not was_set
+
+    async def is_duplicate_batch(
+        self, events: List[Tuple[str, str, dict]]
+    ) -> List[bool]:
+        """WebhookDeduplicator.is_duplicate_batch in a single Redis round-trip"""
+        if not self.enabled:
+            return [False] * len(events)
+
+        checked = []
+        try:
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for index, (source, doctype, data) in enumerate(events):
+                    record_id = self.get_record_identifier(source, doctype, data)
+                    if record_id:
+                        pipe.set(
+                            _redis_key("processed", (source, doctype, record_id)),
+                            1,
+                            nx=True,
+                            px=self.timeout_ms,
+                        )
+                        checked.append(index)
+                was_set = await pipe.execute() if checked else []
+        except Exception as e:
+            _log_shared_store_unavailable(e)
+            return self.local.is_duplicate_batch(events)
+
+        results = [False] * len(events)
+        for index, set_ok in zip(checked, was_set):
+            results[index] = not set_ok
+        return results
+
+    async def record_successful_sync(
+        self,
+        source: str,
+        doctype: str,
+        data: dict,
+        record_id: Optional[str] = None,
+    ):
+        """WebhookDeduplicator.record_successful_sync as a SET with expiry"""
+        if not self.enabled:
+            return
+
+        if record_id is None:
+            record_id = self.get_record_identifier(source, doctype, data)
+        if not record_id:
+            return
+
+        sync_key = (source, doctype, record_id)
+        try:
+            await self.redis_client.set(
+                _redis_key("synced", sync_key), 1, px=self.timeout_ms
+            )
+        except Exception as e:
+            _log_shared_store_unavailable(e)
+            self.local.record_successful_sync(source, doctype, data, record_id)
+            return
+        _log_recorded_sync(sync_key, source)
+
+    async def is_opposite_service_webhook(
+        self,
+        source: str,
+        doctype: str,
+        data: dict,
+        record_id: Optional[str] = None,
+    ) -> bool:
+        """WebhookDeduplicator.is_opposite_service_webhook as an EXISTS"""
+        if not self.enabled:
+            return False
+
+        if record_id is None:
+            record_id = self.get_record_identifier(source, doctype, data)
+        if not record_id:
+            return False
+
+        opposite_webhook_key = _opposite_key(source, doctype, record_id)
+        try:
+            opposite_synced = await self.redis_client.exists(
+                _redis_key("synced", opposite_webhook_key)
+            )
+        except Exception as e:
+            _log_shared_store_unavailable(e)
+            return self.local.is_opposite_service_webhook(
+                source, doctype, data, record_id
+            )
+
+        if opposite_synced:
+            self.local._log_opposite_echo(
+                source, doctype, record_id, opposite_webhook_key
+            )
+        return bool(opposite_synced)
+
+    async def classify(
+        self,
+        source: str,
+        doctype: str,
+        data: dict,
+        record_id: Optional[str] = None,
+    ) -> DedupResult:
+        """WebhookDeduplicator.classify in a single Redis round-trip"""
+        if not self.enabled:
+            return DedupResult.PROCESS
+
+        if record_id is None:
+            record_id = self.get_record_identifier(source, doctype, data)
+        if not record_id:
+            return DedupResult.PROCESS
+
+        webhook_key = (source, doctype, record_id)
+        opposite_webhook_key = _opposite_key(source, doctype, record_id)
+        try:
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                pipe.set(
+                    _redis_key("processed", webhook_key),
+                    1,
+                    nx=True,
+                    px=self.timeout_ms,
+                )
+                pipe.exists(_redis_key("synced", opposite_webhook_key))
+                was_set, opposite_synced = await pipe.execute()
+        except Exception as e:
+            _log_shared_store_unavailable(e)
+            return self.local.classify(source, doctype, data, record_id)
+
+        if not was_set:
+            self.local._log_duplicate(webhook_key)
+            return DedupResult.DUPLICATE
+        if opposite_synced:
+            self.local._log_opposite_echo(
+                source, doctype, record_id, opposite_webhook_key
+            )
+            return DedupResult.OPPOSITE_ECHO
+        return DedupResult.PROCESS
+
+    async def aclose(self):
+        """Close the Redis connection pool"""
+        await self.redis_client.aclose()
+
+    def get_stats(self, include_keys: bool = False) -> dict:
+        """Stats of the local fallback store, flagged as using the shared store"""
+        stats = self.local.get_stats(include_keys)
+        stats["shared_store"] = True
+        return stats
+
 
 # Global instance
 webhook_deduplicator = WebhookDeduplicator()
+
+# Async front end for the shared Redis store, or None to use
+# webhook_deduplicator directly
+shared_webhook_deduplicator = (
+    SharedWebhookDeduplicator(
+        webhook_deduplicator, aioredis.from_url(settings.redis_url)
+    )
+    if settings.webhook_dedup_use_redis
+    else None
+)
@@ -24,6 +24,31 @@ from src.handlers.supabase_webhook import SupabaseWebhookHandler
 from src.mapping.field_mapper import FieldMapper
 from src.mapping.complex_mapper import ComplexMapper
 from src.discovery.schema_discovery import SchemaDiscovery
+from src.utils.webhook_deduplicator import WebhookDeduplicator
+
+
+def pytest_addoption(parser):
+    """Register command line options for the test suite"""
+    parser.addoption(
+        "--refresh-fixtures",
+        action="store_true",
+        default=False,
+        help="Re-record cached API responses in tests/fixtures",
+    )
+    parser.addoption(
+        "--webhook-throughput",
+        action="store_true",
+        default=False,
+        help="Run the webhook throughput check, which sends real webhooks",
+    )
+
+
+def pytest_configure(config):
+    """Expose the opt-in flags to test modules that also run as scripts"""
+    if config.getoption("--refresh-fixtures"):
+        os.environ["REFRESH_FIXTURES"] = "1"
+    if config.getoption("--webhook-throughput"):
+        os.environ["WEBHOOK_THROUGHPUT"] = "1"
 
 
 @pytest.fixture
@@ -226,6 +251,14 @@ def complex_mapper():
     return ComplexMapper()
 
 
+@pytest.fixture
+def webhook_deduplicator():
+    """Enabled webhook deduplicator using the in-process store"""
+    deduplicator = WebhookDeduplicator()
+    deduplicator.enabled = True
+    return deduplicator
+
+
 @pytest.fixture
 def schema_discovery(test_settings, mock_frappe_client, mock_supabase_client):
     """Schema discovery with mocked clients"""
@@ -1,89 +1,310 @@
 #!/usr/bin/env python3
 """
 Test script for Frappe-Supabase Sync API endpoints
+
+Run directly, or under pytest; the groups are independent, so with
+pytest-xdist (``pytest -n auto``) they run on separate workers.
 """
-import requests
-import json
+import asyncio
+import functools
+import hashlib
+import httpx
+import os
+import orjson
+import socket
+import pytest
 import time
 import sys
+from itertools import islice
+from pathlib import Path
 
 # Configuration
-BASE_URL = "http://localhost:8000"
-API_BASE = f"{BASE_URL}/api/schema"
+# uvicorn only speaks HTTP/1.1, so requests share pooled keep-alive
+# connections. Point API_BASE_URL at an HTTPS, HTTP/2-capable proxy (or a
+# hypercorn server) to multiplex them over one connection instead.
+BASE_URL = os.environ.get("API_BASE_URL", "http://localhost:8000")
+API_PREFIX = "/api/schema"
+# (connect, read) timeout in seconds for every request
+REQUEST_TIMEOUT = httpx.Timeout(10.0, connect=1.0)
+# Extra attempts for failed connects; requests that reached the service
+# are never retried
+CONNECT_RETRIES = 2
+# Seconds main() waits for the service to accept a connection at all
+PREFLIGHT_TIMEOUT = 0.5
+# Number of synthetic events sent by each run of the webhook throughput
+# check. It is opt-in (WEBHOOK_THROUGHPUT=1 or --webhook-throughput) and
+# posts for a doctype with no sync mapping, so no real records are touched.
+WEBHOOK_BATCH_SIZE = 100
+THROUGHPUT_DOCTYPE = "Sync Throughput Test"
+# Recorded GET responses, replayed for up to RESPONSE_CACHE_TTL seconds.
+# Older ones are revalidated with their ETag, and a 304 keeps them.
+# Set REFRESH_FIXTURES=1 (or pass --refresh-fixtures) to re-record them.
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+RESPONSE_CACHE_TTL = 3600
+# ETag of the last successful GET per endpoint, recorded by test_endpoint
+ETAGS = {}
+# Result test_endpoint returns when a conditional GET answers 304
+NOT_MODIFIED = object()
+# (endpoint, seconds) for every request test_endpoint sent; main() prints
+# the slowest SLOWEST_ENDPOINTS of them
+TIMINGS = []
+SLOWEST_ENDPOINTS = 5
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+# Methods test_endpoint supports, and whether each sends a JSON body
+METHOD_SENDS_BODY = {"GET": False, "POST": True, "PUT": True, "DELETE": False}
+
+# Every group talks to a running service
+pytestmark = pytest.mark.integration
+
+@pytest.fixture(autouse=True, scope="module")
+def require_service():
+    """Skip the API groups when nothing is listening at BASE_URL"""
+    if not service_reachable():
+        pytest.skip(f"API service not reachable at {BASE_URL}")
+
+
+class ServiceUnreachable(Exception):
+    """The service could not be reached or did not answer in time"""
+
+def make_client():
+    """Create the shared HTTP client; all calls in a run reuse its connections"""
+    # No socket options needed: asyncio (and uvloop) transports already set
+    # TCP_NODELAY, so small webhook POSTs are not held back by Nagle.
+    return httpx.AsyncClient(
+        base_url=BASE_URL,
+        timeout=REQUEST_TIMEOUT,
+        transport=httpx.AsyncHTTPTransport(
+            # Negotiated via ALPN, so only takes effect over https
+            http2=True,
+            retries=CONNECT_RETRIES,
+            limits=httpx.Limits(max_keepalive_connections=16),
+        ),
+    )
+
+def _json(response):
+    """Decode a response body with orjson; empty bodies decode to {}"""
+    return orjson.loads(response.content) if response.content else {}
+
+def cached_response(ttl=RESPONSE_CACHE_TTL):
+    """
+    Replay successful GET results of test_endpoint from FIXTURES_DIR
+
+    Fixtures are keyed by a hash of (method, endpoint, data). POSTs such
+    as /discover change server state, so they always hit the service.
+    Expired fixtures are sent back as If-None-Match, so unchanged schemas
+    come back as an empty 304 rather than the full body.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(client, method, endpoint, data=None, expected_status=200):
+            if method.upper() != "GET":
+                return await func(client, method, endpoint, data, expected_status)
+            
+            key = hashlib.blake2b(
+                orjson.dumps([method.upper(), endpoint, data], option=orjson.OPT_SORT_KEYS),
+                digest_size=16,
+            ).hexdigest()
+            fixture = FIXTURES_DIR / f"{key}.json"
+            
+            cached = None
+            if os.environ.get("REFRESH_FIXTURES") != "1" and fixture.exists():
+                cached = orjson.loads(fixture.read_bytes())
+                if time.time() - fixture.stat().st_mtime < ttl:
+                    return cached["result"], [
+                        f"✅ {method.upper()} {endpoint} - Status: {cached['status']} (cached)"
+                    ]
+            
+            result, report = await func(
+                client, method, endpoint, data, expected_status,
+                etag=cached.get("etag") if cached else None,
+            )
+            if result is NOT_MODIFIED:
+                fixture.touch()
+                return cached["result"], report
+            if result is not None:
+                FIXTURES_DIR.mkdir(exist_ok=True)
+                fixture.write_bytes(orjson.dumps({
+                    "status": expected_status,
+                    "result": result,
+                    "etag": ETAGS.get(endpoint),
+                }))
+            return result, report
+        return wrapper
+    return decorator
 
-def test_endpoint(method, endpoint, data=None, expected_status=200):
-    """Test an API endpoint"""
-    url = f"{API_BASE}{endpoint}"
+@cached_response()
+async def test_endpoint(client, method, endpoint, data=None, expected_status=200, etag=None):
+    """
+    Test an API endpoint
+
+    Returns (result, report): the decoded body (None on failure) and the
+    lines to print, so concurrent callers can print them in order. A GET
+    sent with the etag of a previous response returns NOT_MODIFIED as the
+    result if the server answers 304.
+    """
+    method = method.upper()
+    sends_body = METHOD_SENDS_BODY.get(method)
+    if sends_body is None:
+        return None, [f"❌ Unsupported method: {method}"]
     
     try:
-        if method.upper() == "GET":
-            response = requests.get(url)
-        elif method.upper() == "POST":
-            response = requests.post(url, json=data)
-        elif method.upper() == "PUT":
-            response = requests.put(url, json=data)
-        elif method.upper() == "DELETE":
-            response = requests.delete(url)
+        start = time.perf_counter()
+        if sends_body:
+            response = await client.request(
+                method,
+                f"{API_PREFIX}{endpoint}",
+                content=orjson.dumps(data),
+                headers=JSON_HEADERS,
+            )
         else:
-            print(f"❌ Unsupported method: {method}")
-            return False
+            response = await client.request(
+                method,
+                f"{API_PREFIX}{endpoint}",
+                headers={"If-None-Match": etag} if etag else None,
+            )
+        TIMINGS.append((f"{method} {endpoint}", time.perf_counter() - start))
         
+        if etag and response.status_code == 304:
+            return NOT_MODIFIED, [f"✅ {method} {endpoint} - Status: 304 (unchanged)"]
         if response.status_code == expected_status:
-            print(f"✅ {method} {endpoint} - Status: {response.status_code}")
-            return response.json() if response.content else {}
+            if "etag" in response.headers:
+                ETAGS[endpoint] = response.headers["etag"]
+            return (
+                _json(response),
+                [f"✅ {method} {endpoint} - Status: {response.status_code}"],
+            )
         else:
-            print(f"❌ {method} {endpoint} - Status: {response.status_code}")
-            print(f"   Error: {response.text}")
-            return None
+            return None, [
+                f"❌ {method} {endpoint} - Status: {response.status_code}",
+                f"   Error: {response.text}",
+            ]
             
-    except requests.exceptions.ConnectionError:
-        print(f"❌ {method} {endpoint} - Connection failed (is the service running?)")
-        return None
+    except httpx.ConnectError as e:
+        raise ServiceUnreachable(
+            f"{method} {endpoint} - Connection failed (is the service running?)"
+        ) from e
+    except httpx.TimeoutException as e:
+        raise ServiceUnreachable(f"{method} {endpoint} - Timed out") from e
     except Exception as e:
-        print(f"❌ {method} {endpoint} - Error: {e}")
+        return None, [f"❌ {method} {endpoint} - Error: {e}"]
+
+# A helper for the groups below, not a test of its own
+test_endpoint.__test__ = False
+
+async def run_endpoints(client, calls):
+    """Run independent endpoint calls concurrently, returning results in call order"""
+    return await asyncio.gather(
+        *(test_endpoint(client, *call) for call in calls), return_exceptions=True
+    )
+
+async def post_batch(client, endpoint, payloads, concurrent=True):
+    """
+    Post many webhook payloads to one endpoint, one request per payload
+
+    With concurrent=True every request is in flight at once over the
+    client's pooled connections instead of waiting for each response.
+
+    Returns (accepted, elapsed): the number of 2xx responses and the wall
+    time in seconds.
+    """
+    url = f"{API_PREFIX}{endpoint}"
+    # Encode up front so the timing covers only the requests
+    bodies = [orjson.dumps(payload) for payload in payloads]
+    start = time.perf_counter()
+    if concurrent:
+        responses = await asyncio.gather(
+            *(client.post(url, content=body, headers=JSON_HEADERS) for body in bodies),
+            return_exceptions=True,
+        )
+    else:
+        responses = []
+        for body in bodies:
+            try:
+                responses.append(await client.post(url, content=body, headers=JSON_HEADERS))
+            except Exception as e:
+                responses.append(e)
+    elapsed = time.perf_counter() - start
+    accepted = sum(
+        1
+        for response in responses
+        if not isinstance(response, BaseException) and response.is_success
+    )
+    return accepted, elapsed
+
+def write_report(lines):
+    """Write report lines to stdout with a single write and flush"""
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
+def assert_all_succeeded(results, group):
+    """Fail the group if any of its endpoint checks did not succeed"""
+    failed = sum(result is None for result in results)
+    assert not failed, f"{failed} of {len(results)} {group} checks failed"
+
+def print_report(outcome):
+    """Print the report lines of a test_endpoint outcome and return its result"""
+    if isinstance(outcome, BaseException):
+        print(f"❌ Error: {outcome}")
         return None
+    result, report = outcome
+    write_report(report)
+    return result
 
-def test_basic_endpoints():
+@pytest.mark.asyncio
+async def test_basic_endpoints(client=None):
     """Test basic service endpoints"""
+    if client is None:
+        async with make_client() as client:
+            await test_basic_endpoints(client)
+        return
+    
+    root, health, status = await asyncio.gather(
+        client.get("/"), client.get("/health"), client.get("/sync/status")
+    )
+    
     print("🔍 Testing Basic Service Endpoints")
     print("=" * 50)
     
     # Test root endpoint
-    response = requests.get(f"{BASE_URL}/")
-    if response.status_code == 200:
-        print("✅ Root endpoint - Service is running")
-    else:
-        print("❌ Root endpoint - Service not responding")
-        return False
+    assert root.status_code == 200, "Root endpoint - Service not responding"
+    print("✅ Root endpoint - Service is running")
     
     # Test health endpoint
-    response = requests.get(f"{BASE_URL}/health")
-    if response.status_code == 200:
-        health_data = response.json()
-        print(f"✅ Health check - Status: {health_data.get('overall_status', 'unknown')}")
-    else:
-        print("❌ Health check - Service unhealthy")
-        return False
+    assert health.status_code == 200, "Health check - Service unhealthy"
+    health_data = _json(health)
+    print(f"✅ Health check - Status: {health_data.get('overall_status', 'unknown')}")
     
     # Test sync status
-    response = requests.get(f"{BASE_URL}/sync/status")
-    if response.status_code == 200:
-        status_data = response.json()
-        print(f"✅ Sync status - Mappings: {status_data.get('sync_mappings', 0)}")
-    else:
-        print("❌ Sync status - Failed to get status")
-        return False
-    
-    return True
+    assert status.status_code == 200, "Sync status - Failed to get status"
+    status_data = _json(status)
+    print(f"✅ Sync status - Mappings: {status_data.get('sync_mappings', 0)}")
 
-def test_schema_discovery():
+@pytest.mark.asyncio
+async def test_schema_discovery(client=None):
     """Test schema discovery endpoints"""
+    if client is None:
+        async with make_client() as client:
+            await test_schema_discovery(client)
+        return
+    
+    # Discovery runs first; the other endpoints report what it found
+    try:
+        discover = await test_endpoint(client, "POST", "/discover")
+    except ServiceUnreachable as e:
+        # The rest of the group would only wait out the same failure
+        pytest.fail(f"{e} - skipping remaining checks")
+    frappe, supabase, mappings, summary_result = await run_endpoints(
+        client,
+        [("GET", "/frappe"), ("GET", "/supabase"), ("GET", "/mappings"), ("GET", "/summary")],
+    )
+    
     print("\n🔍 Testing Schema Discovery Endpoints")
     print("=" * 50)
     
     # Test full schema discovery
     print("1. Testing full schema discovery...")
-    result = test_endpoint("POST", "/discover")
+    results = [result := print_report(discover)]
     if result:
         print(f"   📊 Discovered {result.get('result', {}).get('total_doctypes', 0)} Frappe doctypes")
         print(f"   📊 Discovered {result.get('result', {}).get('total_tables', 0)} Supabase tables")
@@ -91,47 +312,62 @@ def test_schema_discovery():
     
     # Test Frappe schemas
     print("\n2. Testing Frappe schema discovery...")
-    result = test_endpoint("GET", "/frappe")
+    results.append(result := print_report(frappe))
     if result:
         print(f"   📋 Found {result.get('count', 0)} Frappe schemas")
-        for doctype in list(result.get('schemas', {}).keys())[:5]:
+        for doctype in islice(result.get('schemas', {}), 5):
             print(f"   📋 {doctype}")
     
     # Test Supabase schemas
     print("\n3. Testing Supabase schema discovery...")
-    result = test_endpoint("GET", "/supabase")
+    results.append(result := print_report(supabase))
     if result:
         print(f"   📊 Found {result.get('count', 0)} Supabase schemas")
-        for table in list(result.get('schemas', {}).keys())[:5]:
+        for table in islice(result.get('schemas', {}), 5):
             print(f"   📊 {table}")
     
     # Test intelligent mappings
     print("\n4. Testing intelligent mappings...")
-    result = test_endpoint("GET", "/mappings")
+    results.append(result := print_report(mappings))
     if result:
         print(f"   🔗 Found {result.get('count', 0)} intelligent mappings")
-        for mapping_name in list(result.get('mappings', {}).keys())[:5]:
+        for mapping_name in islice(result.get('mappings', {}), 5):
             print(f"   🔗 {mapping_name}")
     
     # Test schema summary
     print("\n5. Testing schema summary...")
-    result = test_endpoint("GET", "/summary")
+    results.append(result := print_report(summary_result))
     if result:
         summary = result.get('summary', {})
         print(f"   📊 Total doctypes: {summary.get('total_doctypes', 0)}")
         print(f"   📊 Total tables: {summary.get('total_tables', 0)}")
         print(f"   📊 Total mappings: {summary.get('total_mappings', 0)}")
     
-    return True
+    assert_all_succeeded(results, "schema discovery")
 
-def test_individual_schemas():
+@pytest.mark.asyncio
+async def test_individual_schemas(client=None):
     """Test individual schema endpoints"""
+    if client is None:
+        async with make_client() as client:
+            await test_individual_schemas(client)
+        return
+    
+    employee, employees, compare = await run_endpoints(
+        client,
+        [
+            ("GET", "/frappe/Employee"),
+            ("GET", "/supabase/employees"),
+            ("GET", "/compare/Employee/employees"),
+        ],
+    )
+    
     print("\n🔍 Testing Individual Schema Endpoints")
     print("=" * 50)
     
     # Test specific Frappe doctype
     print("1. Testing Frappe Employee doctype...")
-    result = test_endpoint("GET", "/frappe/Employee")
+    results = [result := print_report(employee)]
     if result:
         schema = result.get('schema', {})
         print(f"   📋 Employee doctype: {schema.get('total_fields', 0)} fields")
@@ -139,14 +375,14 @@ def test_individual_schemas():
     
     # Test specific Supabase table
     print("\n2. Testing Supabase employees table...")
-    result = test_endpoint("GET", "/supabase/employees")
+    results.append(result := print_report(employees))
     if result:
         schema = result.get('schema', {})
         print(f"   📊 employees table: {schema.get('total_fields', 0)} fields")
     
     # Test schema comparison
     print("\n3. Testing schema comparison...")
-    result = test_endpoint("GET", "/compare/Employee/employees")
+    results.append(result := print_report(compare))
     if result:
         comparison = result.get('comparison', {})
         print(f"   🔍 Frappe fields: {comparison.get('frappe_fields', 0)}")
@@ -155,15 +391,16 @@ def test_individual_schemas():
         print(f"   🔍 Unmapped Frappe fields: {len(comparison.get('unmapped_frappe_fields', []))}")
         print(f"   🔍 Unmapped Supabase fields: {len(comparison.get('unmapped_supabase_fields', []))}")
     
-    return True
+    assert_all_succeeded(results, "individual schema")
 
-def test_mapping_management():
+@pytest.mark.asyncio
+async def test_mapping_management(client=None):
     """Test mapping management endpoints"""
-    print("\n🔍 Testing Mapping Management Endpoints")
-    print("=" * 50)
+    if client is None:
+        async with make_client() as client:
+            await test_mapping_management(client)
+        return
     
-    # Test mapping validation
-    print("1. Testing mapping validation...")
     test_mapping = {
         "frappe_doctype": "Employee",
         "supabase_table": "employees",
@@ -174,31 +411,43 @@ def test_mapping_management():
         },
         "sync_fields": ["name", "employee_name", "email"]
     }
+    test_mappings = {
+        "Employee_employees": test_mapping
+    }
+    
+    # Validate before applying, as a client would
+    try:
+        validate = await test_endpoint(client, "POST", "/mappings/validate", test_mapping)
+        apply = await test_endpoint(client, "POST", "/mappings/apply", test_mappings)
+    except ServiceUnreachable as e:
+        pytest.fail(f"{e} - skipping remaining checks")
+    
+    print("\n🔍 Testing Mapping Management Endpoints")
+    print("=" * 50)
     
-    result = test_endpoint("POST", "/mappings/validate", test_mapping)
+    # Test mapping validation
+    print("1. Testing mapping validation...")
+    results = [result := print_report(validate)]
     if result:
         print("   ✅ Mapping validation passed")
     
     # Test mapping application
     print("\n2. Testing mapping application...")
-    test_mappings = {
-        "Employee_employees": test_mapping
-    }
-    
-    result = test_endpoint("POST", "/mappings/apply", test_mappings)
+    results.append(result := print_report(apply))
     if result:
         print("   ✅ Mappings applied successfully")
         print(f"   📋 Applied mappings: {result.get('applied_mappings', [])}")
     
-    return True
+    assert_all_succeeded(results, "mapping management")
 
-def test_webhook_endpoints():
+@pytest.mark.asyncio
+async def test_webhook_endpoints(client=None):
     """Test webhook endpoints"""
-    print("\n🔍 Testing Webhook Endpoints")
-    print("=" * 50)
+    if client is None:
+        async with make_client() as client:
+            await test_webhook_endpoints(client)
+        return
     
-    # Test Frappe webhook
-    print("1. Testing Frappe webhook...")
     frappe_payload = {
         "doctype": "Employee",
         "name": "EMP-001",
@@ -209,13 +458,6 @@ def test_webhook_endpoints():
             "email": "john.doe@example.com"
         }
     }
-    
-    result = test_endpoint("POST", "/webhook/frappe", frappe_payload)
-    if result:
-        print("   ✅ Frappe webhook processed")
-    
-    # Test Supabase webhook
-    print("\n2. Testing Supabase webhook...")
     supabase_payload = {
         "table": "employees",
         "operation": "INSERT",
@@ -226,53 +468,134 @@ def test_webhook_endpoints():
         }
     }
     
-    result = test_endpoint("POST", "/webhook/supabase", supabase_payload)
+    frappe, supabase = await run_endpoints(
+        client,
+        [
+            ("POST", "/webhook/frappe", frappe_payload),
+            ("POST", "/webhook/supabase", supabase_payload),
+        ],
+    )
+    
+    print("\n🔍 Testing Webhook Endpoints")
+    print("=" * 50)
+    
+    # Test Frappe webhook
+    print("1. Testing Frappe webhook...")
+    results = [result := print_report(frappe)]
+    if result:
+        print("   ✅ Frappe webhook processed")
+    
+    # Test Supabase webhook
+    print("\n2. Testing Supabase webhook...")
+    results.append(result := print_report(supabase))
     if result:
         print("   ✅ Supabase webhook processed")
     
-    return True
+    assert_all_succeeded(results, "webhook")
 
-def main():
+def webhook_throughput_enabled():
+    """Whether the webhook throughput check was opted into"""
+    return os.environ.get("WEBHOOK_THROUGHPUT") == "1"
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_webhook_throughput(client=None):
+    """Measure Frappe webhook throughput, one at a time and all in flight at once"""
+    if not webhook_throughput_enabled():
+        pytest.skip("sends real webhooks; set WEBHOOK_THROUGHPUT=1 or pass --webhook-throughput")
+    if client is None:
+        async with make_client() as client:
+            await test_webhook_throughput(client)
+        return
+    
+    payload = {
+        "doctype": THROUGHPUT_DOCTYPE,
+        "name": "THROUGHPUT-001",
+        "operation": "after_insert",
+        "doc": {"name": "THROUGHPUT-001"}
+    }
+    batch = [payload] * WEBHOOK_BATCH_SIZE
+    sequential = await post_batch(client, "/webhook/frappe", batch, concurrent=False)
+    concurrent = await post_batch(client, "/webhook/frappe", batch)
+    
+    print(f"\n🔍 Testing Frappe Webhook Throughput ({WEBHOOK_BATCH_SIZE} events)")
+    print("=" * 50)
+    for label, (accepted, elapsed) in (("Sequential", sequential), ("Concurrent", concurrent)):
+        rate = WEBHOOK_BATCH_SIZE / elapsed if elapsed else 0.0
+        print(f"   ⏱️  {label}: {accepted}/{WEBHOOK_BATCH_SIZE} accepted in {elapsed:.2f}s ({rate:.0f} events/s)")
+    
+    for label, (accepted, _) in (("sequential", sequential), ("concurrent", concurrent)):
+        assert accepted == WEBHOOK_BATCH_SIZE, (
+            f"Only {accepted}/{WEBHOOK_BATCH_SIZE} {label} webhooks accepted"
+        )
+
+def service_reachable(timeout=PREFLIGHT_TIMEOUT):
+    """Check that something accepts TCP connections at BASE_URL"""
+    url = httpx.URL(BASE_URL)
+    port = url.port or (443 if url.scheme == "https" else 80)
+    try:
+        with socket.create_connection((url.host, port), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+async def run_group(test_func, client):
+    """Run one group for the script report, returning (passed, failure message)"""
+    try:
+        await test_func(client)
+    except (AssertionError, pytest.fail.Exception) as e:
+        return False, str(e)
+    return True, None
+
+async def main():
     """Main test function"""
     print("🚀 Frappe-Supabase Sync API Test Suite")
     print("=" * 60)
     
-    # Check if service is running
-    try:
-        response = requests.get(f"{BASE_URL}/", timeout=5)
-        if response.status_code != 200:
-            print("❌ Service is not running. Please start the service first:")
-            print("   python main.py")
-            return
-    except requests.exceptions.ConnectionError:
+    # Check if service is running before any group starts
+    if not service_reachable():
         print("❌ Cannot connect to service. Please start the service first:")
         print("   python main.py")
-        return
+        sys.exit(1)
     
     print("✅ Service is running. Starting tests...\n")
     
-    # Run tests
-    tests = [
-        ("Basic Endpoints", test_basic_endpoints),
-        ("Schema Discovery", test_schema_discovery),
-        ("Individual Schemas", test_individual_schemas),
-        ("Mapping Management", test_mapping_management),
-        ("Webhook Endpoints", test_webhook_endpoints)
-    ]
+    async with make_client() as client:
+        # Run tests
+        tests = [
+            ("Basic Endpoints", test_basic_endpoints),
+            ("Schema Discovery", test_schema_discovery),
+            ("Individual Schemas", test_individual_schemas),
+            ("Mapping Management", test_mapping_management),
+            ("Webhook Endpoints", test_webhook_endpoints)
+        ]
+        if webhook_throughput_enabled():
+            tests.append(("Webhook Throughput", test_webhook_throughput))
+        
+        # The groups are independent, so run them all at once. Each group
+        # prints its whole report in one go once its requests are done.
+        outcomes = await asyncio.gather(
+            *(run_group(test_func, client) for _, test_func in tests),
+            return_exceptions=True,
+        )
     
     passed = 0
     total = len(tests)
     
-    for test_name, test_func in tests:
+    for (test_name, _), outcome in zip(tests, outcomes):
         print(f"\n{'='*20} {test_name} {'='*20}")
-        try:
-            if test_func():
-                passed += 1
-                print(f"✅ {test_name} - PASSED")
-            else:
-                print(f"❌ {test_name} - FAILED")
-        except Exception as e:
-            print(f"❌ {test_name} - ERROR: {e}")
+        if isinstance(outcome, BaseException):
+            print(f"❌ {test_name} - ERROR: {outcome}")
+        elif outcome[0]:
+            passed += 1
+            print(f"✅ {test_name} - PASSED")
+        else:
+            print(f"❌ {test_name} - FAILED: {outcome[1]}")
+    
+    if TIMINGS:
+        print(f"\n⏱️  Slowest endpoints:")
+        for endpoint, elapsed in sorted(TIMINGS, key=lambda t: t[1], reverse=True)[:SLOWEST_ENDPOINTS]:
+            print(f"   {elapsed * 1000:7.1f}ms  {endpoint}")
     
     print(f"\n{'='*60}")
     print(f"📊 Test Results: {passed}/{total} tests passed")
@@ -288,4 +611,8 @@ def main():
         print("❌ Some tests failed. Please check the service logs and configuration.")
 
 if __name__ == "__main__":
-    main()
+    if "--refresh-fixtures" in sys.argv:
+        os.environ["REFRESH_FIXTURES"] = "1"
+    if "--webhook-throughput" in sys.argv:
+        os.environ["WEBHOOK_THROUGHPUT"] = "1"
+    asyncio.run(main())
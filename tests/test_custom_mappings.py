@@ -1,219 +1,330 @@
 #!/usr/bin/env python3
 """
 Test script for custom mappings (tasks and users)
+
+Run directly, or under pytest; with pytest-xdist (``pytest -n auto``) each
+mapping is its own test and can run on a separate worker.
 """
 import asyncio
+import pytest
+import pytest_asyncio
+import socket
 import sys
 import os
-import json
+import httpx
+import orjson
+from pathlib import Path
 
 # Add current directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from src.discovery.schema_discovery import SchemaDiscovery
 from src.mapping.field_mapper import FieldMapper
-from src.mapping.complex_mapper import ComplexMapper
+from src.utils.supabase_client import close_postgrest
 from src.config import settings
 
-async def test_custom_mappings():
-    """Test the custom mappings for tasks and users"""
-    print("🔍 Testing Custom Mappings (Tasks & Users)")
-    print("=" * 50)
-    
+# custom_mappings.json from the repository root, parsed once and shared by
+# every test; empty if the file is missing
+CUSTOM_MAPPINGS_PATH = Path(__file__).resolve().parent.parent / "custom_mappings.json"
+try:
+    CUSTOM_MAPPINGS = orjson.loads(CUSTOM_MAPPINGS_PATH.read_bytes())
+except FileNotFoundError:
+    CUSTOM_MAPPINGS = {}
+
+# Sample records shared by every mapping test. map_fields deep-copies its
+# input and the email priority handler only reads it, so plain dicts are
+# safe to share (a read-only mappingproxy would fail both).
+TASK_SAMPLE = {
+    "name": "TASK-2025-0001",
+    "subject": "Test Task",
+    "status": "Open",
+    "project": "PROJ-001",
+    "exp_start_date": "2025-01-27",
+    "exp_end_date": "2025-01-30",
+    "type": "Development",
+    "description": "This is a test task"
+}
+USER_SAMPLE = {
+    "name": "user1",
+    "first_name": "John",
+    "last_name": "Doe",
+    "personal_email": "john.doe@example.com",
+    "mobile_no": "+1234567890",
+    "company": "Test Company"
+}
+FRAPPE_USER_DATA = {
+    "personal_email": "john.doe@personal.com",
+    "company_email": "john.doe@company.com",
+    "preferred_email": "john.doe@preferred.com"
+}
+EMAIL_PRIORITY_CFG = {
+    "email_priority": ["personal_email", "company_email", "preferred_email"]
+}
+
+# The mapper and discovery fixtures are shared by every test in the module,
+# so their Frappe/Supabase clients (and pooled connections) are set up once.
+# Pooled connections belong to the loop that opened them, so the fixtures
+# and tests all run on the module's event loop.
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def shared_field_mapper():
+    """Field mapper (and its complex mapper) shared by the module's tests"""
+    field_mapper = FieldMapper()
+    yield field_mapper
+    await field_mapper.aclose()
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def shared_discovery():
+    """Schema discovery shared by the module's tests"""
+    discovery = SchemaDiscovery()
+    yield discovery
+    await discovery.aclose()
+
+@pytest_asyncio.fixture(autouse=True, scope="module", loop_scope="module")
+async def shared_postgrest():
+    """Close the process-wide PostgREST pool on the loop that opened it"""
+    yield
+    await close_postgrest()
+
+def service_reachable(url, timeout=0.5):
+    """Check that something accepts TCP connections at url"""
+    url = httpx.URL(url)
+    port = url.port or (443 if url.scheme == "https" else 80)
     try:
-        # Load custom mappings
-        with open("custom_mappings.json", "r") as f:
-            custom_mappings = json.load(f)
-        
-        print(f"✅ Loaded {len(custom_mappings)} custom mappings")
-        
-        # Test each mapping
-        for mapping_name, mapping_config in custom_mappings.items():
-            print(f"\n📋 Testing {mapping_name}...")
-            
-            # Test field mapping
-            field_mapper = FieldMapper()
-            
-            # Create sample data
-            if "Task" in mapping_name:
-                sample_data = {
-                    "name": "TASK-2025-0001",
-                    "subject": "Test Task",
-                    "status": "Open",
-                    "project": "PROJ-001",
-                    "exp_start_date": "2025-01-27",
-                    "exp_end_date": "2025-01-30",
-                    "type": "Development",
-                    "description": "This is a test task"
-                }
-            else:  # User
-                sample_data = {
-                    "name": "user1",
-                    "first_name": "John",
-                    "last_name": "Doe",
-                    "personal_email": "john.doe@example.com",
-                    "mobile_no": "+1234567890",
-                    "company": "Test Company"
-                }
-            
-            print(f"   📊 Sample data: {sample_data}")
-            
-            # Test Frappe to Supabase mapping
-            print("   🔄 Testing Frappe → Supabase mapping...")
-            try:
-                mapped_data = await field_mapper.map_fields(
-                    sample_data, 
-                    "frappe", 
-                    "supabase", 
-                    mapping_config
-                )
-                print(f"   ✅ Mapped data: {mapped_data}")
-            except Exception as e:
-                print(f"   ❌ Mapping failed: {e}")
-            
-            # Test Supabase to Frappe mapping
-            print("   🔄 Testing Supabase → Frappe mapping...")
-            try:
-                # Create reverse sample data
-                reverse_data = {}
-                reverse_mappings = mapping_config.get("reverse_mappings", {})
-                for supabase_field, frappe_field in reverse_mappings.items():
-                    if supabase_field in sample_data:
-                        reverse_data[supabase_field] = sample_data[frappe_field]
-                
-                reverse_mapped_data = await field_mapper.map_fields(
-                    reverse_data,
-                    "supabase",
-                    "frappe",
-                    mapping_config
-                )
-                print(f"   ✅ Reverse mapped data: {reverse_mapped_data}")
-            except Exception as e:
-                print(f"   ❌ Reverse mapping failed: {e}")
-        
-        return True
-        
-    except Exception as e:
-        print(f"❌ Custom mapping test failed: {e}")
+        with socket.create_connection((url.host, port), timeout=timeout):
+            return True
+    except OSError:
         return False
 
-async def test_complex_mappings():
-    """Test complex mapping logic"""
-    print("\n🔍 Testing Complex Mapping Logic")
-    print("=" * 50)
+@pytest.fixture(scope="module")
+def require_backends():
+    """Skip schema discovery checks unless Frappe and Supabase are reachable"""
+    for name, url in (("Frappe", settings.frappe_url), ("Supabase", settings.supabase_url)):
+        if not service_reachable(url):
+            pytest.skip(f"{name} not reachable at {url}")
+
+def write_report(lines):
+    """Write report lines to stdout with a single write and flush"""
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
+async def _test_one_mapping(field_mapper, mapping_name, mapping_config):
+    """
+    Map sample data for one custom mapping in both directions
+
+    Returns (passed, report): whether both directions mapped, and the lines
+    to print, so concurrently tested mappings print in order.
+    """
+    report = [f"\n📋 Testing {mapping_name}..."]
+    passed = True
+    
+    # Pick sample data (User otherwise)
+    sample_data = TASK_SAMPLE if "Task" in mapping_name else USER_SAMPLE
+    
+    report.append(f"   📊 Sample data: {sample_data}")
     
+    # Test Frappe to Supabase mapping
+    report.append("   🔄 Testing Frappe → Supabase mapping...")
     try:
-        complex_mapper = ComplexMapper()
-        
-        # Test Task ID transformation
-        print("1. Testing Task ID transformation...")
-        
-        # Frappe to Supabase
-        frappe_task_id = "TASK-2025-0001"
-        supabase_task_id = await complex_mapper.map_task_id(frappe_task_id, "frappe_to_supabase")
-        print(f"   Frappe ID: {frappe_task_id} → Supabase ID: {supabase_task_id}")
-        
-        # Supabase to Frappe
-        supabase_task_id = 1
-        frappe_task_id = await complex_mapper.map_task_id(supabase_task_id, "supabase_to_frappe")
-        print(f"   Supabase ID: {supabase_task_id} → Frappe ID: {frappe_task_id}")
-        
-        # Test Project ID transformation
-        print("\n2. Testing Project ID transformation...")
-        
-        # Frappe to Supabase
-        frappe_project_id = "PROJ-001"
-        supabase_project_id = await complex_mapper.map_task_project(frappe_project_id, "frappe_to_supabase")
-        print(f"   Frappe Project: {frappe_project_id} → Supabase Project: {supabase_project_id}")
-        
-        # Supabase to Frappe
-        supabase_project_id = 1
-        frappe_project_id = await complex_mapper.map_task_project(supabase_project_id, "supabase_to_frappe")
-        print(f"   Supabase Project: {supabase_project_id} → Frappe Project: {frappe_project_id}")
-        
-        # Test email priority mapping
-        print("\n3. Testing email priority mapping...")
-        
-        # Frappe to Supabase
-        frappe_user_data = {
-            "personal_email": "john.doe@personal.com",
-            "company_email": "john.doe@company.com",
-            "preferred_email": "john.doe@preferred.com"
-        }
-        
-        email_priority_config = {
-            "email_priority": ["personal_email", "company_email", "preferred_email"]
-        }
-        
-        supabase_email = await complex_mapper._handle_email_priority(
-            frappe_user_data, email_priority_config, "frappe_to_supabase"
+        mapped_data = await field_mapper.map_fields(
+            sample_data, 
+            "frappe", 
+            "supabase", 
+            mapping_config
         )
-        print(f"   Frappe emails: {frappe_user_data} → Supabase email: {supabase_email}")
+        report.append(f"   ✅ Mapped data: {mapped_data}")
+    except Exception as e:
+        report.append(f"   ❌ Mapping failed: {e}")
+        passed = False
+    
+    # Test Supabase to Frappe mapping
+    report.append("   🔄 Testing Supabase → Frappe mapping...")
+    try:
+        # Create reverse sample data
+        reverse_mappings = mapping_config.get("reverse_mappings", {})
+        reverse_data = {
+            supabase_field: sample_data[frappe_field]
+            for supabase_field, frappe_field in reverse_mappings.items()
+            if frappe_field in sample_data
+        }
         
-        # Supabase to Frappe
-        supabase_email = "john.doe@example.com"
-        frappe_emails = await complex_mapper._handle_email_priority(
-            supabase_email, email_priority_config, "supabase_to_frappe"
+        reverse_mapped_data = await field_mapper.map_fields(
+            reverse_data,
+            "supabase",
+            "frappe",
+            mapping_config
         )
-        print(f"   Supabase email: {supabase_email} → Frappe emails: {frappe_emails}")
-        
-        return True
-        
+        report.append(f"   ✅ Reverse mapped data: {reverse_mapped_data}")
     except Exception as e:
-        print(f"❌ Complex mapping test failed: {e}")
-        return False
+        report.append(f"   ❌ Reverse mapping failed: {e}")
+        passed = False
+    
+    return passed, report
+
+@pytest.mark.parametrize("mapping_name", list(CUSTOM_MAPPINGS))
+@pytest.mark.asyncio(loop_scope="module")
+async def test_custom_mapping(shared_field_mapper, mapping_name):
+    """Test a single custom mapping (pytest entry point)"""
+    passed, report = await _test_one_mapping(
+        shared_field_mapper, mapping_name, CUSTOM_MAPPINGS[mapping_name]
+    )
+    write_report(report)
+    assert passed, f"{mapping_name} did not map in both directions"
+
+@pytest.mark.asyncio(loop_scope="module")
+async def test_custom_mappings(shared_field_mapper):
+    """Test the custom mappings for tasks and users"""
+    print("🔍 Testing Custom Mappings (Tasks & Users)")
+    print("=" * 50)
+    
+    custom_mappings = CUSTOM_MAPPINGS
+    assert custom_mappings, f"No custom mappings found in {CUSTOM_MAPPINGS_PATH}"
+    
+    print(f"✅ Loaded {len(custom_mappings)} custom mappings")
+    
+    # Mappings are independent, so test them all concurrently
+    results = await asyncio.gather(
+        *[
+            _test_one_mapping(shared_field_mapper, n, c)
+            for n, c in custom_mappings.items()
+        ],
+        return_exceptions=True,
+    )
+    
+    # Collect every mapping's report and write it out in one go
+    passed = 0
+    lines = []
+    for mapping_name, result in zip(custom_mappings, results):
+        if isinstance(result, Exception):
+            lines.append(f"\n❌ {mapping_name} failed: {result}")
+            continue
+        ok, report = result
+        lines.extend(report)
+        passed += ok
+    
+    lines.append(f"\n📊 Mappings passed: {passed}/{len(custom_mappings)}")
+    write_report(lines)
+    assert passed == len(custom_mappings), (
+        f"Only {passed}/{len(custom_mappings)} custom mappings passed"
+    )
+
+@pytest.mark.asyncio(loop_scope="module")
+async def test_complex_mappings(shared_field_mapper):
+    """Test complex mapping logic"""
+    print("\n🔍 Testing Complex Mapping Logic")
+    print("=" * 50)
+    
+    complex_mapper = shared_field_mapper.complex_mapper
+    
+    # Test Task ID transformation
+    print("1. Testing Task ID transformation...")
+    
+    # Frappe to Supabase
+    frappe_task_id = "TASK-2025-0001"
+    supabase_task_id = await complex_mapper.map_task_id(frappe_task_id, "frappe_to_supabase")
+    print(f"   Frappe ID: {frappe_task_id} → Supabase ID: {supabase_task_id}")
+    
+    # Supabase to Frappe
+    supabase_task_id = 1
+    frappe_task_id = await complex_mapper.map_task_id(supabase_task_id, "supabase_to_frappe")
+    print(f"   Supabase ID: {supabase_task_id} → Frappe ID: {frappe_task_id}")
+    
+    # Test Project ID transformation
+    print("\n2. Testing Project ID transformation...")
+    
+    # Frappe to Supabase
+    frappe_project_id = "PROJ-001"
+    supabase_project_id = await complex_mapper.map_task_project(frappe_project_id, "frappe_to_supabase")
+    print(f"   Frappe Project: {frappe_project_id} → Supabase Project: {supabase_project_id}")
+    
+    # Supabase to Frappe
+    supabase_project_id = 1
+    frappe_project_id = await complex_mapper.map_task_project(supabase_project_id, "supabase_to_frappe")
+    print(f"   Supabase Project: {supabase_project_id} → Frappe Project: {frappe_project_id}")
+    
+    # Test email priority mapping
+    print("\n3. Testing email priority mapping...")
+    
+    # Frappe to Supabase
+    frappe_user_data = FRAPPE_USER_DATA
+    email_priority_config = EMAIL_PRIORITY_CFG
+    
+    supabase_email = complex_mapper._handle_email_priority(
+        frappe_user_data, email_priority_config, "frappe_to_supabase"
+    )
+    print(f"   Frappe emails: {frappe_user_data} → Supabase email: {supabase_email}")
+    assert supabase_email == frappe_user_data["personal_email"]
+    
+    # Supabase to Frappe
+    supabase_email = "john.doe@example.com"
+    frappe_emails = complex_mapper._handle_email_priority(
+        supabase_email, email_priority_config, "supabase_to_frappe"
+    )
+    print(f"   Supabase email: {supabase_email} → Frappe emails: {frappe_emails}")
 
-async def test_schema_discovery_with_custom_mappings():
+@pytest.mark.integration
+@pytest.mark.asyncio(loop_scope="module")
+async def test_schema_discovery_with_custom_mappings(require_backends, shared_discovery):
     """Test schema discovery with custom mappings"""
     print("\n🔍 Testing Schema Discovery with Custom Mappings")
     print("=" * 50)
     
+    discovery = shared_discovery
+    
+    # Test Frappe schema discovery
+    print("1. Testing Frappe schema discovery...")
+    frappe_schemas = await discovery.discover_frappe_schemas()
+    
+    # Check if Task and User doctypes are discovered
+    if "Task" in frappe_schemas:
+        task_schema = frappe_schemas["Task"]
+        print(f"   ✅ Task doctype discovered: {task_schema.get('total_fields', 0)} fields")
+        print(f"   📋 Key fields: {[f['fieldname'] for f in task_schema.get('fields', [])[:10]]}")
+    else:
+        print("   ❌ Task doctype not found")
+    
+    if "User" in frappe_schemas:
+        user_schema = frappe_schemas["User"]
+        print(f"   ✅ User doctype discovered: {user_schema.get('total_fields', 0)} fields")
+        print(f"   📋 Key fields: {[f['fieldname'] for f in user_schema.get('fields', [])[:10]]}")
+    else:
+        print("   ❌ User doctype not found")
+    
+    missing = [d for d in ("Task", "User") if d not in frappe_schemas]
+    
+    # Test Supabase schema discovery
+    print("\n2. Testing Supabase schema discovery...")
+    supabase_schemas = await discovery.discover_supabase_schemas()
+    
+    # Check if tasks and users tables are discovered
+    if "tasks" in supabase_schemas:
+        tasks_schema = supabase_schemas["tasks"]
+        print(f"   ✅ tasks table discovered: {tasks_schema.get('total_fields', 0)} fields")
+        print(f"   📊 Key fields: {[f['fieldname'] for f in tasks_schema.get('fields', [])[:10]]}")
+    else:
+        print("   ❌ tasks table not found")
+    
+    if "users" in supabase_schemas:
+        users_schema = supabase_schemas["users"]
+        print(f"   ✅ users table discovered: {users_schema.get('total_fields', 0)} fields")
+        print(f"   📊 Key fields: {[f['fieldname'] for f in users_schema.get('fields', [])[:10]]}")
+    else:
+        print("   ❌ users table not found")
+    
+    missing += [t for t in ("tasks", "users") if t not in supabase_schemas]
+    assert not missing, f"Not discovered: {missing}"
+
+async def run_check(test_func, *args):
+    """Run one check for the script report, returning whether it passed"""
     try:
-        discovery = SchemaDiscovery()
-        
-        # Test Frappe schema discovery
-        print("1. Testing Frappe schema discovery...")
-        frappe_schemas = await discovery.discover_frappe_schemas()
-        
-        # Check if Task and User doctypes are discovered
-        if "Task" in frappe_schemas:
-            task_schema = frappe_schemas["Task"]
-            print(f"   ✅ Task doctype discovered: {task_schema.get('total_fields', 0)} fields")
-            print(f"   📋 Key fields: {[f['fieldname'] for f in task_schema.get('fields', [])[:10]]}")
-        else:
-            print("   ❌ Task doctype not found")
-        
-        if "User" in frappe_schemas:
-            user_schema = frappe_schemas["User"]
-            print(f"   ✅ User doctype discovered: {user_schema.get('total_fields', 0)} fields")
-            print(f"   📋 Key fields: {[f['fieldname'] for f in user_schema.get('fields', [])[:10]]}")
-        else:
-            print("   ❌ User doctype not found")
-        
-        # Test Supabase schema discovery
-        print("\n2. Testing Supabase schema discovery...")
-        supabase_schemas = await discovery.discover_supabase_schemas()
-        
-        # Check if tasks and users tables are discovered
-        if "tasks" in supabase_schemas:
-            tasks_schema = supabase_schemas["tasks"]
-            print(f"   ✅ tasks table discovered: {tasks_schema.get('total_fields', 0)} fields")
-            print(f"   📊 Key fields: {[f['fieldname'] for f in tasks_schema.get('fields', [])[:10]]}")
-        else:
-            print("   ❌ tasks table not found")
-        
-        if "users" in supabase_schemas:
-            users_schema = supabase_schemas["users"]
-            print(f"   ✅ users table discovered: {users_schema.get('total_fields', 0)} fields")
-            print(f"   📊 Key fields: {[f['fieldname'] for f in users_schema.get('fields', [])[:10]]}")
-        else:
-            print("   ❌ users table not found")
-        
-        return True
-        
+        await test_func(*args)
+    except (AssertionError, pytest.fail.Exception) as e:
+        print(f"❌ {e}")
+        return False
     except Exception as e:
-        print(f"❌ Schema discovery test failed: {e}")
+        print(f"❌ {test_func.__name__} failed: {e}")
         return False
+    return True
 
 async def main():
     """Main test function"""
@@ -226,10 +337,19 @@ async def main():
     print(f"   Supabase URL: {settings.supabase_url}")
     print()
     
-    # Run tests
-    success1 = await test_custom_mappings()
-    success2 = await test_complex_mappings()
-    success3 = await test_schema_discovery_with_custom_mappings()
+    # Run tests, sharing one mapper and discovery as the fixtures do
+    field_mapper = FieldMapper()
+    discovery = SchemaDiscovery()
+    try:
+        success1 = await run_check(test_custom_mappings, field_mapper)
+        success2 = await run_check(test_complex_mappings, field_mapper)
+        success3 = await run_check(
+            test_schema_discovery_with_custom_mappings, None, discovery
+        )
+    finally:
+        await field_mapper.aclose()
+        await discovery.aclose()
+        await close_postgrest()
     
     if success1 and success2 and success3:
         print("\n🎉 All custom mapping tests passed!")
@@ -242,4 +362,10 @@ async def main():
         print("\n❌ Some tests failed. Please check the configuration and try again.")
 
 if __name__ == "__main__":
+    # uvloop comes with uvicorn[standard]; fall back to the default loop without it
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
     asyncio.run(main())
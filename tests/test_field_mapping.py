@@ -307,8 +307,7 @@ class TestComplexMapper:
         assert isinstance(result, str)
         assert "PROJ-" in result
 
-    @pytest.mark.asyncio
-    async def test_handle_email_priority_frappe_to_supabase(self, complex_mapper):
+    def test_handle_email_priority_frappe_to_supabase(self, complex_mapper):
         """Test email priority handling from Frappe to Supabase"""
         frappe_data = {
             "personal_email": "john@personal.com",
@@ -320,15 +319,14 @@ class TestComplexMapper:
             "email_priority": ["preferred_contact_email", "personal_email", "company_email"]
         }
         
-        result = await complex_mapper._handle_email_priority(
+        result = complex_mapper._handle_email_priority(
             frappe_data, email_config, "frappe_to_supabase"
         )
         
         # Should return the highest priority email
         assert result == "john@preferred.com"
 
-    @pytest.mark.asyncio
-    async def test_handle_email_priority_supabase_to_frappe(self, complex_mapper):
+    def test_handle_email_priority_supabase_to_frappe(self, complex_mapper):
         """Test email priority handling from Supabase to Frappe"""
         supabase_email = "john@example.com"
         
@@ -336,7 +334,7 @@ class TestComplexMapper:
             "email_priority": ["preferred_contact_email", "personal_email", "company_email"]
         }
         
-        result = await complex_mapper._handle_email_priority(
+        result = complex_mapper._handle_email_priority(
             supabase_email, email_config, "supabase_to_frappe"
         )
         
@@ -345,8 +343,7 @@ class TestComplexMapper:
         assert isinstance(result, dict)
         assert result["preferred_contact_email"] == "john@example.com"
 
-    @pytest.mark.asyncio
-    async def test_handle_email_priority_missing_emails(self, complex_mapper):
+    def test_handle_email_priority_missing_emails(self, complex_mapper):
         """Test email priority handling with missing emails"""
         frappe_data = {
             "personal_email": "john@personal.com"
@@ -357,15 +354,14 @@ class TestComplexMapper:
             "email_priority": ["preferred_contact_email", "personal_email", "company_email"]
         }
         
-        result = await complex_mapper._handle_email_priority(
+        result = complex_mapper._handle_email_priority(
             frappe_data, email_config, "frappe_to_supabase"
         )
         
         # Should return the available email
         assert result == "john@personal.com"
 
-    @pytest.mark.asyncio
-    async def test_handle_email_priority_no_emails(self, complex_mapper):
+    def test_handle_email_priority_no_emails(self, complex_mapper):
         """Test email priority handling with no emails"""
         frappe_data = {}
         
@@ -373,19 +369,18 @@ class TestComplexMapper:
             "email_priority": ["preferred_contact_email", "personal_email", "company_email"]
         }
         
-        result = await complex_mapper._handle_email_priority(
+        result = complex_mapper._handle_email_priority(
             frappe_data, email_config, "frappe_to_supabase"
         )
         
         # Should return None or empty string
         assert result is None or result == ""
 
-    @pytest.mark.asyncio
-    async def test_handle_array_mapping(self, complex_mapper):
+    def test_handle_array_mapping(self, complex_mapper):
         """Test array mapping functionality"""
         frappe_assign = ["user1", "user2", "user3"]
         
-        result = await complex_mapper._handle_array_mapping(
+        result = complex_mapper._handle_array_mapping(
             frappe_assign, {}, "frappe_to_supabase"
         )
         
@@ -393,8 +388,7 @@ class TestComplexMapper:
         assert isinstance(result, list)
         assert len(result) == 3
 
-    @pytest.mark.asyncio
-    async def test_handle_boolean_mapping(self, complex_mapper):
+    def test_handle_boolean_mapping(self, complex_mapper):
         """Test boolean mapping functionality"""
         # Test various boolean representations
         test_cases = [
@@ -409,13 +403,12 @@ class TestComplexMapper:
         ]
         
         for input_val, expected in test_cases:
-            result = await complex_mapper._handle_boolean_mapping(
+            result = complex_mapper._handle_boolean_mapping(
                 input_val, {}, "frappe_to_supabase"
             )
             assert result == expected
 
-    @pytest.mark.asyncio
-    async def test_handle_datetime_mapping(self, complex_mapper):
+    def test_handle_datetime_mapping(self, complex_mapper):
         """Test datetime mapping functionality"""
         # Test various datetime formats
         test_cases = [
@@ -426,7 +419,7 @@ class TestComplexMapper:
         ]
         
         for dt_string in test_cases:
-            result = await complex_mapper._handle_datetime_mapping(
+            result = complex_mapper._handle_datetime_mapping(
                 dt_string, {}, "frappe_to_supabase"
             )
             assert result is not None
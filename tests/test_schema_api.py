@@ -0,0 +1,66 @@
+"""
+Tests for the conditional (ETag) responses of the schema API
+"""
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api.schema_api import router, schema_discovery
+
+FRAPPE_SCHEMAS = {"Task": {"total_fields": 2, "fields": []}}
+
+
+@pytest.fixture
+def client():
+    """Test client for the schema router with discovery stubbed out"""
+    app = FastAPI()
+    app.include_router(router)
+    with patch.object(
+        schema_discovery,
+        "discover_frappe_schemas",
+        AsyncMock(return_value=FRAPPE_SCHEMAS),
+    ):
+        yield TestClient(app)
+
+
+class TestConditionalJson:
+    """Test cases for the ETag handling of schema responses"""
+
+    def test_response_carries_etag(self, client):
+        """Test a plain request gets the body and an ETag"""
+        response = client.get("/api/schema/frappe")
+
+        assert response.status_code == 200
+        assert response.json()["schemas"] == FRAPPE_SCHEMAS
+        assert response.headers["etag"].startswith('"')
+
+    def test_matching_etag_is_not_modified(self, client):
+        """Test sending back the current ETag gets an empty 304"""
+        etag = client.get("/api/schema/frappe").headers["etag"]
+
+        response = client.get("/api/schema/frappe", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+    def test_mismatched_etag_gets_body(self, client):
+        """Test a stale ETag gets the full body again"""
+        response = client.get(
+            "/api/schema/frappe", headers={"If-None-Match": '"stale", "older"'}
+        )
+
+        assert response.status_code == 200
+        assert response.json()["schemas"] == FRAPPE_SCHEMAS
+
+    def test_weak_etag_matches(self, client):
+        """Test a weak validator for the current ETag also gets a 304"""
+        etag = client.get("/api/schema/frappe").headers["etag"]
+
+        response = client.get(
+            "/api/schema/frappe", headers={"If-None-Match": f'"stale", W/{etag}'}
+        )
+
+        assert response.status_code == 304
@@ -0,0 +1,134 @@
+"""
+Tests for the Redis-backed webhook deduplicator front end
+"""
+import fakeredis
+import pytest
+import pytest_asyncio
+
+from src.utils.webhook_deduplicator import (
+    DedupResult,
+    SharedWebhookDeduplicator,
+    WebhookDeduplicator,
+    _redis_key,
+)
+
+
+@pytest.fixture
+def redis_server():
+    """In-memory Redis server; set connected to False to make it fail"""
+    return fakeredis.FakeServer()
+
+
+@pytest_asyncio.fixture
+async def shared_deduplicator(webhook_deduplicator, redis_server):
+    """Shared deduplicator over fakeredis with an enabled local fallback"""
+    deduplicator = SharedWebhookDeduplicator(
+        webhook_deduplicator, fakeredis.FakeAsyncRedis(server=redis_server)
+    )
+    yield deduplicator
+    await deduplicator.aclose()
+
+
+class TestSharedClassify:
+    """Test cases for SharedWebhookDeduplicator.classify"""
+
+    @pytest.mark.asyncio
+    async def test_repeat_is_duplicate(self, shared_deduplicator):
+        """Test a repeat within the timeout is a duplicate"""
+        first = await shared_deduplicator.classify("frappe", "Item", {"name": "A"})
+        second = await shared_deduplicator.classify("frappe", "Item", {"name": "A"})
+        assert first is DedupResult.PROCESS
+        assert second is DedupResult.DUPLICATE
+
+    @pytest.mark.asyncio
+    async def test_processed_marker_expires_with_timeout(self, shared_deduplicator):
+        """Test the processed marker is set with the dedup timeout as its expiry"""
+        await shared_deduplicator.classify("frappe", "Item", {"name": "A"})
+        redis_client = shared_deduplicator.redis_client
+        keys = await redis_client.keys(_redis_key("processed", ("*",)))
+        assert len(keys) == 1
+        assert 0 < await redis_client.pttl(keys[0]) <= shared_deduplicator.timeout_ms
+
+    @pytest.mark.asyncio
+    async def test_echo_of_successful_sync(self, shared_deduplicator):
+        """Test the opposite service's webhook after a sync is an echo"""
+        await shared_deduplicator.record_successful_sync(
+            "frappe", "Item", {"name": "A"}
+        )
+        result = await shared_deduplicator.classify("supabase", "Item", {"name": "A"})
+        assert result is DedupResult.OPPOSITE_ECHO
+        assert await shared_deduplicator.is_opposite_service_webhook(
+            "supabase", "Item", {"name": "A"}
+        )
+
+    @pytest.mark.asyncio
+    async def test_synced_marker_is_shared(self, shared_deduplicator, redis_server):
+        """Test a sync recorded by one instance suppresses the echo on another"""
+        await shared_deduplicator.record_successful_sync(
+            "frappe", "Item", {"name": "A"}
+        )
+        other_local = WebhookDeduplicator()
+        other_local.enabled = True
+        other = SharedWebhookDeduplicator(
+            other_local, fakeredis.FakeAsyncRedis(server=redis_server)
+        )
+        try:
+            result = await other.classify("supabase", "Item", {"name": "A"})
+        finally:
+            await other.aclose()
+        assert result is DedupResult.OPPOSITE_ECHO
+
+
+class TestSharedIsDuplicateBatch:
+    """Test cases for SharedWebhookDeduplicator.is_duplicate_batch"""
+
+    @pytest.mark.asyncio
+    async def test_matches_sequential_checks(self, shared_deduplicator):
+        """Test a batch behaves like is_duplicate called for each event in order"""
+        await shared_deduplicator.is_duplicate("frappe", "Item", {"name": "seen"})
+        events = [
+            ("frappe", "Item", {"name": "a"}),
+            ("frappe", "Item", {"name": "a"}),
+            ("frappe", "Item", {}),
+            ("supabase", "Item", {"name": "a"}),
+            ("frappe", "Item", {"name": "seen"}),
+        ]
+        assert await shared_deduplicator.is_duplicate_batch(events) == [
+            False,
+            True,
+            False,
+            False,
+            True,
+        ]
+
+
+class TestLocalFallback:
+    """Test cases for falling back to the local store when Redis fails"""
+
+    @pytest.mark.asyncio
+    async def test_classify_falls_back(self, shared_deduplicator, redis_server):
+        """Test classify uses the local store while Redis is unreachable"""
+        redis_server.connected = False
+        first = await shared_deduplicator.classify("frappe", "Item", {"name": "A"})
+        second = await shared_deduplicator.classify("frappe", "Item", {"name": "A"})
+        assert first is DedupResult.PROCESS
+        assert second is DedupResult.DUPLICATE
+        assert shared_deduplicator.local.get_stats()["active_webhooks"] == 1
+
+    @pytest.mark.asyncio
+    async def test_sync_and_echo_fall_back(self, shared_deduplicator, redis_server):
+        """Test syncs are recorded and echoes caught locally without Redis"""
+        redis_server.connected = False
+        await shared_deduplicator.record_successful_sync(
+            "frappe", "Item", {"name": "A"}
+        )
+        assert await shared_deduplicator.is_opposite_service_webhook(
+            "supabase", "Item", {"name": "A"}
+        )
+
+    @pytest.mark.asyncio
+    async def test_batch_falls_back(self, shared_deduplicator, redis_server):
+        """Test a batch is checked against the local store without Redis"""
+        redis_server.connected = False
+        events = [("frappe", "Item", {"name": "a"})] * 2
+        assert await shared_deduplicator.is_duplicate_batch(events) == [False, True]
@@ -0,0 +1,89 @@
+"""
+Tests for the batched record loader behind SupabaseClient.get_record
+"""
+import asyncio
+
+import pytest
+
+from src.utils.supabase_client import _RecordBatchLoader, _postgrest_in_list
+
+
+class FakeFetch:
+    """Stands in for SupabaseClient._get_records_in, failing on bad values"""
+
+    def __init__(self, rows, bad_values=()):
+        self.rows = rows
+        self.bad_values = set(bad_values)
+        self.calls = []
+
+    async def __call__(self, table, field, values, select, limit, retry):
+        self.calls.append((list(values), retry))
+        if self.bad_values.intersection(values):
+            raise ValueError(f"invalid input syntax for {field}")
+        matches = [row for row in self.rows if row[field] in values]
+        return matches[:limit]
+
+
+async def load_all(loader, values):
+    """Look the values up in one tick so they share a batch"""
+    return await asyncio.gather(
+        *(loader.load("items", "id", value) for value in values),
+        return_exceptions=True,
+    )
+
+
+class TestRecordBatchLoader:
+    """Test cases for _RecordBatchLoader"""
+
+    @pytest.mark.asyncio
+    async def test_lookups_share_one_query(self):
+        """Test lookups made in the same tick are fetched together"""
+        fetch = FakeFetch([{"id": "a"}, {"id": "b"}])
+        loader = _RecordBatchLoader(fetch)
+
+        results = await load_all(loader, ["a", "b", "missing"])
+
+        assert results == [{"id": "a"}, {"id": "b"}, None]
+        assert fetch.calls == [(["a", "b", "missing"], True)]
+
+    @pytest.mark.asyncio
+    async def test_failing_value_only_fails_its_own_lookup(self):
+        """Test a bad value in the batch fails only its lookup, without retries"""
+        fetch = FakeFetch([{"id": "a"}, {"id": "c"}], bad_values={"bad"})
+        loader = _RecordBatchLoader(fetch)
+
+        results = await load_all(loader, ["a", "bad", "c"])
+
+        assert results[0] == {"id": "a"}
+        assert isinstance(results[1], ValueError)
+        assert results[2] == {"id": "c"}
+        # One retried batch, then one unretried query per value
+        assert fetch.calls[0] == (["a", "bad", "c"], True)
+        assert sorted(fetch.calls[1:]) == [
+            (["a"], False),
+            (["bad"], False),
+            (["c"], False),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_rows_cut_off_by_limit_are_looked_up(self):
+        """Test values crowded out by duplicate rows still get their row"""
+        fetch = FakeFetch([{"id": "a", "n": 1}, {"id": "a", "n": 2}, {"id": "b"}])
+        loader = _RecordBatchLoader(fetch)
+
+        results = await load_all(loader, ["a", "b"])
+
+        assert results == [{"id": "a", "n": 1}, {"id": "b"}]
+        assert fetch.calls[1:] == [(["b"], True)]
+
+
+class TestPostgrestInList:
+    """Test cases for _postgrest_in_list"""
+
+    def test_values_are_quoted(self):
+        """Test every value is quoted, reserved characters or not"""
+        assert _postgrest_in_list(["a", "x,y", 3]) == '("a","x,y","3")'
+
+    def test_quotes_and_backslashes_are_escaped(self):
+        """Test embedded double quotes and backslashes can't end the value"""
+        assert _postgrest_in_list(['say "hi"', "a\\b"]) == r'("say \"hi\"","a\\b")'
@@ -0,0 +1,158 @@
+"""
+Tests for the in-process webhook deduplicator
+"""
+import pytest
+from unittest.mock import patch
+
+from src.config import settings
+from src.utils.webhook_deduplicator import DedupResult
+
+TIMEOUT_NS = settings.webhook_deduplication_timeout * 1_000_000
+
+
+@pytest.fixture
+def clock():
+    """Controls the monotonic clock the deduplicator reads"""
+    with patch("src.utils.webhook_deduplicator.time") as mock_time:
+        mock_time.monotonic_ns.return_value = 10 * TIMEOUT_NS
+        yield mock_time
+
+
+def advance(clock, ns):
+    """Move the patched clock forward by ns nanoseconds"""
+    clock.monotonic_ns.return_value += ns
+
+
+class TestClassify:
+    """Test cases for WebhookDeduplicator.classify"""
+
+    def test_first_webhook_is_processed(self, webhook_deduplicator, clock):
+        """Test a webhook seen for the first time is processed"""
+        result = webhook_deduplicator.classify("frappe", "Item", {"name": "A"})
+        assert result is DedupResult.PROCESS
+
+    def test_repeat_within_timeout_is_duplicate(self, webhook_deduplicator, clock):
+        """Test a repeat within the timeout is a duplicate"""
+        webhook_deduplicator.classify("frappe", "Item", {"name": "A"})
+        advance(clock, TIMEOUT_NS - 1)
+        result = webhook_deduplicator.classify("frappe", "Item", {"name": "A"})
+        assert result is DedupResult.DUPLICATE
+        assert result.value == "duplicate_webhook"
+
+    def test_repeat_after_timeout_is_processed(self, webhook_deduplicator, clock):
+        """Test a repeat after the timeout is processed again"""
+        webhook_deduplicator.classify("frappe", "Item", {"name": "A"})
+        advance(clock, TIMEOUT_NS)
+        result = webhook_deduplicator.classify("frappe", "Item", {"name": "A"})
+        assert result is DedupResult.PROCESS
+
+    def test_echo_of_successful_sync(self, webhook_deduplicator, clock):
+        """Test the opposite service's webhook after a sync is skipped as an echo"""
+        webhook_deduplicator.record_successful_sync("frappe", "Item", {"name": "A"})
+        result = webhook_deduplicator.classify("supabase", "Item", {"name": "A"})
+        assert result is DedupResult.OPPOSITE_ECHO
+        assert result.value == "opposite_service_webhook_after_sync"
+
+    def test_same_service_after_sync_is_processed(self, webhook_deduplicator, clock):
+        """Test a sync only suppresses webhooks from the opposite service"""
+        webhook_deduplicator.record_successful_sync("frappe", "Item", {"name": "A"})
+        result = webhook_deduplicator.classify("frappe", "Item", {"name": "A"})
+        assert result is DedupResult.PROCESS
+
+    def test_echo_after_timeout_is_processed(self, webhook_deduplicator, clock):
+        """Test an expired sync no longer suppresses the echo"""
+        webhook_deduplicator.record_successful_sync("frappe", "Item", {"name": "A"})
+        advance(clock, TIMEOUT_NS)
+        result = webhook_deduplicator.classify("supabase", "Item", {"name": "A"})
+        assert result is DedupResult.PROCESS
+        assert webhook_deduplicator.get_stats()["successful_syncs"] == 0
+
+    def test_unidentifiable_record_is_processed(self, webhook_deduplicator, clock):
+        """Test webhooks without a record identifier are always processed"""
+        for _ in range(2):
+            result = webhook_deduplicator.classify("frappe", "Item", {})
+            assert result is DedupResult.PROCESS
+        assert not webhook_deduplicator.entries
+
+    def test_disabled(self, webhook_deduplicator, clock):
+        """Test nothing is deduplicated when deduplication is disabled"""
+        webhook_deduplicator.enabled = False
+        for _ in range(2):
+            result = webhook_deduplicator.classify("frappe", "Item", {"name": "A"})
+            assert result is DedupResult.PROCESS
+
+
+class TestIsDuplicateBatch:
+    """Test cases for WebhookDeduplicator.is_duplicate_batch"""
+
+    def test_matches_sequential_checks(self, webhook_deduplicator, clock):
+        """Test a batch behaves like is_duplicate called for each event in order"""
+        webhook_deduplicator.is_duplicate("frappe", "Item", {"name": "seen"})
+        events = [
+            ("frappe", "Item", {"name": "a"}),
+            ("frappe", "Item", {"name": "a"}),
+            ("frappe", "Item", {}),
+            ("supabase", "Item", {"name": "a"}),
+            ("frappe", "Item", {"name": "seen"}),
+        ]
+        assert webhook_deduplicator.is_duplicate_batch(events) == [
+            False,
+            True,
+            False,
+            False,
+            True,
+        ]
+
+    def test_disabled(self, webhook_deduplicator, clock):
+        """Test no event in a batch is a duplicate when disabled"""
+        webhook_deduplicator.enabled = False
+        events = [("frappe", "Item", {"name": "a"})] * 2
+        assert webhook_deduplicator.is_duplicate_batch(events) == [False, False]
+
+
+class TestEntryLimits:
+    """Test cases for entry eviction and expiry cleanup"""
+
+    def test_max_entries_evicts_oldest(self, webhook_deduplicator, clock):
+        """Test the least recently updated entry is evicted past max_entries"""
+        webhook_deduplicator.max_entries = 2
+        for name in ("a", "b", "c"):
+            webhook_deduplicator.is_duplicate("frappe", "Item", {"name": name})
+
+        assert len(webhook_deduplicator.entries) == 2
+        assert webhook_deduplicator.get_stats()["active_webhooks"] == 2
+        # "a" was evicted, so it is no longer recognised as a duplicate
+        assert not webhook_deduplicator.is_duplicate("frappe", "Item", {"name": "a"})
+        assert webhook_deduplicator.is_duplicate("frappe", "Item", {"name": "c"})
+
+    def test_touching_an_entry_protects_it(self, webhook_deduplicator, clock):
+        """Test an updated entry moves behind newer ones in eviction order"""
+        webhook_deduplicator.max_entries = 2
+        webhook_deduplicator.is_duplicate("frappe", "Item", {"name": "a"})
+        webhook_deduplicator.is_duplicate("frappe", "Item", {"name": "b"})
+        webhook_deduplicator.record_successful_sync("frappe", "Item", {"name": "a"})
+        webhook_deduplicator.is_duplicate("frappe", "Item", {"name": "c"})
+
+        assert [key[2] for key in webhook_deduplicator.entries] == [
+            "name:a",
+            "name:c",
+        ]
+
+    def test_cleanup_is_throttled(self, webhook_deduplicator, clock):
+        """Test expired entries are pruned at most once per cleanup interval"""
+        interval = webhook_deduplicator._cleanup_interval_ns = 4 * TIMEOUT_NS
+        webhook_deduplicator.is_duplicate("frappe", "Item", {"name": "a"})
+
+        # "a" is past the 2x timeout cutoff, but cleanup ran too recently
+        advance(clock, 3 * TIMEOUT_NS)
+        webhook_deduplicator.is_duplicate("frappe", "Item", {"name": "b"})
+        assert len(webhook_deduplicator.entries) == 2
+
+        # Once the interval has passed, cleanup drops "a" but keeps "b"
+        advance(clock, interval - 3 * TIMEOUT_NS + 1)
+        webhook_deduplicator.is_duplicate("frappe", "Item", {"name": "c"})
+        assert [key[2] for key in webhook_deduplicator.entries] == [
+            "name:b",
+            "name:c",
+        ]
+        assert webhook_deduplicator.get_stats()["active_webhooks"] == 2